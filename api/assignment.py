@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db.models import BooleanField, Case, F, FloatField, Value, When
+from django.db.models.functions import Coalesce
+
+from api.conflicts import Conflicts
+from api.graph import get_graph
+from api.models import Researcher, ReviewerRecommendation, ReviewRequest
+
+
+def trusted_recommendations(article):
+    """
+    Trust scores of the reviewers recommended for an article, leaving out the
+    recommendations which look like collusion (see `RecommendationGraph.colluding`).
+    """
+    graph = get_graph()
+    trusted = {}
+    for voucher, reviewer in ReviewerRecommendation.objects.filter(
+        article=article
+    ).values_list("voucher", "reviewer"):
+        if reviewer is not None and not graph.colluding(voucher, reviewer):
+            trusted[reviewer] = graph.score(reviewer)
+    return trusted
+
+
+def select_reviewers(article, count, candidates=None):
+    """
+    Picks up to `count` reviewers for an article, spreading the load between them.
+
+    Reviewers recommended for the article come first, unless only recommended by
+    their own collusion ring, then the reviewers with the fewest open requests,
+    read from their workload counters. Ties go to the most trusted reviewers of
+    the recommendation graph.
+
+    Reviewers who were already asked, the corresponding author, the authors and
+    their co-authors (see api.conflicts) and reviewers with too many open requests
+    are skipped. `candidates` optionally restricts the selection.
+
+    Authors are matched by full name, so conflicts are only detected for
+    researchers whose `full_name` is set. `full_name` is optional at registration
+    and bulk-imported channels have none, so those researchers are never excluded
+    as authors or co-authors.
+    """
+    reviewers = (
+        Researcher.objects.exclude(public_key=None)
+        .exclude(pk=article.corresponding_author_id)
+        .exclude(
+            pk__in=ReviewRequest.objects.filter(article=article).values("reviewer")
+        )
+        .exclude(author_key__in=Conflicts.for_article(article).keys)
+    )
+    if candidates is not None:
+        reviewers = reviewers.filter(pk__in=candidates)
+
+    trusted = trusted_recommendations(article)
+    return list(
+        reviewers.annotate(
+            open_requests=Coalesce(
+                F("workload__requests_pending") + F("workload__requests_accepted"), 0
+            ),
+            recommended=Case(
+                When(pk__in=list(trusted), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            trust=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in trusted.items()],
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+        .filter(open_requests__lt=settings.PAPR_REVIEWER_MAX_OPEN_REQUESTS)
+        .order_by("-recommended", "open_requests", "-trust", "pk")[:count]
+    )
+
+
+def assign_reviewers(article, count, candidates=None):
+    """
+    Sends review requests for an article to the reviewers picked by `select_reviewers`.
+    """
+    return [
+        ReviewRequest.objects.create(reviewer=reviewer, article=article, status=1)
+        for reviewer in select_reviewers(article, count, candidates=candidates)
+    ]
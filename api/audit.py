@@ -0,0 +1,78 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+class EventWriter:
+    """
+    Buffers audit events in memory and writes them with `bulk_create`, either when
+    `batch_size` events are waiting or every `interval` seconds.
+
+    With a batch size of 1, events are written immediately by the caller.
+    """
+
+    def __init__(self, batch_size=100, interval=1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, event, actor="", article="", **data):
+        entry = AuditEvent(event=event, actor=actor, article=article, data=data)
+
+        if self.batch_size <= 1:
+            entry.save()
+            return
+
+        with self._lock:
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        if not events:
+            return
+
+        try:
+            AuditEvent.objects.bulk_create(events, batch_size=self.batch_size)
+        except Exception:
+            logger.exception(f"Could not write {len(events)} audit events")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            close_old_connections()
+            self.flush()
+
+
+writer = EventWriter(
+    batch_size=settings.PAPR_AUDIT_BATCH_SIZE,
+    interval=settings.PAPR_AUDIT_FLUSH_INTERVAL,
+)
+atexit.register(writer.flush)
+
+
+def record(event, actor="", article="", **data):
+    """
+    Records a state change in the audit log.
+    """
+    writer.record(event, actor=actor, article=article, **data)
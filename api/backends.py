@@ -0,0 +1,176 @@
+import copy
+import json
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api import caching
+
+
+class LbryBackend:
+    """
+    Interface to the LBRY network. `call` runs a daemon JSON-RPC method and returns
+    the decoded response, {"result": ...} or {"error": ...}.
+    """
+
+    def call(self, method, **kwargs):
+        raise NotImplementedError
+
+
+class DaemonBackend(LbryBackend):
+    """
+    Calls a running LBRY daemon through the papr client.
+    """
+
+    def call(self, method, **kwargs):
+        from papr_server.adapter import call
+
+        return call(method, **kwargs).json()
+
+
+class CachedBackend(LbryBackend):
+    """
+    Caches the successful responses of the read-only `methods` of another backend,
+    in the shared cache under `caching.lbry_key`. Saving a manuscript or the public
+    key of a researcher invalidates the claim or key it was made from.
+    """
+
+    def __init__(
+        self, backend, timeout=300, methods=("resolve", "macro_get_public_key")
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.methods = set(methods)
+
+    def call(self, method, **kwargs):
+        if method not in self.methods:
+            return self.backend.call(method, **kwargs)
+
+        key = caching.lbry_key(method, **kwargs)
+        data = cache.get(key)
+        if data is None:
+            data = self.backend.call(method, **kwargs)
+            if self.cacheable(data):
+                cache.set(key, data, timeout=self.timeout)
+        return data
+
+    @staticmethod
+    def cacheable(data):
+        """
+        Errors are not cached, nor are the claims and channels which were not found
+        (per URL for resolve), since they may be published right after.
+        """
+        if "error" in data:
+            return False
+        result = data.get("result")
+        if not isinstance(result, dict):
+            return True
+        if "info" in result:  # Channel without public key
+            return False
+        return not any(
+            isinstance(value, dict) and "error" in value for value in result.values()
+        )
+
+
+class FakeBackend(LbryBackend):
+    """
+    In-memory stand-in for the daemon, for tests, load tests and offline staging.
+
+    It serves recorded claims (by URL), public keys (by channel name) and channel
+    claims, which can be loaded from a JSON fixture file of the form
+    {"claims": {url: claim}, "public_keys": {channel: key}}. Claims are listed by
+    `claim_search` under their signing channel.
+    """
+
+    def __init__(self, fixtures=None):
+        self.claims = {}
+        self.public_keys = {}
+        self._lock = threading.Lock()
+        if fixtures:
+            self.load(fixtures)
+
+    def load(self, path):
+        with open(path) as f:
+            fixtures = json.load(f)
+        for url, claim in fixtures.get("claims", {}).items():
+            self.add_claim(url, claim)
+        for channel_name, public_key in fixtures.get("public_keys", {}).items():
+            self.add_public_key(channel_name, public_key)
+
+    def add_claim(self, url, claim):
+        with self._lock:
+            self.claims[url] = claim
+
+    def add_public_key(self, channel_name, public_key):
+        with self._lock:
+            self.public_keys[channel_name] = public_key
+
+    def call(self, method, **kwargs):
+        handler = getattr(self, f"_{method}", None)
+        if handler is None:
+            return {"error": {"code": -32601, "message": f"Unknown method {method}"}}
+        with self._lock:
+            return copy.deepcopy(handler(**kwargs))
+
+    def _status(self):
+        return {"result": {"is_running": True}}
+
+    def _resolve(self, urls):
+        urls = [urls] if isinstance(urls, str) else urls
+        result = {}
+        for url in urls:
+            if url in self.claims:
+                result[url] = self.claims[url]
+            else:
+                result[url] = {
+                    "error": {
+                        "name": "NOT_FOUND",
+                        "text": f"Could not find claim at {url}.",
+                    }
+                }
+        return {"result": result}
+
+    def _macro_get_public_key(self, channel_name):
+        if channel_name not in self.public_keys:
+            return {"result": {"info": "Channel not found"}}
+        return {"result": {"public_key": self.public_keys[channel_name]}}
+
+    def _claim_search(self, channel, page=1, page_size=20, height=None, **kwargs):
+        items = [
+            claim
+            for claim in self.claims.values()
+            if claim.get("signing_channel", {}).get("name") == channel
+        ]
+        if height is not None:
+            minimum = int(height.lstrip(">="))
+            items = [claim for claim in items if claim["height"] >= minimum]
+        items.sort(key=lambda claim: claim["height"])
+
+        total_pages = max(1, -(-len(items) // page_size))
+        items = items[(page - 1) * page_size : page * page_size]
+        return {"result": {"items": items, "page": page, "total_pages": total_pages}}
+
+
+BACKENDS = {
+    "daemon": DaemonBackend,
+    "cached": lambda: CachedBackend(
+        DaemonBackend(), timeout=settings.PAPR_LBRY_CACHE_TIMEOUT
+    ),
+    "fake": lambda: FakeBackend(settings.PAPR_LBRY_FIXTURES),
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Returns the backend selected by `PAPR_LBRY_BACKEND`.
+    """
+    global _backend
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = BACKENDS[settings.PAPR_LBRY_BACKEND]()
+        return _backend
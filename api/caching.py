@@ -0,0 +1,60 @@
+import hashlib
+import json
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def article_id_key(base_claim_name):
+    return f"papr:article:{base_claim_name}"
+
+
+def article_status_key(article_id):
+    return f"papr:status:{article_id}"
+
+
+def escrow_key(article_id):
+    return f"papr:escrow:{article_id}"
+
+
+def lbry_key(method, **kwargs):
+    arguments = json.dumps(kwargs, sort_keys=True)
+    return f"papr:lbry:{method}:{hashlib.sha256(arguments.encode()).hexdigest()}"
+
+
+def generation(key):
+    """
+    Returns the token stored under a key of the shared cache, adding a new one if
+    there is none. Invalidating the key changes the token, which tells the
+    workers that their own copies of the data are stale.
+    """
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        token = cache.get(key)
+    return token
+
+
+def invalidate(keys):
+    """
+    Deletes keys from the shared cache, so that every worker sees the change.
+
+    They are deleted again once the transaction commits, in case another worker
+    cached the rows as they were before the change in the meantime.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_articles(article_ids):
+    """
+    Invalidates the cached responses about the given articles.
+
+    They are cached by primary key, which every related row already holds, so
+    invalidating never needs a query.
+    """
+    invalidate(article_status_key(pk) for pk in article_ids if pk is not None)
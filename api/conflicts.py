@@ -0,0 +1,90 @@
+import re
+from itertools import islice, permutations
+
+from django.db import transaction
+
+from api.models import CoAuthorship, Manuscript, Researcher
+
+# Authors are separated by commas, semicolons, ampersands, new lines or "and"
+AUTHOR_SEPARATORS = re.compile(r"[,;&\n]|\s+and\s+", re.IGNORECASE)
+
+
+def author_keys(authors):
+    """
+    Author keys (see `Researcher.make_author_key`) of the free-text authors of
+    a manuscript.
+    """
+    keys = (
+        Researcher.make_author_key(name) for name in AUTHOR_SEPARATORS.split(authors)
+    )
+    return {key for key in keys if key}
+
+
+def record(authors_list):
+    """
+    Adds the co-authorships of manuscripts to the index, given their authors.
+    Returns the number of pairs found, including those already in the index.
+    """
+    pairs = set()
+    for authors in authors_list:
+        pairs.update(permutations(author_keys(authors), 2))
+
+    CoAuthorship.objects.bulk_create(
+        [CoAuthorship(author=a, coauthor=b) for a, b in pairs],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    return len(pairs)
+
+
+def rebuild(batch_size=2000):
+    """
+    Rebuilds the co-authorship index from the authors of every manuscript.
+    The index is replaced in one transaction, so reviewers are never selected
+    against an empty or partial index.
+    """
+    with transaction.atomic():
+        CoAuthorship.objects.all().delete()
+
+        authors = (
+            Manuscript.objects.order_by("pk")
+            .values_list("authors", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+        while batch := list(islice(authors, batch_size)):
+            record(batch)
+    return CoAuthorship.objects.count()
+
+
+class Conflicts:
+    """
+    Author keys which conflict with an article: its authors and everyone who
+    co-authored a manuscript with them. Checking a reviewer is a set lookup.
+    """
+
+    def __init__(self, keys):
+        self.keys = frozenset(keys)
+
+    @classmethod
+    def for_article(cls, article):
+        authors = set()
+        for text in Manuscript.objects.filter(article=article).values_list(
+            "authors", flat=True
+        ):
+            authors |= author_keys(text)
+        if not authors:
+            return cls(authors)
+
+        coauthors = CoAuthorship.objects.filter(author__in=authors).values_list(
+            "coauthor", flat=True
+        )
+        return cls(authors.union(coauthors))
+
+    def __contains__(self, researcher):
+        return bool(researcher.author_key) and researcher.author_key in self.keys
+
+    def filter(self, researchers):
+        """
+        Leaves out the conflicted researchers.
+        """
+        return [researcher for researcher in researchers if researcher not in self]
@@ -0,0 +1,148 @@
+import collections
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api.backends import get_backend
+
+
+class DaemonUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The LBRY daemon is unavailable, try again later."
+    default_code = "daemon_unavailable"
+
+    def __init__(self, wait=None, detail=None):
+        super().__init__(detail)
+        self.wait = wait  # Sent as Retry-After
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of recent daemon calls and stops calling the daemon while it is
+    failing or too slow.
+
+    The breaker opens when the share of failed (or slower than `slow_call` seconds)
+    calls among the last `window` calls reaches `failure_rate`. While it is open, calls
+    fail immediately. After `reset_timeout` seconds, a single trial call is let through:
+    the breaker closes if it succeeds, and opens again otherwise.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate=0.5,
+        window=20,
+        min_calls=5,
+        slow_call=5.0,
+        reset_timeout=30.0,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call = slow_call
+        self.reset_timeout = reset_timeout
+
+        self._outcomes = collections.deque(maxlen=window)
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def before_call(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_running:
+                raise DaemonUnavailable(wait=max(remaining, 1))
+
+            self._state = self.HALF_OPEN
+            self._trial_running = True
+
+    def record(self, success, latency):
+        with self._lock:
+            success = success and latency < self.slow_call
+            self._outcomes.append(success)
+            self._latencies.append(latency)
+
+            if self._state == self.HALF_OPEN:
+                self._trial_running = False
+                if success:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            failures = self._outcomes.count(False)
+            if (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            calls = len(self._outcomes)
+            latencies = sorted(self._latencies)
+            return {
+                "state": self._state,
+                "recent_calls": calls,
+                "error_rate": self._outcomes.count(False) / calls if calls else 0.0,
+                "max_latency": latencies[-1] if latencies else None,
+                "median_latency": latencies[len(latencies) // 2] if latencies else None,
+            }
+
+
+breaker = CircuitBreaker(
+    failure_rate=settings.PAPR_DAEMON_FAILURE_RATE,
+    slow_call=settings.PAPR_DAEMON_SLOW_CALL,
+    reset_timeout=settings.PAPR_DAEMON_RESET_TIMEOUT,
+)
+
+# Bounds the number of concurrent daemon calls, and lets the request give up on a
+# hung call instead of waiting for the full HTTP timeout.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PAPR_DAEMON_MAX_CONCURRENT, thread_name_prefix="daemon"
+)
+
+
+def call(method, **kwargs):
+    """
+    Calls the LBRY backend through the circuit breaker and returns its response.
+    Raises DaemonUnavailable when the breaker is open or the call times out;
+    other errors are raised unchanged.
+    """
+    breaker.before_call()
+
+    start = time.monotonic()
+    future = _executor.submit(get_backend().call, method, **kwargs)
+    try:
+        result = future.result(timeout=settings.PAPR_DAEMON_TIMEOUT)
+    except TimeoutError:
+        breaker.record(False, time.monotonic() - start)
+        raise DaemonUnavailable()
+    except Exception:
+        breaker.record(False, time.monotonic() - start)
+        raise
+
+    breaker.record(True, time.monotonic() - start)
+    return result
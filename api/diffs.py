@@ -0,0 +1,63 @@
+import difflib
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+DIFF_FIELDS = ["title", "authors", "abstract", "tags"]
+
+
+def content_hash(manuscript):
+    """
+    Hash of the fields of a manuscript which are compared between revisions.
+    """
+    content = json.dumps([manuscript[field] for field in DIFF_FIELDS])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def diff_manuscripts(old, new):
+    """
+    Returns the unified diff of every field which differs between two manuscripts.
+    """
+    changes = {}
+    for field in DIFF_FIELDS:
+        if old[field] != new[field]:
+            changes[field] = list(
+                difflib.unified_diff(
+                    old[field].splitlines(),
+                    new[field].splitlines(),
+                    lineterm="",
+                )
+            )
+    return changes
+
+
+def revision_diffs(article):
+    """
+    Diffs each manuscript of an article with the previous one.
+
+    The diffs are cached under the content hashes of both sides, so only the
+    revisions which have never been compared are diffed.
+    """
+    manuscripts = list(
+        article.version.order_by("submitted", "pk").values("claim_name", *DIFF_FIELDS)
+    )
+    pairs = list(zip(manuscripts, manuscripts[1:]))
+
+    keys = [f"papr:diff:{content_hash(old)}:{content_hash(new)}" for old, new in pairs]
+    cached = cache.get_many(keys)
+
+    missing = {}
+    diffs = []
+    for key, (old, new) in zip(keys, pairs):
+        changes = cached.get(key)
+        if changes is None:
+            changes = missing[key] = diff_manuscripts(old, new)
+        diffs.append(
+            {"from": old["claim_name"], "to": new["claim_name"], "changes": changes}
+        )
+
+    if missing:
+        cache.set_many(missing, timeout=settings.PAPR_DIFF_CACHE_TIMEOUT)
+    return diffs
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from api.models import Review, SubmittedArticle
+from api.summaries import REQUEST_STATUS_FIELDS
+
+CLOSED_ARTICLE_STATUSES = [99, 100]
+
+
+def review_queue(status=None, after=0, limit=50):
+    """
+    Lists the articles with the given status (or all open articles), along with
+    the number of review requests in each status, the number of overdue requests
+    and the mean rating of their reviews.
+
+    Everything is computed in a single query, paginated by primary key: `after`
+    is the last primary key of the previous page.
+    """
+    overdue_before = timezone.now() - timedelta(days=settings.PAPR_REVIEW_OVERDUE_DAYS)
+
+    mean_rating = (
+        Review.objects.filter(manuscript__article=OuterRef("pk"))
+        .values("manuscript__article")
+        .annotate(mean=Avg("rating"))
+        .values("mean")
+    )
+
+    counts = {
+        field: Count("reviewers_contacted", filter=Q(reviewers_contacted__status=s))
+        for s, field in REQUEST_STATUS_FIELDS.items()
+    }
+    counts["requests_overdue"] = Count(
+        "reviewers_contacted",
+        filter=Q(
+            reviewers_contacted__status__in=[1, 3],
+            reviewers_contacted__submitted__lt=overdue_before,
+        ),
+    )
+
+    articles = SubmittedArticle.objects.filter(pk__gt=after)
+    if status is None:
+        articles = articles.exclude(status__in=CLOSED_ARTICLE_STATUSES)
+    else:
+        articles = articles.filter(status=status)
+
+    return list(
+        articles.order_by("pk")
+        .annotate(**counts, mean_rating=Subquery(mean_rating))
+        .values(
+            "pk",
+            "base_claim_name",
+            "status",
+            "revision",
+            "corresponding_author__channel_name",
+            "mean_rating",
+            *counts,
+        )[:limit]
+    )
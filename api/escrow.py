@@ -0,0 +1,173 @@
+import base64
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import APIException
+
+from api import caching
+from api.models import Manuscript, SubmittedArticle
+
+
+class EscrowKeyError(APIException):
+    default_detail = (
+        "The escrowed secrets cannot be decrypted with the configured escrow keys."
+    )
+    default_code = "escrow_key_error"
+
+
+_fernet = None
+_fernet_lock = threading.Lock()
+
+
+def get_fernet():
+    """
+    Returns the cipher of the escrow. Secrets are encrypted with the first of the
+    PAPR_ESCROW_KEYS and decrypted with any of them, so keys can be rotated.
+    Tests fall back to a key derived from SECRET_KEY when none is configured.
+    """
+    global _fernet
+
+    with _fernet_lock:
+        if _fernet is None:
+            from cryptography.fernet import Fernet, MultiFernet
+
+            keys = settings.PAPR_ESCROW_KEYS
+            if not keys:
+                if not settings.IS_TEST:
+                    raise ImproperlyConfigured(
+                        "PAPR_ESCROW_KEYS must be set to store escrowed secrets"
+                    )
+                keys = [
+                    base64.urlsafe_b64encode(
+                        hashlib.sha256(settings.SECRET_KEY.encode()).digest()
+                    ).decode()
+                ]
+            _fernet = MultiFernet([Fernet(key) for key in keys])
+        return _fernet
+
+
+def encrypt(value):
+    if not value:
+        return value
+    return get_fernet().encrypt(value.encode()).decode()
+
+
+def decrypt(token):
+    """
+    Raises EscrowKeyError when none of the PAPR_ESCROW_KEYS encrypted `token`,
+    e.g. after a key was removed from the rotation too early.
+    """
+    from cryptography.fernet import InvalidToken
+
+    if not token:
+        return token
+    try:
+        return get_fernet().decrypt(token.encode()).decode()
+    except InvalidToken:
+        raise EscrowKeyError()
+
+
+class KeyCache:
+    """
+    Decrypted secrets of the most recently requested articles, kept in memory for
+    `ttl` seconds. They are never written to the shared cache, which may be on
+    disk or on another host. Instead each entry holds the generation of the
+    article in the shared cache (see `caching.generation`), which deposits in any
+    worker change, so that stale entries are not returned.
+    """
+
+    def __init__(self, ttl=60, size=1024):
+        self.ttl = ttl
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, generation=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, entry_generation, value = entry
+            if expires < time.monotonic() or entry_generation != generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, generation=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+cache = KeyCache(
+    ttl=settings.PAPR_ESCROW_CACHE_TTL, size=settings.PAPR_ESCROW_CACHE_SIZE
+)
+
+
+def deposit(article, passphrases=None, manuscripts=None):
+    """
+    Encrypts and stores the passphrases of an article ({field: value}) and the
+    passwords of its manuscripts ({claim_name: {field: value}}).
+    Fields which are not given are left unchanged.
+    """
+    passphrases = {
+        field: encrypt(value)
+        for field, value in (passphrases or {}).items()
+        if field in SubmittedArticle.SECRET_FIELDS
+    }
+    if passphrases:
+        SubmittedArticle.objects.filter(pk=article.pk).update(**passphrases)
+
+    for claim_name, passwords in (manuscripts or {}).items():
+        passwords = {
+            field: encrypt(value)
+            for field, value in passwords.items()
+            if field in Manuscript.SECRET_FIELDS
+        }
+        if passwords:
+            Manuscript.objects.filter(article=article, claim_name=claim_name).update(
+                **passwords
+            )
+
+    cache.invalidate(article.pk)
+    caching.invalidate([caching.escrow_key(article.pk)])
+
+
+def article_keys(article):
+    """
+    Returns the decrypted passphrases of an article and passwords of its
+    manuscripts, from the cache when they were recently requested.
+    """
+    generation = caching.generation(caching.escrow_key(article.pk))
+    keys = cache.get(article.pk, generation)
+    if keys is not None:
+        return keys
+
+    passphrases = (
+        SubmittedArticle.objects.filter(pk=article.pk)
+        .values(*SubmittedArticle.SECRET_FIELDS)
+        .first()
+    ) or {}
+    keys = {field: decrypt(value) for field, value in passphrases.items()}
+    keys["manuscripts"] = {
+        row["claim_name"]: {
+            field: decrypt(row[field]) for field in Manuscript.SECRET_FIELDS
+        }
+        for row in Manuscript.objects.filter(article=article).values(
+            "claim_name", *Manuscript.SECRET_FIELDS
+        )
+    }
+
+    cache.put(article.pk, keys, generation)
+    return keys
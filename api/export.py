@@ -0,0 +1,185 @@
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.models import (
+    AuditEvent,
+    Manuscript,
+    Researcher,
+    Review,
+    ReviewerRecommendation,
+    ReviewRequest,
+    SubmittedArticle,
+)
+
+# Exported columns and the lookups they are read from. Relations are exported
+# by natural key (channel name, base claim name or claim name). The escrowed
+# secrets are exported encrypted, so restoring them on another host requires the
+# same PAPR_ESCROW_KEYS.
+EXPORTS = {
+    "researchers": (
+        Researcher,
+        {
+            "channel_name": "channel_name",
+            "joined": "joined",
+            "full_name": "full_name",
+            "email": "email",
+            "public_key": "public_key",
+            "is_superuser": "is_superuser",
+        },
+    ),
+    "articles": (
+        SubmittedArticle,
+        {
+            "base_claim_name": "base_claim_name",
+            "corresponding_author": "corresponding_author__channel_name",
+            "status": "status",
+            "revision": "revision",
+            "reviewed": "reviewed",
+            # Escrowed secrets, still encrypted with PAPR_ESCROW_KEYS
+            "encryption_passphrase": "encryption_passphrase",
+            "review_passphrase": "review_passphrase",
+        },
+    ),
+    "manuscripts": (
+        Manuscript,
+        {
+            "claim_name": "claim_name",
+            "article": "article__base_claim_name",
+            "submitted": "submitted",
+            "title": "title",
+            "authors": "authors",
+            "tags": "tags",
+            "abstract": "abstract",
+            "encrypted": "encrypted",
+            "public_key": "public_key",
+            "sd_hash": "sd_hash",
+            "encryption_password": "encryption_password",
+            "review_password": "review_password",
+        },
+    ),
+    "reviewrequests": (
+        ReviewRequest,
+        {
+            "article": "article__base_claim_name",
+            "reviewer": "reviewer__channel_name",
+            "submitted": "submitted",
+            "status": "status",
+            "deadline": "deadline",
+            "reminders": "reminders",
+        },
+    ),
+    "reviews": (
+        Review,
+        {
+            "manuscript": "manuscript__claim_name",
+            "reviewer": "reviewer__channel_name",
+            "submitted": "submitted",
+            "text": "text",
+            "rating": "rating",
+            "signature": "signature",
+            "signing_ts": "signing_ts",
+            # Natural key of the review request
+            "request_article": "request__article__base_claim_name",
+            "request_reviewer": "request__reviewer__channel_name",
+            "request_submitted": "request__submitted",
+        },
+    ),
+    "recommendations": (
+        ReviewerRecommendation,
+        {
+            "article": "article__base_claim_name",
+            "reviewer": "reviewer__channel_name",
+            "voucher": "voucher__channel_name",
+            "submitted": "submitted",
+        },
+    ),
+    "events": (
+        AuditEvent,
+        {
+            "id": "pk",
+            "created": "created",
+            "event": "event",
+            "actor": "actor",
+            "article": "article",
+            "data": "data",
+        },
+    ),
+}
+
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+
+def iter_rows(name, queryset=None, chunk_size=2000):
+    """
+    Yields the rows of an export as dictionaries.
+    The rows are fetched `chunk_size` at a time (with a server-side cursor on
+    databases which support it), so memory use does not grow with the table.
+    """
+    model, columns = EXPORTS[name]
+    if queryset is None:
+        queryset = model.objects.all()
+
+    rows = queryset.order_by("pk").values_list(*columns.values())
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, row))
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Line:
+    """
+    File-like object returning what is written to it, to stream csv.writer output.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(name, rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORTS[name][1])
+    for row in rows:
+        yield writer.writerow(
+            json.dumps(v, cls=DjangoJSONEncoder) if isinstance(v, dict) else v
+            for v in row.values()
+        )
+
+
+def gzip_chunks(lines, chunk_size=65536):
+    """
+    Compresses a stream of text lines into gzip chunks of about `chunk_size` bytes.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            chunk = compressor.compress(b"".join(buffer))
+            buffer, size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b"".join(buffer)) + compressor.flush()
+
+
+def stream(name, kind="ndjson", compress=False, queryset=None, chunk_size=2000):
+    """
+    Streams an export as "ndjson" or "csv", optionally gzipped.
+    """
+    rows = iter_rows(name, queryset=queryset, chunk_size=chunk_size)
+    if kind == "csv":
+        lines = csv_lines(name, rows)
+    else:
+        lines = ndjson_lines(rows)
+    return gzip_chunks(lines) if compress else lines
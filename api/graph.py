@@ -0,0 +1,311 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+
+from api.models import ReviewerRecommendation
+
+
+class RecommendationGraph:
+    """
+    The voucher → reviewer graph of the reviewer recommendations, with the number
+    of recommendations as edge weights.
+
+    Researchers are numbered from 0 in the order they appear. The edges are stored
+    in compressed sparse rows: the targets of node `u` are
+    `indices[indptr[u]:indptr[u + 1]]`, sorted, with their `weights`. Edges added
+    since the rows were built are kept in `pending` until there are enough of them
+    to rebuild the rows with `compact`.
+
+    Trust scores solve x = (1 - damping) + damping * Mx, where M spreads the score
+    of a voucher over the researchers they recommended. They are kept up to date
+    by pushing residuals (the error of each score) along the edges: a new edge only
+    changes the residuals of the targets of its voucher, so only the scores it
+    actually moves are updated.
+    """
+
+    def __init__(self, damping=0.85, tolerance=1e-8, max_ring_size=5):
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_ring_size = max_ring_size
+
+        self.nodes = {}  # Researcher primary key → node
+        self.ids = array("q")  # Node → researcher primary key
+        self.indptr = array("q", [0])
+        self.indices = array("q")
+        self.weights = array("d")
+        self.pending = defaultdict(Counter)
+        self.pending_edges = 0
+
+        self.out = array("d")  # Total weight of the edges of each node
+        self.scores = array("d")
+        self.residuals = array("d")
+        self.total = 0.0  # Sum of the scores
+        self.pushes = 0
+        self._queue = deque()
+        self._queued = set()
+
+        self.last_pk = 0
+        self._rings = None
+
+    @classmethod
+    def load(cls, **kwargs):
+        """
+        Builds the graph of every recommendation, in a single query.
+        """
+        graph = cls(**kwargs)
+        graph.refresh()
+        return graph
+
+    def refresh(self):
+        """
+        Adds the recommendations made since the graph was loaded or last refreshed.
+        """
+        return self.add(
+            ReviewerRecommendation.objects.filter(pk__gt=self.last_pk)
+            .order_by("pk")
+            .values_list("pk", "voucher", "reviewer")
+        )
+
+    def node(self, researcher_id):
+        if researcher_id not in self.nodes:
+            u = len(self.ids)
+            self.nodes[researcher_id] = u
+            self.ids.append(researcher_id)
+            self.out.append(0.0)
+            self.scores.append(0.0)
+            self.residuals.append(1 - self.damping)
+            self.enqueue(u)
+        return self.nodes[researcher_id]
+
+    def add(self, recommendations):
+        """
+        Adds `(pk, voucher_id, reviewer_id)` recommendations, then updates the
+        scores they change. Returns the number of edges added.
+        """
+        added = 0
+        for pk, voucher, reviewer in recommendations:
+            self.last_pk = max(self.last_pk, pk)
+            if voucher is None or reviewer is None or voucher == reviewer:
+                continue
+            u, v = self.node(voucher), self.node(reviewer)
+
+            # The score already pushed from u is spread over its new row instead
+            self.spread(u, -self.scores[u])
+            self.pending[u][v] += 1
+            self.out[u] += 1
+            self.spread(u, self.scores[u])
+            added += 1
+
+        if added:
+            self.pending_edges += added
+            self._rings = None
+            if self.pending_edges > len(self.indices) // 8 + 64:
+                self.compact()
+        self.propagate()
+        return added
+
+    def compact(self):
+        """
+        Rebuilds the rows with the pending edges merged in.
+        """
+        indptr, indices, weights = array("q", [0]), array("q"), array("d")
+        for u in range(len(self.ids)):
+            row = Counter(dict(self.row(u, pending=False)))
+            row.update(self.pending.get(u, {}))
+            for v in sorted(row):
+                indices.append(v)
+                weights.append(row[v])
+            indptr.append(len(indices))
+
+        self.indptr, self.indices, self.weights = indptr, indices, weights
+        self.pending = defaultdict(Counter)
+        self.pending_edges = 0
+
+    def row(self, u, pending=True):
+        """
+        Yields the `(target, weight)` edges of node `u`.
+        """
+        if u + 1 < len(self.indptr):
+            for k in range(self.indptr[u], self.indptr[u + 1]):
+                yield self.indices[k], self.weights[k]
+        if pending and u in self.pending:
+            yield from self.pending[u].items()
+
+    def has_edge(self, u, v):
+        if u + 1 < len(self.indptr):
+            lo, hi = self.indptr[u], self.indptr[u + 1]
+            k = bisect_left(self.indices, v, lo, hi)
+            if k < hi and self.indices[k] == v:
+                return True
+        return v in self.pending.get(u, ())
+
+    def enqueue(self, u):
+        if u not in self._queued and abs(self.residuals[u]) > self.tolerance:
+            self._queued.add(u)
+            self._queue.append(u)
+
+    def spread(self, u, amount):
+        """
+        Adds `amount`, damped, to the residuals of the targets of node `u`.
+        """
+        if amount and self.out[u]:
+            share = self.damping * amount / self.out[u]
+            for v, w in self.row(u):
+                self.residuals[v] += share * w
+                self.enqueue(v)
+
+    def propagate(self):
+        """
+        Pushes the residuals larger than `tolerance` into the scores, until there
+        are none left. Returns the number of pushes.
+        """
+        pushes = 0
+        while self._queue:
+            u = self._queue.popleft()
+            self._queued.discard(u)
+            residual = self.residuals[u]
+            if abs(residual) <= self.tolerance:
+                continue
+            self.residuals[u] = 0.0
+            self.scores[u] += residual
+            self.total += residual
+            self.spread(u, residual)
+            pushes += 1
+        self.pushes += pushes
+        return pushes
+
+    def rank(self):
+        """
+        Recomputes every score from scratch. Returns the number of pushes.
+        """
+        n = len(self.ids)
+        self.scores = array("d", [0.0] * n)
+        self.residuals = array("d", [1 - self.damping] * n)
+        self.total = 0.0
+        for u in range(n):
+            self.enqueue(u)
+        return self.propagate()
+
+    def score(self, researcher_id):
+        """
+        Trust score of a researcher, relative to the mean (1.0) of the graph.
+        Researchers who never recommended nor were recommended score 0.
+        """
+        if researcher_id not in self.nodes or not self.total:
+            return 0.0
+        return self.scores[self.nodes[researcher_id]] * len(self.ids) / self.total
+
+    def mutual(self, a, b):
+        """
+        Whether two researchers recommended each other.
+        """
+        if a not in self.nodes or b not in self.nodes:
+            return False
+        u, v = self.nodes[a], self.nodes[b]
+        return self.has_edge(u, v) and self.has_edge(v, u)
+
+    def rings(self):
+        """
+        Groups of 2 to `max_ring_size` researchers who all recommend each other,
+        directly or through the group: the small strongly connected components
+        of the graph. Larger components are communities rather than rings.
+
+        Returns a dictionary of researcher primary key → ring (frozenset).
+        """
+        if self._rings is None:
+            self._rings = {}
+            for component in self.components():
+                if 2 <= len(component) <= self.max_ring_size:
+                    ring = frozenset(self.ids[u] for u in component)
+                    for researcher_id in ring:
+                        self._rings[researcher_id] = ring
+        return self._rings
+
+    def colluding(self, voucher_id, reviewer_id):
+        """
+        Whether a recommendation comes from the reviewer's own ring, or from
+        a researcher the reviewer recommended in return.
+        """
+        ring = self.rings().get(reviewer_id)
+        return (ring is not None and voucher_id in ring) or self.mutual(
+            voucher_id, reviewer_id
+        )
+
+    def components(self):
+        """
+        Strongly connected components (Tarjan's algorithm, without recursion).
+        """
+        n = len(self.ids)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack, components = [], []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            work = [(root, iter(list(self.row(root))))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                u, edges = work[-1]
+                for v, _ in edges:
+                    if index[v] == -1:
+                        index[v] = low[v] = counter
+                        counter += 1
+                        stack.append(v)
+                        on_stack[v] = True
+                        work.append((v, iter(list(self.row(v)))))
+                        break
+                    if on_stack[v]:
+                        low[u] = min(low[u], index[v])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[u])
+                    if low[u] == index[u]:
+                        component = []
+                        while True:
+                            v = stack.pop()
+                            on_stack[v] = False
+                            component.append(v)
+                            if v == u:
+                                break
+                        components.append(component)
+        return components
+
+
+_graph = None
+_graph_loaded = 0
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """
+    Returns the recommendation graph of this process, with the recommendations
+    made since the last call added. It is rebuilt from scratch every
+    PAPR_GRAPH_REBUILD_INTERVAL seconds, to drop deleted recommendations.
+    """
+    global _graph, _graph_loaded
+
+    with _graph_lock:
+        if _graph is None or time.monotonic() - _graph_loaded >= (
+            settings.PAPR_GRAPH_REBUILD_INTERVAL
+        ):
+            _graph = RecommendationGraph.load(
+                damping=settings.PAPR_GRAPH_DAMPING,
+                max_ring_size=settings.PAPR_COLLUSION_MAX_RING_SIZE,
+            )
+            _graph_loaded = time.monotonic()
+        else:
+            _graph.refresh()
+        return _graph
@@ -0,0 +1,151 @@
+import logging
+import time
+
+from django.conf import settings
+
+from api.daemon import call
+from api.models import IndexedClaim, IndexerCheckpoint, Researcher
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimIndexer:
+    """
+    Mirrors the stream claims signed by the registered channels and the server channel.
+
+    Each channel has its own height checkpoint, so that newly registered channels are
+    indexed from the start of the chain while the others only fetch new claims.
+    """
+
+    def __init__(self, page_size=50):
+        self.page_size = page_size
+
+    def watched_channels(self):
+        channels = set(
+            Researcher.objects.exclude(public_key=None).values_list(
+                "channel_name", flat=True
+            )
+        )
+        channels.add(settings.PAPR_SERVER_CHANNEL_NAME)
+        return sorted(channels)
+
+    def sync(self):
+        """
+        Indexes the claims published since the last checkpoint of every watched channel.
+        Returns the number of claims indexed.
+        """
+        checkpoints = dict(
+            IndexerCheckpoint.objects.values_list("channel_name", "height")
+        )
+
+        count = 0
+        for channel_name in self.watched_channels():
+            height = checkpoints.get(channel_name, 0)
+            claims = self.fetch_claims(channel_name, height)
+            self.store(claims)
+            count += len(claims)
+
+            if claims:
+                IndexerCheckpoint.objects.update_or_create(
+                    channel_name=channel_name,
+                    defaults={"height": max(claim.height for claim in claims)},
+                )
+        return count
+
+    def fetch_claims(self, channel_name, height):
+        """
+        Fetches the stream claims of a channel at or above `height` (in case the
+        block at the checkpoint height was only partially seen).
+        """
+        claims = []
+        page = 1
+        while True:
+            res = call(
+                "claim_search",
+                channel=channel_name,
+                claim_type="stream",
+                height=f">={height}",
+                order_by=["^height"],
+                page=page,
+                page_size=self.page_size,
+            )
+            if "error" in res:
+                raise Exception(f"Could not search claims of {channel_name}: {res}")
+
+            items = res["result"]["items"]
+            claims += [self.to_model(item) for item in items]
+
+            if page >= res["result"].get("total_pages", page):
+                return claims
+            page += 1
+
+    def to_model(self, item):
+        value = item.get("value", {})
+        return IndexedClaim(
+            claim_id=item["claim_id"],
+            claim_name=item["name"],
+            txid=item["txid"],
+            height=item["height"],
+            signing_channel=item.get("signing_channel", {}).get("name", ""),
+            is_channel_signature_valid=item.get("is_channel_signature_valid", False),
+            title=value.get("title", ""),
+            author=value.get("author", ""),
+            sd_hash=value.get("source", {}).get("sd_hash", ""),
+        )
+
+    def store(self, claims):
+        IndexedClaim.objects.bulk_create(
+            claims,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["claim_id"],
+            update_fields=[
+                "claim_name",
+                "txid",
+                "height",
+                "signing_channel",
+                "is_channel_signature_valid",
+                "title",
+                "author",
+                "sd_hash",
+            ],
+        )
+
+    def run(self, interval):
+        while True:
+            try:
+                count = self.sync()
+            except Exception:
+                logger.exception("Claim indexing failed")
+            else:
+                if count:
+                    logger.info(f"Indexed {count} claims")
+            time.sleep(interval)
+
+
+def lookup_claim(claim_name, channel_name):
+    """
+    Returns the indexed claim `claim_name` signed by `channel_name` in the format
+    of the daemon's `resolve`, or None if it has not been indexed.
+    """
+    claim = (
+        IndexedClaim.objects.filter(claim_name=claim_name, signing_channel=channel_name)
+        .order_by("-height")
+        .first()
+    )
+    if claim is None:
+        return None
+
+    return {
+        "name": claim.claim_name,
+        "claim_id": claim.claim_id,
+        "txid": claim.txid,
+        "height": claim.height,
+        "is_channel_signature_valid": claim.is_channel_signature_valid,
+        "signing_channel": {"name": claim.signing_channel},
+        "value": {
+            "title": claim.title,
+            "author": claim.author,
+            "source": {"sd_hash": claim.sd_hash},
+        },
+    }
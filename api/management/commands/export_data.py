@@ -0,0 +1,43 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from api import export
+
+
+class Command(BaseCommand):
+    help = "Exports tables to <output>/<table>.ndjson (or .csv), one row per line"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the exports to")
+        parser.add_argument(
+            "--tables",
+            nargs="+",
+            choices=list(export.EXPORTS),
+            default=list(export.EXPORTS),
+            help="Tables to export (all by default)",
+        )
+        parser.add_argument("--type", choices=list(export.FORMATS), default="ndjson")
+        parser.add_argument("--gzip", action="store_true", help="Compress the exports")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        os.makedirs(options["output"], exist_ok=True)
+
+        for name in options["tables"]:
+            extension = export.FORMATS[options["type"]][1]
+            path = os.path.join(options["output"], f"{name}.{extension}")
+            if options["gzip"]:
+                path += ".gz"
+
+            chunks = export.stream(
+                name,
+                kind=options["type"],
+                compress=options["gzip"],
+                chunk_size=options["chunk_size"],
+            )
+            with open(path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk if options["gzip"] else chunk.encode())
+
+            self.stdout.write(self.style.SUCCESS(f"Exported {name} to {path}"))
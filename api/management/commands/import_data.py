@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from api import restore
+
+
+class Command(BaseCommand):
+    help = "Restores the NDJSON exports of export_data from <input>, resuming where a previous run stopped"
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Directory containing the exports")
+        parser.add_argument(
+            "--tables",
+            nargs="+",
+            choices=restore.RESTORE_ORDER,
+            default=restore.RESTORE_ORDER,
+            help="Tables to restore (all by default)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per transaction"
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Restore the exports from the start, ignoring previous runs",
+        )
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            restore.reset(options["input"])
+
+        for name, path, done, restored in restore.restore(
+            options["input"],
+            tables=options["tables"],
+            batch_size=options["batch_size"],
+        ):
+            message = f"Restored {restored} rows of {name} from {path}"
+            if done:
+                message += f" (resumed after {done})"
+            self.stdout.write(self.style.SUCCESS(message))
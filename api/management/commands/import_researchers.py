@@ -0,0 +1,33 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from api.registration import import_researchers, parse_channel_names
+
+
+class Command(BaseCommand):
+    help = "Registers the channels listed in a file (one channel name per line)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="File containing the channel names")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of concurrent daemon calls",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["file"]) as f:
+            channel_names = parse_channel_names(f)
+
+        report = import_researchers(channel_names, workers=options["workers"])
+
+        for entry in report:
+            self.stdout.write(f"{entry['channel_name']}\t{entry['status']}")
+
+        counts = Counter(entry["status"] for entry in report)
+        summary = ", ".join(f"{n} {s}" for s, n in sorted(counts.items()))
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {len(report)} channels: {summary}")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api import conflicts, summaries, workload
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the article summaries, reviewer workloads and co-authorship "
+        "index from scratch"
+    )
+
+    def handle(self, *args, **options):
+        count = summaries.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} article summaries"))
+        count = workload.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} reviewer workloads"))
+        count = conflicts.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} co-authorships"))
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.indexer import ClaimIndexer
+
+
+class Command(BaseCommand):
+    help = "Mirrors the claims of the registered channels from the LBRY daemon"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Index once, then exit")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PAPR_INDEXER_INTERVAL,
+            help="Seconds between two synchronizations",
+        )
+
+    def handle(self, *args, **options):
+        indexer = ClaimIndexer()
+        if options["once"]:
+            count = indexer.sync()
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} claims"))
+        else:
+            indexer.run(options["interval"])
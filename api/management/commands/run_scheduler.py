@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.scheduler import DeadlineScheduler
+
+
+class Command(BaseCommand):
+    help = "Reminds reviewers of overdue review requests and reassigns expired ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run once, then exit")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.PAPR_SCHEDULER_INTERVAL,
+            help="Seconds between two checks of the deadlines",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = DeadlineScheduler(batch_size=settings.PAPR_SCHEDULER_BATCH_SIZE)
+        if options["once"]:
+            count = scheduler.tick()
+            self.stdout.write(self.style.SUCCESS(f"Handled {count} deadlines"))
+        else:
+            scheduler.run(options["interval"])
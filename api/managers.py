@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
 
 
 class ResearcherManager(BaseUserManager):
@@ -22,3 +23,13 @@ class ResearcherManager(BaseUserManager):
             raise ValueError("A channel name must be provided")
 
         return self.create_user(channel_name, **extra_fields)
+
+
+class SecretsDeferredManager(models.Manager):
+    """
+    Leaves the escrowed secrets of a model (`SECRET_FIELDS`) out of its querysets.
+    They are only read by `api.escrow`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.model.SECRET_FIELDS)
@@ -0,0 +1,186 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:59
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="manuscript",
+            old_name="author_list",
+            new_name="authors",
+        ),
+        migrations.RemoveField(
+            model_name="manuscript",
+            name="claim_id",
+        ),
+        migrations.RemoveField(
+            model_name="manuscript",
+            name="corresponding_author",
+        ),
+        migrations.RemoveField(
+            model_name="manuscript",
+            name="status",
+        ),
+        migrations.RemoveField(
+            model_name="reviewerrecommendation",
+            name="manuscript",
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="abstract",
+            field=models.TextField(default=""),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="encrypted",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="encryption_password",
+            field=models.CharField(max_length=1024, null=True),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="review_password",
+            field=models.CharField(max_length=1024, null=True),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="tags",
+            field=models.TextField(default="", max_length=1024),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="signature",
+            field=models.CharField(default="", max_length=1024),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="signing_ts",
+            field=models.CharField(default="", max_length=1024),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="researcher",
+            name="email",
+            field=models.EmailField(
+                max_length=254,
+                null=True,
+                validators=[django.core.validators.EmailValidator],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="researcher",
+            name="public_key",
+            field=models.CharField(max_length=316, null=True),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="rating",
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.CreateModel(
+            name="ReviewRequest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("submitted", models.DateTimeField(auto_now_add=True)),
+                ("status", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "reviewer",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="is_asked",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="request",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="final_review",
+                to="api.reviewrequest",
+            ),
+        ),
+        migrations.CreateModel(
+            name="SubmittedArticle",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("base_claim_name", models.CharField(max_length=255, unique=True)),
+                ("encryption_passphrase", models.CharField(max_length=1024)),
+                ("review_passphrase", models.CharField(max_length=1024)),
+                ("reviewed", models.BooleanField(default=False)),
+                ("revision", models.PositiveSmallIntegerField(default=0)),
+                ("status", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "corresponding_author",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="reviewrequest",
+            name="article",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="reviewers_contacted",
+                to="api.submittedarticle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="article",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="version",
+                to="api.submittedarticle",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reviewerrecommendation",
+            name="article",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="recommendations",
+                to="api.submittedarticle",
+            ),
+        ),
+    ]
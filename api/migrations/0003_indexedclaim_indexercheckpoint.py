@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_sync_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexerCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("channel_name", models.CharField(max_length=255, unique=True)),
+                ("height", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="IndexedClaim",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("claim_id", models.CharField(max_length=40, unique=True)),
+                ("claim_name", models.CharField(max_length=255)),
+                ("txid", models.CharField(max_length=64)),
+                ("height", models.PositiveIntegerField()),
+                ("signing_channel", models.CharField(max_length=255)),
+                ("is_channel_signature_valid", models.BooleanField(default=False)),
+                ("title", models.TextField(default="", max_length=1024)),
+                ("author", models.TextField(default="", max_length=1024)),
+                ("indexed", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["claim_name", "signing_channel"],
+                        name="api_indexed_claim_n_6d2e19_idx",
+                    )
+                ],
+            },
+        ),
+    ]
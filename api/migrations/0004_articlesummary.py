@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_indexedclaim_indexercheckpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleSummary",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="api.submittedarticle",
+                    ),
+                ),
+                ("manuscripts", models.PositiveIntegerField(default=0)),
+                ("recommendations", models.PositiveIntegerField(default=0)),
+                ("requests_created", models.PositiveIntegerField(default=0)),
+                ("requests_pending", models.PositiveIntegerField(default=0)),
+                ("requests_declined", models.PositiveIntegerField(default=0)),
+                ("requests_accepted", models.PositiveIntegerField(default=0)),
+                ("requests_fulfilled", models.PositiveIntegerField(default=0)),
+                ("reviews", models.PositiveIntegerField(default=0)),
+                ("rating_total", models.PositiveIntegerField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
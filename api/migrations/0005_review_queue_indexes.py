@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_articlesummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reviewrequest",
+            index=models.Index(
+                fields=["article", "status"], name="api_reviewr_article_3d5cf9_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="submittedarticle",
+            index=models.Index(
+                fields=["status", "id"], name="api_submitt_status_9e4c9d_idx"
+            ),
+        ),
+    ]
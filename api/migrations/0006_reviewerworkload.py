@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_review_queue_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReviewerWorkload",
+            fields=[
+                (
+                    "reviewer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="workload",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("requests_pending", models.PositiveIntegerField(default=0)),
+                ("requests_declined", models.PositiveIntegerField(default=0)),
+                ("requests_accepted", models.PositiveIntegerField(default=0)),
+                ("requests_fulfilled", models.PositiveIntegerField(default=0)),
+                ("turnaround_total", models.FloatField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_reviewerworkload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("event", models.CharField(db_index=True, max_length=64)),
+                ("actor", models.CharField(blank=True, default="", max_length=255)),
+                ("article", models.CharField(blank=True, default="", max_length=255)),
+                ("data", models.JSONField(default=dict)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_auditevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RestoreCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=1024, unique=True)),
+                ("lines", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
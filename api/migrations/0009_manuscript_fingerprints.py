@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:15
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def fingerprint_manuscripts(apps, schema_editor):
+    # Same fingerprint as Manuscript.fingerprint, which historical models lack
+    Manuscript = apps.get_model("api", "Manuscript")
+    manuscripts = []
+    for manuscript in Manuscript.objects.only("title", "authors", "abstract"):
+        content = [
+            " ".join(value.split())
+            for value in [manuscript.title, manuscript.authors, manuscript.abstract]
+        ]
+        manuscript.content_hash = hashlib.sha256(
+            json.dumps(content).encode()
+        ).hexdigest()
+        manuscripts.append(manuscript)
+    Manuscript.objects.bulk_update(manuscripts, ["content_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_restorecheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="indexedclaim",
+            name="sd_hash",
+            field=models.CharField(default="", max_length=96),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="content_hash",
+            field=models.CharField(default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="manuscript",
+            name="sd_hash",
+            field=models.CharField(default="", max_length=96),
+        ),
+        migrations.AddIndex(
+            model_name="manuscript",
+            index=models.Index(
+                fields=["content_hash", "sd_hash"],
+                name="api_manuscr_content_38f369_idx",
+            ),
+        ),
+        migrations.RunPython(fingerprint_manuscripts, migrations.RunPython.noop),
+    ]
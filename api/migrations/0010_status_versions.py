@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_manuscript_fingerprints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewrequest",
+            name="status_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="submittedarticle",
+            name="status_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
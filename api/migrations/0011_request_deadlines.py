@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:18
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_deadlines(apps, schema_editor):
+    # Open requests get the deadline they would have had when they were sent
+    ReviewRequest = apps.get_model("api", "ReviewRequest")
+    requests = []
+    for status, days in settings.PAPR_REQUEST_DEADLINES.items():
+        for request in ReviewRequest.objects.filter(status=status).only("submitted"):
+            request.deadline = request.submitted + timedelta(days=days)
+            requests.append(request)
+    ReviewRequest.objects.bulk_update(requests, ["deadline"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_status_versions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reviewrequest",
+            name="deadline",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="reviewrequest",
+            name="reminders",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(set_deadlines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:20
+
+import base64
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations, models
+
+SECRETS = {
+    "SubmittedArticle": ["encryption_passphrase", "review_passphrase"],
+    "Manuscript": ["encryption_password", "review_password"],
+}
+
+
+def get_fernet():
+    """
+    Copy of `api.escrow.get_fernet` as of this migration, so that later changes
+    to the escrow do not change what it does.
+    """
+    from cryptography.fernet import Fernet, MultiFernet
+
+    keys = settings.PAPR_ESCROW_KEYS
+    if not keys:
+        if not settings.IS_TEST:
+            raise ImproperlyConfigured(
+                "PAPR_ESCROW_KEYS must be set to store escrowed secrets"
+            )
+        keys = [
+            base64.urlsafe_b64encode(
+                hashlib.sha256(settings.SECRET_KEY.encode()).digest()
+            ).decode()
+        ]
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def convert_secrets(apps, convert):
+    fernet = None
+    for name, fields in SECRETS.items():
+        model = apps.get_model("api", name)
+        instances = list(model.objects.only(*fields))
+        for instance in instances:
+            for field in fields:
+                value = getattr(instance, field)
+                if value:
+                    fernet = fernet or get_fernet()
+                    setattr(instance, field, convert(fernet, value.encode()).decode())
+        model.objects.bulk_update(instances, fields, batch_size=500)
+
+
+def encrypt_secrets(apps, schema_editor):
+    convert_secrets(apps, lambda fernet, value: fernet.encrypt(value))
+
+
+def decrypt_secrets(apps, schema_editor):
+    convert_secrets(apps, lambda fernet, value: fernet.decrypt(value))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_request_deadlines"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="manuscript",
+            options={"base_manager_name": "objects"},
+        ),
+        migrations.AlterModelOptions(
+            name="submittedarticle",
+            options={"base_manager_name": "objects"},
+        ),
+        migrations.AlterField(
+            model_name="manuscript",
+            name="encryption_password",
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="manuscript",
+            name="review_password",
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="submittedarticle",
+            name="encryption_passphrase",
+            field=models.TextField(default=""),
+        ),
+        migrations.AlterField(
+            model_name="submittedarticle",
+            name="review_passphrase",
+            field=models.TextField(default=""),
+        ),
+        migrations.RunPython(encrypt_secrets, decrypt_secrets),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:28
+
+import re
+import unicodedata
+from itertools import permutations
+
+from django.db import migrations, models
+
+
+def author_key(name):
+    # Same key as Researcher.make_author_key, which historical models lack
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", name.casefold()).split())
+
+
+def index_coauthorships(apps, schema_editor):
+    Researcher = apps.get_model("api", "Researcher")
+    researchers = list(Researcher.objects.only("full_name"))
+    for researcher in researchers:
+        researcher.author_key = author_key(researcher.full_name)
+    Researcher.objects.bulk_update(researchers, ["author_key"], batch_size=500)
+
+    # Same split as api.conflicts.author_keys
+    separators = re.compile(r"[,;&\n]|\s+and\s+", re.IGNORECASE)
+    Manuscript = apps.get_model("api", "Manuscript")
+    pairs = set()
+    for authors in Manuscript.objects.values_list("authors", flat=True):
+        keys = {key for key in map(author_key, separators.split(authors)) if key}
+        pairs.update(permutations(keys, 2))
+
+    CoAuthorship = apps.get_model("api", "CoAuthorship")
+    CoAuthorship.objects.bulk_create(
+        [CoAuthorship(author=a, coauthor=b) for a, b in pairs], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_escrowed_secrets"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="researcher",
+            name="author_key",
+            field=models.CharField(db_index=True, default="", max_length=255),
+        ),
+        migrations.CreateModel(
+            name="CoAuthorship",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("author", models.CharField(max_length=255)),
+                ("coauthor", models.CharField(max_length=255)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("author", "coauthor"), name="unique_coauthorship"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(index_coauthorships, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,17 @@
+import hashlib
+import json
+import re
+import unicodedata
+
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.core.validators import EmailValidator
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 
-from .managers import ResearcherManager
+from .managers import ResearcherManager, SecretsDeferredManager
 
 
 class Researcher(AbstractBaseUser, PermissionsMixin):
@@ -13,6 +22,9 @@ class Researcher(AbstractBaseUser, PermissionsMixin):
     public_key = models.CharField(max_length=316, null=True)
     email = models.EmailField(null=True, validators=[EmailValidator])
 
+    # Full name as it is matched against the authors of manuscripts, see api.conflicts
+    author_key = models.CharField(max_length=255, default="", db_index=True)
+
     USERNAME_FIELD = "channel_name"
     REQUIRED_FIELDS = []
 
@@ -25,6 +37,19 @@ class Researcher(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.channel_name
 
+    @staticmethod
+    def make_author_key(name):
+        """
+        Lowercase name without accents, punctuation or extra spaces.
+        """
+        name = unicodedata.normalize("NFKD", name)
+        name = "".join(c for c in name if not unicodedata.combining(c))
+        return " ".join(re.sub(r"[^\w\s]", " ", name.casefold()).split())
+
+    def save(self, *args, **kwargs):
+        self.author_key = self.make_author_key(self.full_name)
+        super().save(*args, **kwargs)
+
 
 class Review(models.Model):
     submitted = models.DateTimeField(auto_now_add=True)
@@ -50,13 +75,16 @@ class SubmittedArticle(models.Model):
         Researcher, on_delete=models.SET_NULL, null=True
     )
 
-    encryption_passphrase = models.CharField(max_length=1024)
-    review_passphrase = models.CharField(max_length=1024)
+    # Encrypted under the server key, see api.escrow
+    encryption_passphrase = models.TextField(default="")
+    review_passphrase = models.TextField(default="")
 
     reviewed = models.BooleanField(default=False)
     revision = models.PositiveSmallIntegerField(default=0)
 
     status = models.PositiveSmallIntegerField(default=0)
+    # Incremented by every status transition, see api.transitions
+    status_version = models.PositiveIntegerField(default=0)
 
     """
     Statuses:
@@ -69,6 +97,14 @@ class SubmittedArticle(models.Model):
         100: Officially published
     """
 
+    SECRET_FIELDS = ["encryption_passphrase", "review_passphrase"]
+
+    objects = SecretsDeferredManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "id"])]
+        base_manager_name = "objects"
+
     @property
     def latest_manuscript(self):
         return self.manuscript_set.latest("submitted")
@@ -100,15 +136,38 @@ class Manuscript(models.Model):
     abstract = models.TextField(default="")
 
     public_key = models.CharField(max_length=1024, null=True)
-    review_password = models.CharField(max_length=1024, null=True)
+    # Encrypted under the server key, see api.escrow
+    review_password = models.TextField(null=True)
 
     encrypted = models.BooleanField(default=False)
-    encryption_password = models.CharField(max_length=1024, null=True)
+    encryption_password = models.TextField(null=True)
 
     article = models.ForeignKey(
         SubmittedArticle, related_name="version", on_delete=models.SET_NULL, null=True
     )
 
+    # Fingerprint of the title, authors and abstract, and sd_hash of the published
+    # stream, used to reject manuscripts which are submitted twice
+    content_hash = models.CharField(max_length=64, default="")
+    sd_hash = models.CharField(max_length=96, default="")
+
+    SECRET_FIELDS = ["encryption_password", "review_password"]
+
+    objects = SecretsDeferredManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["content_hash", "sd_hash"])]
+        base_manager_name = "objects"
+
+    @staticmethod
+    def fingerprint(title, authors, abstract):
+        content = [" ".join(value.split()) for value in [title, authors, abstract]]
+        return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.content_hash = self.fingerprint(self.title, self.authors, self.abstract)
+        super().save(*args, **kwargs)
+
 
 class ReviewerRecommendation(models.Model):
     submitted = models.DateTimeField(auto_now_add=True)
@@ -140,6 +199,8 @@ class ReviewRequest(models.Model):
 
     # TODO: field for how the reviewer was contacted (email, server notification...)
     status = models.PositiveSmallIntegerField(default=0)
+    # Incremented by every status transition, see api.transitions
+    status_version = models.PositiveIntegerField(default=0)
     """
     Statuses:
         0: Created, not sent
@@ -147,4 +208,176 @@ class ReviewRequest(models.Model):
         2: Request declined
         3: Request accepted, pending review
         4: Review fulfilled
+        5: Expired without a reply or a review
+    """
+
+    # Next reminder or expiry of a request waiting on the reviewer (None otherwise),
+    # see api.scheduler
+    deadline = models.DateTimeField(null=True, db_index=True)
+    reminders = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["article", "status"])]
+
+    @staticmethod
+    def deadline_for(status, now=None):
+        """
+        Deadline of a request which enters `status`, or None if it waits on no one.
+        """
+        days = settings.PAPR_REQUEST_DEADLINES.get(status)
+        if days is None:
+            return None
+        return (now or timezone.now()) + timedelta(days=days)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.deadline is None:
+            self.deadline = self.deadline_for(self.status)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Used to maintain the status counters when the status changes
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+
+class IndexedClaim(models.Model):
+    """
+    Local copy of a claim signed by a watched channel, maintained by the claim indexer.
+    """
+
+    claim_id = models.CharField(max_length=40, unique=True)
+    claim_name = models.CharField(max_length=255)
+    txid = models.CharField(max_length=64)
+    height = models.PositiveIntegerField()
+
+    signing_channel = models.CharField(max_length=255)
+    is_channel_signature_valid = models.BooleanField(default=False)
+
+    title = models.TextField(max_length=1024, default="")
+    author = models.TextField(max_length=1024, default="")
+    sd_hash = models.CharField(max_length=96, default="")
+
+    indexed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["claim_name", "signing_channel"])]
+
+
+class IndexerCheckpoint(models.Model):
+    """
+    Height up to which the claims of a channel have been indexed.
+    """
+
+    channel_name = models.CharField(max_length=255, unique=True)
+    height = models.PositiveIntegerField(default=0)
+
+
+class ArticleSummary(models.Model):
+    """
+    Denormalized counters of an article, updated incrementally by api.summaries
+    whenever a related object is saved.
+    """
+
+    article = models.OneToOneField(
+        SubmittedArticle,
+        related_name="summary",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+
+    manuscripts = models.PositiveIntegerField(default=0)
+    recommendations = models.PositiveIntegerField(default=0)
+
+    # Review requests by status
+    requests_created = models.PositiveIntegerField(default=0)
+    requests_pending = models.PositiveIntegerField(default=0)
+    requests_declined = models.PositiveIntegerField(default=0)
+    requests_accepted = models.PositiveIntegerField(default=0)
+    requests_fulfilled = models.PositiveIntegerField(default=0)
+
+    reviews = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+
+    updated = models.DateTimeField(auto_now=True)
+
+    @property
+    def mean_rating(self):
+        if self.reviews == 0:
+            return None
+        return self.rating_total / self.reviews
+
+
+class ReviewerWorkload(models.Model):
     """
+    Counters of the review requests of a reviewer, updated incrementally by
+    api.workload whenever a review request is saved.
+    """
+
+    reviewer = models.OneToOneField(
+        Researcher,
+        related_name="workload",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+
+    requests_pending = models.PositiveIntegerField(default=0)
+    requests_declined = models.PositiveIntegerField(default=0)
+    requests_accepted = models.PositiveIntegerField(default=0)
+    requests_fulfilled = models.PositiveIntegerField(default=0)
+
+    # Time between the review requests and the reviews, in seconds
+    turnaround_total = models.FloatField(default=0)
+
+    updated = models.DateTimeField(auto_now=True)
+
+    @property
+    def open_requests(self):
+        return self.requests_pending + self.requests_accepted
+
+    @property
+    def mean_turnaround(self):
+        if self.requests_fulfilled == 0:
+            return None
+        return self.turnaround_total / self.requests_fulfilled
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only record of a state change, written in batches by api.audit.
+    The actor and the article are stored by name so that events outlive them.
+    """
+
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+    event = models.CharField(max_length=64, db_index=True)
+    actor = models.CharField(max_length=255, default="", blank=True)
+    article = models.CharField(max_length=255, default="", blank=True)
+    data = models.JSONField(default=dict)
+
+
+class RestoreCheckpoint(models.Model):
+    """
+    Number of lines of an exported file which have been restored, updated in the
+    same transaction as the rows so that an interrupted restore can be resumed.
+    """
+
+    path = models.CharField(max_length=1024, unique=True)
+    lines = models.PositiveBigIntegerField(default=0)
+
+
+class CoAuthorship(models.Model):
+    """
+    Pair of author keys (see `Researcher.make_author_key`) found together in the
+    authors of a manuscript, in both directions. Maintained by api.conflicts.
+    """
+
+    author = models.CharField(max_length=255)
+    coauthor = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["author", "coauthor"], name="unique_coauthorship"
+            )
+        ]
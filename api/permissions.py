@@ -0,0 +1,11 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsSuperuser(BasePermission):
+    """
+    Allows access only to researchers flagged as superusers (server operators).
+    `Researcher` has no `is_staff` field, so DRF's `IsAdminUser` cannot be used.
+    """
+
+    def has_permission(self, request, view):
+        return bool(request.user and getattr(request.user, "is_superuser", False))
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from api.daemon import call
+from api.models import Researcher
+
+
+def fetch_public_key(channel_name):
+    """
+    Returns the public key of a channel as reported by the daemon,
+    or None if the channel does not exist.
+    """
+    data = call("macro_get_public_key", channel_name=channel_name)
+    if "error" in data or "info" in data["result"]:
+        return None
+    return data["result"]["public_key"]
+
+
+def fetch_public_keys(channel_names, workers=None):
+    """
+    Fetches the public keys of many channels with concurrent daemon calls.
+    Returns a dictionary mapping each channel name to its public key, None if
+    the channel does not exist, or the exception raised while fetching it.
+    """
+
+    def fetch(channel_name):
+        try:
+            return fetch_public_key(channel_name)
+        except Exception as e:
+            return e
+
+    workers = workers or settings.PAPR_IMPORT_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(channel_names, executor.map(fetch, channel_names)))
+
+
+def parse_channel_names(lines):
+    """
+    Extracts channel names from lines of text, one per line.
+    Blank lines and lines starting with # are ignored.
+    """
+    names = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            names.append(line)
+    return names
+
+
+def import_researchers(channel_names, workers=None):
+    """
+    Registers many channels at once.
+
+    Returns a report as a list of {"channel_name": ..., "status": ...} entries, where the
+    status is one of "created", "exists", "invalid", "not_found" or "error".
+    Entries which are not strings (e.g. from a JSON body) are invalid.
+    """
+    entries = []
+    seen = set()
+    for name in channel_names:
+        if isinstance(name, str):
+            if name in seen:
+                continue
+            seen.add(name)
+        entries.append(name)
+
+    def is_valid(name):
+        return isinstance(name, str) and name.startswith("@") and len(name) <= 255
+
+    status = {}
+    candidates = [name for name in entries if is_valid(name)]
+    for name in Researcher.objects.filter(channel_name__in=candidates).values_list(
+        "channel_name", flat=True
+    ):
+        status[name] = "exists"
+
+    to_fetch = [name for name in candidates if name not in status]
+    keys = fetch_public_keys(to_fetch, workers=workers) if to_fetch else {}
+
+    researchers = []
+    unusable_password = make_password(None)
+    for name, key in keys.items():
+        if isinstance(key, Exception):
+            status[name] = "error"
+        elif key is None:
+            status[name] = "not_found"
+        else:
+            status[name] = "created"
+            researchers.append(
+                Researcher(
+                    channel_name=name, public_key=key, password=unusable_password
+                )
+            )
+
+    while researchers:
+        try:
+            with transaction.atomic():
+                Researcher.objects.bulk_create(researchers, batch_size=500)
+            break
+        except IntegrityError:
+            # A concurrent registration inserted some of the channels first
+            taken = set(
+                Researcher.objects.filter(
+                    channel_name__in=[r.channel_name for r in researchers]
+                ).values_list("channel_name", flat=True)
+            )
+            if not taken:
+                raise
+            for name in taken:
+                status[name] = "exists"
+            researchers = [r for r in researchers if r.channel_name not in taken]
+
+    return [
+        {
+            "channel_name": name,
+            "status": status[name] if is_valid(name) else "invalid",
+        }
+        for name in entries
+    ]
@@ -0,0 +1,34 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional, see PAPR_JSON_RENDERER
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders JSON with orjson, which is several times faster than the standard
+    library on large responses. The output is the same as that of JSONRenderer:
+    UTC datetimes end with "Z" and other types are encoded by the DRF encoder.
+
+    Falls back to JSONRenderer when orjson is not installed, or when the client
+    asks for indented output.
+    """
+
+    options = 0 if orjson is None else orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=self.options)
+        # Same escapes as JSONRenderer, for embedding in JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
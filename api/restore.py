@@ -0,0 +1,241 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from api import conflicts, summaries, workload
+from api.export import EXPORTS
+from api.models import (
+    Manuscript,
+    Researcher,
+    RestoreCheckpoint,
+    Review,
+    ReviewerRecommendation,
+    ReviewRequest,
+    SubmittedArticle,
+)
+
+# Tables in the order they are restored, so that relations exist before the
+# rows which point to them.
+RESTORE_ORDER = [
+    "researchers",
+    "articles",
+    "manuscripts",
+    "reviewrequests",
+    "reviews",
+    "recommendations",
+]
+
+# Natural keys of the models which other tables point to
+NATURAL_KEYS = {
+    Researcher: "channel_name",
+    SubmittedArticle: "base_claim_name",
+    Manuscript: "claim_name",
+}
+
+# Fields identifying a restored row, so that rows which already exist are skipped.
+# Relations are compared by primary key, once resolved, and timestamps to the
+# millisecond, as exported.
+ROW_KEYS = {
+    Researcher: ["channel_name"],
+    SubmittedArticle: ["base_claim_name"],
+    Manuscript: ["claim_name"],
+    ReviewRequest: ["article_id", "reviewer_id", "submitted"],
+    Review: ["manuscript_id", "reviewer_id", "submitted"],
+    ReviewerRecommendation: ["article_id", "reviewer_id", "voucher_id"],
+}
+
+
+def find_export(directory, name):
+    """
+    Returns the path of the export of a table in `directory`, or None.
+    """
+    for extension in ["ndjson", "ndjson.gz"]:
+        path = os.path.join(directory, f"{name}.{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def open_export(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def truncate(value):
+    """
+    Truncates datetimes to the millisecond, the precision of the exports.
+    """
+    if isinstance(value, datetime):
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+    return value
+
+
+def resolve(rows, model, columns):
+    """
+    Replaces the natural keys of the relations of `rows` by primary keys, with one
+    query per relation. Relations which cannot be found are set to None.
+    """
+    for column in columns:
+        related = model._meta.get_field(column).related_model
+        key = NATURAL_KEYS[related]
+
+        values = {row[column] for row in rows if row[column] is not None}
+        pks = dict(
+            related.objects.filter(**{f"{key}__in": values}).values_list(key, "pk")
+        )
+        for row in rows:
+            row[f"{column}_id"] = pks.get(row.pop(column))
+
+
+def resolve_requests(rows):
+    """
+    Replaces the natural key of the review requests of review rows (article,
+    reviewer and submission time) by primary keys, in a single query.
+    """
+    keys = []
+    for row in rows:
+        submitted = row.pop("request_submitted", None)
+        keys.append(
+            (
+                row.pop("request_article", None),
+                row.pop("request_reviewer", None),
+                truncate(parse_datetime(submitted)) if submitted else None,
+            )
+        )
+
+    requests = ReviewRequest.objects.filter(
+        article__base_claim_name__in={article for article, _, _ in keys if article}
+    ).values_list(
+        "pk", "article__base_claim_name", "reviewer__channel_name", "submitted"
+    )
+    pks = {
+        (article, reviewer, truncate(submitted)): pk
+        for pk, article, reviewer, submitted in requests
+    }
+    for row, key in zip(rows, keys):
+        row["request_id"] = pks.get(key)
+
+
+def existing_keys(model, instances):
+    """
+    Keys (see ROW_KEYS) of the rows among `instances` which are already stored.
+    """
+    fields = ROW_KEYS[model]
+    values = {getattr(instance, fields[0]) for instance in instances}
+    lookup = Q(**{f"{fields[0]}__in": values - {None}})
+    if None in values:
+        lookup |= Q(**{f"{fields[0]}__isnull": True})
+    return {
+        tuple(map(truncate, row))
+        for row in model.objects.filter(lookup).values_list(*fields)
+    }
+
+
+def new_instances(model, instances):
+    """
+    Leaves out the instances which are already stored, or repeated.
+    """
+    seen = existing_keys(model, instances)
+    new = []
+    for instance in instances:
+        key = tuple(truncate(getattr(instance, f)) for f in ROW_KEYS[model])
+        if key not in seen:
+            seen.add(key)
+            new.append(instance)
+    return new
+
+
+def build(model, row):
+    for field in model._meta.concrete_fields:
+        if field.get_internal_type() == "DateTimeField" and row.get(field.name):
+            row[field.name] = parse_datetime(row[field.name])
+    instance = model(**row)
+    if model is Researcher:
+        instance.password = make_password(None)
+        instance.author_key = Researcher.make_author_key(instance.full_name)
+    elif model is Manuscript:
+        instance.content_hash = Manuscript.fingerprint(
+            instance.title, instance.authors, instance.abstract
+        )
+    return instance
+
+
+def restore_table(name, path, batch_size=1000):
+    """
+    Restores the rows of an NDJSON export, `batch_size` rows per transaction.
+
+    The number of lines restored is saved along with each batch, so a restore
+    which is interrupted resumes after the last committed batch. Rows which
+    already exist (see ROW_KEYS) are skipped.
+    """
+    model, columns = EXPORTS[name]
+    fields = {f.name: f for f in model._meta.concrete_fields}
+    relations = [c for c in columns if c in fields and fields[c].is_relation]
+    # bulk_create overwrites them with the current time
+    timestamps = [f.name for f in fields.values() if getattr(f, "auto_now_add", 0)]
+
+    checkpoint, _ = RestoreCheckpoint.objects.get_or_create(path=os.path.abspath(path))
+    done = checkpoint.lines
+    restored = 0
+
+    with open_export(path) as f:
+        lines = islice(f, checkpoint.lines, None)
+        while batch := list(islice(lines, batch_size)):
+            rows = [json.loads(line) for line in batch]
+            resolve(rows, model, relations)
+            if model is Review:
+                resolve_requests(rows)
+
+            with transaction.atomic():
+                instances = new_instances(model, [build(model, row) for row in rows])
+                exported = [[getattr(i, f) for f in timestamps] for i in instances]
+                model.objects.bulk_create(instances)
+                if timestamps and instances:
+                    for instance, values in zip(instances, exported):
+                        for field, value in zip(timestamps, values):
+                            if value is not None:
+                                setattr(instance, field, value)
+                    model.objects.bulk_update(instances, timestamps)
+                checkpoint.lines += len(batch)
+                checkpoint.save(update_fields=["lines"])
+            restored += len(batch)
+
+    return done, restored
+
+
+def restore(directory, tables=RESTORE_ORDER, batch_size=1000):
+    """
+    Restores the exports found in `directory` and rebuilds the counters and the
+    co-authorship index, which are not maintained by the bulk inserts.
+    Yields the name, path, lines already restored and lines restored of each table.
+    """
+    for name in RESTORE_ORDER:
+        if name not in tables:
+            continue
+        path = find_export(directory, name)
+        if path is None:
+            continue
+        done, restored = restore_table(name, path, batch_size=batch_size)
+        yield name, path, done, restored
+
+    summaries.rebuild()
+    workload.rebuild()
+    conflicts.rebuild()
+
+
+def reset(directory):
+    """
+    Forgets the progress of the restores of the exports in `directory`.
+    """
+    paths = [
+        os.path.abspath(os.path.join(directory, name)) for name in os.listdir(directory)
+    ]
+    RestoreCheckpoint.objects.filter(path__in=paths).delete()
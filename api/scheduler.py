@@ -0,0 +1,131 @@
+import heapq
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api import audit
+from api.assignment import assign_reviewers
+from api.models import ReviewRequest
+from api.transitions import transition
+
+logger = logging.getLogger(__name__)
+
+EXPIRED = 5
+
+
+class DeadlineScheduler:
+    """
+    Reminds reviewers of their review requests past deadline, and expires the
+    requests once they have been reminded PAPR_REQUEST_REMINDERS times, asking
+    another reviewer instead.
+
+    The deadlines up to `horizon` ahead are loaded from the indexed `deadline`
+    column, at most `batch_size` at a time, into an in-memory heap. A tick only
+    pops the due deadlines, so its cost depends on the number of due requests
+    and not on the number of open ones. The heap is reloaded once the loaded
+    window has passed, which also picks up the deadlines set in the meantime.
+    """
+
+    def __init__(self, batch_size=500, horizon=timedelta(hours=1)):
+        self.batch_size = batch_size
+        self.horizon = horizon
+
+        self._heap = []
+        self._loaded_until = None
+
+    def load(self, now):
+        """
+        Loads the earliest deadlines, up to `horizon` after `now`.
+        """
+        deadlines = list(
+            ReviewRequest.objects.filter(deadline__lte=now + self.horizon)
+            .order_by("deadline", "pk")
+            .values_list("deadline", "pk")[: self.batch_size]
+        )
+        self._heap = deadlines  # Already sorted, so a valid heap
+        if len(deadlines) == self.batch_size:
+            # The rest of the window is loaded once this batch is done
+            self._loaded_until = deadlines[-1][0]
+        else:
+            self._loaded_until = now + self.horizon
+
+    def tick(self, now=None):
+        """
+        Handles the requests which are due, and returns how many were handled.
+        """
+        now = now or timezone.now()
+        if self._loaded_until is None or self._loaded_until <= now:
+            self.load(now)
+
+        handled = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, pk = heapq.heappop(self._heap)
+            try:
+                handled += self.handle(pk, now)
+            except Exception:
+                logger.exception(
+                    f"Could not handle the deadline of review request {pk}"
+                )
+        return handled
+
+    def handle(self, pk, now):
+        """
+        Reminds the reviewer or expires the request, if it is still due.
+        """
+        req = (
+            ReviewRequest.objects.select_related("article", "reviewer")
+            .filter(pk=pk, deadline__lte=now)
+            .first()
+        )
+        if req is None:
+            # Answered, or already handled by another worker
+            return False
+
+        article = req.article.base_claim_name if req.article else ""
+        reviewer = req.reviewer.channel_name if req.reviewer else ""
+
+        if req.reminders < settings.PAPR_REQUEST_REMINDERS:
+            deadline = now + timedelta(days=settings.PAPR_REMINDER_INTERVAL)
+            reminded = ReviewRequest.objects.filter(
+                pk=pk, status_version=req.status_version, deadline=req.deadline
+            ).update(deadline=deadline, reminders=F("reminders") + 1)
+            if reminded:
+                audit.record(
+                    "review_reminder",
+                    actor=reviewer,
+                    article=article,
+                    status=req.status,
+                    reminder=req.reminders + 1,
+                )
+            return bool(reminded)
+
+        with transaction.atomic():
+            if not transition(req, EXPIRED):
+                return False
+            replacements = assign_reviewers(req.article, 1) if req.article else []
+
+        audit.record("review_request_expired", actor=reviewer, article=article)
+        for replacement in replacements:
+            audit.record(
+                "review_requested",
+                article=article,
+                reviewer=replacement.reviewer.channel_name,
+            )
+        return True
+
+    def run(self, interval):
+        while True:
+            close_old_connections()
+            try:
+                handled = self.tick()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            else:
+                if handled:
+                    logger.info(f"Handled {handled} review request deadlines")
+            time.sleep(interval)
@@ -6,13 +6,18 @@ from rest_framework.serializers import (
     RelatedField,
 )
 
+from django.conf import settings
+from django.utils import timezone
+
 from api.models import (
+    ArticleSummary,
     Manuscript,
     SubmittedArticle,
     Researcher,
     Review,
     ReviewerRecommendation,
 )
+from api.signatures import get_verifier
 
 
 class ManuscriptSerializer(ModelSerializer):
@@ -27,14 +32,32 @@ class ManuscriptSerializer(ModelSerializer):
         fields = ["title", "claim_name", "authors", "abstract", "article"]
 
 
+class ArticleSummarySerializer(ModelSerializer):
+    class Meta:
+        model = ArticleSummary
+        fields = [
+            "manuscripts",
+            "recommendations",
+            "requests_created",
+            "requests_pending",
+            "requests_declined",
+            "requests_accepted",
+            "requests_fulfilled",
+            "reviews",
+            "mean_rating",
+            "updated",
+        ]
+
+
 class SubmittedArticleSerializer(ModelSerializer):
     corresponding_author = SlugRelatedField(
         many=False, slug_field="channel_name", queryset=Researcher.objects.all()
     )
+    summary = ArticleSummarySerializer(read_only=True, allow_null=True)
 
     class Meta:
         model = SubmittedArticle
-        fields = ["base_claim_name", "corresponding_author", "revision"]
+        fields = ["base_claim_name", "corresponding_author", "revision", "summary"]
         read_only_fields = ["reviewed", "status"]
 
 
@@ -56,7 +79,21 @@ class ReviewSerializer(ModelSerializer):
         queryset=Researcher.objects.all(),
     )
 
-    # Verify signature
+    def validate(self, data):
+        public_key = data["reviewer"].public_key
+        if not public_key:
+            raise ValidationError("The reviewer has no registered public key")
+
+        valid = get_verifier().verify(
+            public_key,
+            data["signature"],
+            data["signing_ts"],
+            data["text"],
+            timeout=settings.PAPR_SIGNATURE_TIMEOUT,
+        )
+        if not valid:
+            raise ValidationError("The review signature is invalid")
+        return data
 
     class Meta:
         model = Review
@@ -100,3 +137,103 @@ class ReviewerRecommendationSerializer(ModelSerializer):
     class Meta:
         model = ReviewerRecommendation
         fields = ["article", "reviewer", "voucher"]
+
+
+def format_datetime(value):
+    """
+    Same representation as the DRF DateTimeField.
+    """
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer working from the `.values()` rows of a queryset, for
+    endpoints which render many rows: no model instance nor serializer field is
+    built, and related rows are read in the same query. `data` is the same as
+    that of the equivalent ModelSerializer with `many=True`.
+
+    Subclasses list the `lookups` they read and write `to_representation(row)`.
+    """
+
+    lookups = []
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        return [
+            self.to_representation(row) for row in self.queryset.values(*self.lookups)
+        ]
+
+    @staticmethod
+    def to_representation(row):
+        raise NotImplementedError
+
+
+class ManuscriptValuesSerializer(ValuesSerializer):
+    """
+    Read-only equivalent of ManuscriptSerializer.
+    """
+
+    lookups = ["title", "claim_name", "authors", "abstract", "article__base_claim_name"]
+
+    @staticmethod
+    def to_representation(row):
+        return {
+            "title": row["title"],
+            "claim_name": row["claim_name"],
+            "authors": row["authors"],
+            "abstract": row["abstract"],
+            "article": row["article__base_claim_name"],
+        }
+
+
+class SubmittedArticleValuesSerializer(ValuesSerializer):
+    """
+    Read-only equivalent of SubmittedArticleSerializer, summary included.
+    """
+
+    lookups = [
+        "base_claim_name",
+        "corresponding_author__channel_name",
+        "revision",
+        "summary__article",
+        *(
+            f"summary__{field}"
+            for field in ArticleSummarySerializer.Meta.fields
+            if field != "mean_rating"
+        ),
+        "summary__rating_total",
+    ]
+
+    @staticmethod
+    def to_representation(row):
+        if row["summary__article"] is None:
+            summary = None
+        else:
+            reviews = row["summary__reviews"]
+            summary = {
+                "manuscripts": row["summary__manuscripts"],
+                "recommendations": row["summary__recommendations"],
+                "requests_created": row["summary__requests_created"],
+                "requests_pending": row["summary__requests_pending"],
+                "requests_declined": row["summary__requests_declined"],
+                "requests_accepted": row["summary__requests_accepted"],
+                "requests_fulfilled": row["summary__requests_fulfilled"],
+                "reviews": reviews,
+                "mean_rating": (
+                    row["summary__rating_total"] / reviews if reviews else None
+                ),
+                "updated": format_datetime(row["summary__updated"]),
+            }
+        return {
+            "base_claim_name": row["base_claim_name"],
+            "corresponding_author": row["corresponding_author__channel_name"],
+            "revision": row["revision"],
+            "summary": summary,
+        }
@@ -0,0 +1,135 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api import caching, conflicts, summaries, workload
+from api.models import (
+    ArticleSummary,
+    Manuscript,
+    Researcher,
+    Review,
+    ReviewerRecommendation,
+    ReviewRequest,
+    SubmittedArticle,
+)
+
+
+def review_article_id(review):
+    return (
+        Manuscript.objects.filter(pk=review.manuscript_id)
+        .values_list("article_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=SubmittedArticle)
+def article_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ArticleSummary.objects.get_or_create(article=instance)
+    caching.invalidate_articles([instance.pk])
+
+
+@receiver(post_delete, sender=SubmittedArticle)
+def article_deleted(sender, instance, **kwargs):
+    caching.invalidate(
+        [
+            caching.article_id_key(instance.base_claim_name),
+            caching.escrow_key(instance.pk),
+        ]
+    )
+    caching.invalidate_articles([instance.pk])
+
+
+@receiver(post_save, sender=Researcher)
+def researcher_saved(sender, instance, update_fields=None, **kwargs):
+    # The public key of the channel may have been fetched again from the daemon
+    if update_fields is None or "public_key" in update_fields:
+        caching.invalidate(
+            [
+                caching.lbry_key(
+                    "macro_get_public_key", channel_name=instance.channel_name
+                )
+            ]
+        )
+
+
+def related_article_changed(sender, instance, raw=False, **kwargs):
+    # The status of an article includes the counters of its related rows
+    if not raw:
+        caching.invalidate_articles([instance.article_id])
+
+
+for model in [Manuscript, ReviewerRecommendation, ReviewRequest]:
+    post_save.connect(related_article_changed, sender=model)
+    post_delete.connect(related_article_changed, sender=model)
+
+
+def manuscript_keys(manuscript):
+    # The escrowed passwords of the article list its manuscripts
+    return [
+        caching.escrow_key(manuscript.article_id),
+        caching.lbry_key("resolve", urls=manuscript.claim_name),
+    ]
+
+
+@receiver(post_save, sender=Manuscript)
+def manuscript_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        summaries.increment(instance.article_id, manuscripts=1)
+        conflicts.record([instance.authors])
+    caching.invalidate(manuscript_keys(instance))
+
+
+@receiver(post_delete, sender=Manuscript)
+def manuscript_deleted(sender, instance, **kwargs):
+    summaries.increment(instance.article_id, manuscripts=-1)
+    caching.invalidate(manuscript_keys(instance))
+
+
+@receiver(post_save, sender=ReviewerRecommendation)
+def recommendation_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        summaries.increment(instance.article_id, recommendations=1)
+
+
+@receiver(post_delete, sender=ReviewerRecommendation)
+def recommendation_deleted(sender, instance, **kwargs):
+    summaries.increment(instance.article_id, recommendations=-1)
+
+
+@receiver(post_save, sender=ReviewRequest)
+def reviewrequest_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_status = None if created else getattr(instance, "_loaded_status", None)
+    if created or old_status != instance.status:
+        summaries.record_request_status(
+            instance.article_id, old_status, instance.status
+        )
+        workload.record_request_status(
+            instance.reviewer_id, old_status, instance.status
+        )
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=ReviewRequest)
+def reviewrequest_deleted(sender, instance, **kwargs):
+    old_status = getattr(instance, "_loaded_status", None)
+    summaries.record_request_status(instance.article_id, old_status, None)
+    workload.record_request_status(instance.reviewer_id, old_status, None)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        article_id = review_article_id(instance)
+        summaries.increment(article_id, reviews=1, rating_total=instance.rating)
+        workload.record_review(instance)
+        caching.invalidate_articles([article_id])
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    article_id = review_article_id(instance)
+    summaries.increment(article_id, reviews=-1, rating_total=-instance.rating)
+    workload.record_review(instance, sign=-1)
+    caching.invalidate_articles([article_id])
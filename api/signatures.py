@@ -0,0 +1,216 @@
+import base64
+import hashlib
+import queue
+import threading
+import time
+import multiprocessing
+
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class VerifierBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Signatures cannot be verified right now, try again later."
+    default_code = "verifier_busy"
+
+    def __init__(self, wait=None, detail=None):
+        super().__init__(detail)
+        self.wait = wait  # Sent as Retry-After
+
+
+def signing_digest(signing_ts, data):
+    """
+    Digest signed by a channel: sha256(signing_ts + data).
+    """
+    return hashlib.sha256(signing_ts.encode() + data.encode()).digest()
+
+
+def verify_signature(public_key, signature, signing_ts, data):
+    """
+    Verifies a SECP256k1 signature of `data` made at `signing_ts`.
+
+    `public_key` is the base64-encoded DER key stored in `Researcher.public_key`
+    and `signature` is the hex-encoded concatenation of r and s.
+    Returns False for any malformed input instead of raising.
+    """
+    # Imported here so that processes which never verify a review do not load it
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.asymmetric.utils import (
+        Prehashed,
+        encode_dss_signature,
+    )
+
+    try:
+        key = serialization.load_der_public_key(base64.b64decode(public_key))
+        raw = bytes.fromhex(signature)
+    except (ValueError, TypeError):
+        return False
+
+    if not isinstance(key, ec.EllipticCurvePublicKey) or len(raw) != 64:
+        return False
+
+    der_signature = encode_dss_signature(
+        int.from_bytes(raw[:32], "big"), int.from_bytes(raw[32:], "big")
+    )
+    try:
+        key.verify(
+            der_signature,
+            signing_digest(signing_ts, data),
+            ec.ECDSA(Prehashed(hashes.SHA256())),
+        )
+    except InvalidSignature:
+        return False
+    return True
+
+
+def verify_batch(items):
+    """
+    Verifies a list of (public_key, signature, signing_ts, data) tuples.
+    Runs inside the worker processes.
+    """
+    return [verify_signature(*item) for item in items]
+
+
+class SignatureVerifier:
+    """
+    Verifies signatures in a process pool, grouping the requests of concurrent
+    callers into batches so that a single pool task amortizes the IPC cost.
+
+    Callers block on a future, which releases the GIL while the worker
+    processes do the ECDSA math. With `workers=0`, verification runs inline.
+    """
+
+    def __init__(self, workers=2, batch_size=64, max_wait=0.005):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread = None
+
+    def submit(self, public_key, signature, signing_ts, data):
+        item = (public_key, signature, signing_ts, data)
+        future = Future()
+
+        if self.workers == 0:
+            future.set_result(verify_signature(*item))
+            return future
+
+        self._start()
+        self._queue.put((item, future))
+        return future
+
+    def verify(self, public_key, signature, signing_ts, data, timeout=None):
+        """
+        Raises VerifierBusy when the signature is not verified within `timeout`
+        seconds, because the pool is saturated.
+        """
+        future = self.submit(public_key, signature, signing_ts, data)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise VerifierBusy(wait=max(1, round(timeout or 0)))
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            # Forking a process that runs threads (the web server) is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._thread = threading.Thread(
+                target=self._run, name="signature-verifier", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._dispatch(batch)
+                    return
+                batch.append(entry)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        # Callers who timed out cancelled their future, the others can no longer
+        batch = [
+            (item, future)
+            for item, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        futures = [future for _, future in batch]
+        try:
+            job = self._executor.submit(verify_batch, [item for item, _ in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        def resolve(job):
+            try:
+                results = job.result()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future, result in zip(futures, results):
+                    future.set_result(result)
+
+        job.add_done_callback(resolve)
+
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_verifier():
+    global _verifier
+
+    with _verifier_lock:
+        if _verifier is None:
+            from django.conf import settings
+
+            _verifier = SignatureVerifier(
+                workers=settings.PAPR_SIGNATURE_WORKERS,
+                batch_size=settings.PAPR_SIGNATURE_BATCH_SIZE,
+                max_wait=settings.PAPR_SIGNATURE_BATCH_WAIT,
+            )
+        return _verifier
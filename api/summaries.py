@@ -0,0 +1,109 @@
+from django.db.models import Count, F, Q, Sum
+
+from api import caching
+from api.models import (
+    ArticleSummary,
+    Manuscript,
+    Review,
+    ReviewerRecommendation,
+    ReviewRequest,
+    SubmittedArticle,
+)
+
+REQUEST_STATUS_FIELDS = {
+    0: "requests_created",
+    1: "requests_pending",
+    2: "requests_declined",
+    3: "requests_accepted",
+    4: "requests_fulfilled",
+}
+
+
+def increment(article_id, **deltas):
+    """
+    Adds the given deltas to the counters of an article in a single UPDATE.
+    """
+    if article_id is None:
+        return
+
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if ArticleSummary.objects.filter(article_id=article_id).update(**changes) == 0:
+        # Articles created before the summaries existed
+        rebuild([article_id])
+
+
+def record_request_status(article_id, old_status, new_status):
+    """
+    Moves a review request between the status counters.
+    `old_status` is None for new requests and `new_status` is None for deleted ones.
+    """
+    deltas = {}
+    if old_status in REQUEST_STATUS_FIELDS:
+        deltas[REQUEST_STATUS_FIELDS[old_status]] = -1
+    if new_status in REQUEST_STATUS_FIELDS:
+        field = REQUEST_STATUS_FIELDS[new_status]
+        deltas[field] = deltas.get(field, 0) + 1
+    increment(article_id, **deltas)
+
+
+def rebuild(article_ids=None):
+    """
+    Recomputes the summaries from scratch, for all articles or only the given ones.
+    """
+    articles = SubmittedArticle.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+    ids = list(articles.values_list("pk", flat=True))
+
+    def counts(model, field, **aggregates):
+        return {
+            row[field]: row
+            for row in model.objects.filter(**{f"{field}__in": ids})
+            .values(field)
+            .annotate(**aggregates)
+        }
+
+    manuscripts = counts(Manuscript, "article", n=Count("pk"))
+    recommendations = counts(ReviewerRecommendation, "article", n=Count("pk"))
+    reviews = counts(Review, "manuscript__article", n=Count("pk"), total=Sum("rating"))
+    requests = counts(
+        ReviewRequest,
+        "article",
+        **{
+            field: Count("pk", filter=Q(status=status))
+            for status, field in REQUEST_STATUS_FIELDS.items()
+        },
+    )
+
+    summaries = []
+    for pk in ids:
+        summary = ArticleSummary(
+            article_id=pk,
+            manuscripts=manuscripts.get(pk, {}).get("n", 0),
+            recommendations=recommendations.get(pk, {}).get("n", 0),
+            reviews=reviews.get(pk, {}).get("n", 0),
+            rating_total=reviews.get(pk, {}).get("total") or 0,
+        )
+        for field in REQUEST_STATUS_FIELDS.values():
+            setattr(summary, field, requests.get(pk, {}).get(field, 0))
+        summaries.append(summary)
+
+    ArticleSummary.objects.bulk_create(
+        summaries,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["article"],
+        update_fields=[
+            "manuscripts",
+            "recommendations",
+            "reviews",
+            "rating_total",
+            *REQUEST_STATUS_FIELDS.values(),
+        ],
+    )
+    caching.invalidate_articles(ids)
+    return len(summaries)
@@ -0,0 +1,140 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+def refill(bucket, capacity, rate, now):
+    """
+    Takes one token from a (tokens, timestamp) bucket.
+    Returns the new bucket and the number of seconds to wait if it was empty.
+    """
+    tokens, last = bucket if bucket is not None else (capacity, now)
+    tokens = min(capacity, tokens + (now - last) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class LocalBucketStore:
+    """
+    Token buckets kept in the memory of the current process.
+    """
+
+    max_keys = 100000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._buckets) >= self.max_keys:
+                self._evict_idle(now)
+            self._buckets[key], wait = refill(
+                self._buckets.get(key), capacity, rate, now
+            )
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def _evict_idle(self, now):
+        # An idle bucket has refilled and is equivalent to a missing one
+        for key, (tokens, last) in list(self._buckets.items()):
+            if now - last > 3600:
+                del self._buckets[key]
+
+
+class CacheBucketStore:
+    """
+    Token buckets shared between processes through a Django cache.
+    The read-modify-write is not atomic, so concurrent requests of the same
+    client on different workers may occasionally get an extra token.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def take(self, key, capacity, rate):
+        key = f"throttle:{key}"
+        bucket, wait = refill(self.cache.get(key), capacity, rate, time.time())
+        self.cache.set(key, bucket, timeout=int(capacity / rate) + 1)
+        return wait
+
+    def clear(self):
+        self.cache.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            if settings.PAPR_THROTTLE_CACHE:
+                _store = CacheBucketStore(settings.PAPR_THROTTLE_CACHE)
+            else:
+                _store = LocalBucketStore()
+        return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket rate limiting per channel (or per IP address for anonymous requests).
+
+    Each scope also has a server-wide bucket shared by all clients, so that expensive
+    requests are refused with a 429 before they exhaust the workers or the daemon.
+    """
+
+    scope = "default"
+
+    def __init__(self):
+        self._wait = None
+
+    def get_cache_key(self, request):
+        if request.auth is not None and "researcher_id" in request.auth:
+            return f"{self.scope}:channel:{request.auth['researcher_id']}"
+        return f"{self.scope}:ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        if not settings.PAPR_THROTTLE_ENABLED:
+            return True
+
+        store = get_store()
+
+        capacity, rate = settings.PAPR_THROTTLE_RATES[self.scope]
+        wait = store.take(self.get_cache_key(request), capacity, rate)
+
+        if not wait and self.scope in settings.PAPR_THROTTLE_SERVER_RATES:
+            capacity, rate = settings.PAPR_THROTTLE_SERVER_RATES[self.scope]
+            wait = store.take(f"{self.scope}:server", capacity, rate)
+
+        self._wait = wait
+        return not wait
+
+    def wait(self):
+        return self._wait
+
+
+class DaemonThrottle(TokenBucketThrottle):
+    """
+    For the requests which call the LBRY daemon.
+    """
+
+    scope = "daemon"
+
+
+class CryptoThrottle(TokenBucketThrottle):
+    """
+    For the requests which do expensive cryptographic operations.
+    """
+
+    scope = "crypto"
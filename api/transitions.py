@@ -0,0 +1,64 @@
+from django.db.models import F
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api import caching, summaries, workload
+from api.models import ReviewRequest, SubmittedArticle
+
+
+class TransitionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The status was changed by another request, please retry."
+    default_code = "transition_conflict"
+
+
+def transition(instance, new_status, from_status=None):
+    """
+    Moves a `ReviewRequest` or `SubmittedArticle` to `new_status` with a single
+    UPDATE, which only applies if the row still has the status (`from_status`, or
+    the loaded one) and the `status_version` it was loaded with. Nothing is
+    locked: of two concurrent transitions, the later one fails instead of
+    overwriting the first.
+    The deadline of a review request is reset for its new status.
+
+    Returns False when the row was changed (or deleted) in the meantime.
+    """
+    old_status = instance.status if from_status is None else from_status
+
+    changes = {}
+    if isinstance(instance, ReviewRequest):
+        changes = {"deadline": ReviewRequest.deadline_for(new_status), "reminders": 0}
+
+    updated = (
+        type(instance)
+        .objects.filter(
+            pk=instance.pk, status=old_status, status_version=instance.status_version
+        )
+        .update(status=new_status, status_version=F("status_version") + 1, **changes)
+    )
+    if not updated:
+        return False
+
+    instance.status = new_status
+    instance.status_version += 1
+    for field, value in changes.items():
+        setattr(instance, field, value)
+
+    # The counters and the cache are maintained by the post_save signals, which
+    # update() skips
+    if isinstance(instance, SubmittedArticle):
+        caching.invalidate_articles([instance.pk])
+    if isinstance(instance, ReviewRequest):
+        caching.invalidate_articles([instance.article_id])
+        summaries.record_request_status(instance.article_id, old_status, new_status)
+        workload.record_request_status(instance.reviewer_id, old_status, new_status)
+        instance._loaded_status = new_status
+    return True
+
+
+def transition_or_conflict(instance, new_status, from_status=None):
+    """
+    Same as `transition`, but raises TransitionConflict (409) when it does not apply.
+    """
+    if not transition(instance, new_status, from_status=from_status):
+        raise TransitionConflict()
@@ -3,11 +3,21 @@ from api import views
 
 urlpatterns = [
     # path('manuscripts/', views.manuscript_list),
+    path("article/list", views.article_list),
     path("article/status/<str:base_claim_name>", views.article_status),
+    path("article/manuscripts/<str:base_claim_name>", views.article_manuscripts),
+    path("article/diff/<str:base_claim_name>", views.article_diff),
+    path("article/keys/<str:base_claim_name>", views.article_keys),
     path("article/submit", views.submit),
     path("article/accept", views.article_accept),
+    path("editor/assign", views.editor_assign),
+    path("editor/queue", views.editor_queue),
+    path("audit/export", views.audit_export),
+    path("export/<str:name>", views.data_export),
     path("channel/register", views.register),
+    path("channel/register_batch", views.register_batch),
     path("channel/update_contact", views.update_contact),
+    path("health", views.health),
     path("info/", views.info),
     path("review/accept", views.reviewrequest_accept),
     path("review/decline", views.reviewrequest_decline),
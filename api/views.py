@@ -1,40 +1,54 @@
 import asyncio
 import time
-import lbry
-import logging
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.shortcuts import render
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 
 from rest_framework import status
 from rest_framework.decorators import (
     api_view,
     authentication_classes,
     permission_classes,
+    throttle_classes,
 )
 from rest_framework.response import Response
 
-from papr.cli import call
-from papr.utilities import DualLogger
-
+from api import audit, caching, escrow, export
+from api.assignment import assign_reviewers
+from api.daemon import breaker, call
+from api.diffs import revision_diffs
+from api.editor import review_queue
+from api.indexer import lookup_claim
 from api.models import (
+    AuditEvent,
     Review,
     Manuscript,
     ReviewerRecommendation,
+    ReviewRequest,
     Researcher,
     SubmittedArticle,
 )
+from api.permissions import IsSuperuser
+from api.registration import fetch_public_key, import_researchers, parse_channel_names
+from api.throttling import DaemonThrottle
+from api.transitions import transition_or_conflict
 from api.serializers import (
     ManuscriptSerializer,
+    ManuscriptValuesSerializer,
     ResearcherSerializer,
     SubmittedArticleSerializer,
+    SubmittedArticleValuesSerializer,
     ReviewSerializer,
     ReviewerRecommendationSerializer,
 )
 
+from papr_server.adapter import get_logger
 from papr_server.settings import PAPR_SERVER_NAME, PAPR_SERVER_CHANNEL_NAME
 
-logger = DualLogger(logging.getLogger(__name__))
+logger = get_logger(__name__)
 
 SERVER_DESC = {
     "name": PAPR_SERVER_NAME,
@@ -45,19 +59,209 @@ SERVER_DESC = {
 
 @api_view(["GET"])
 def article_status(request, base_claim_name):
+    # Cached in the shared cache by primary key, and invalidated when the article
+    # or its related rows change (see api.signals)
+    article_id = cache.get(caching.article_id_key(base_claim_name))
+    cached = (
+        None
+        if article_id is None
+        else cache.get(caching.article_status_key(article_id))
+    )
+    if cached is None:
+        articles = SubmittedArticle.objects.filter(base_claim_name=base_claim_name)
+        if settings.PAPR_SERIALIZERS == "values":
+            row = articles.values(
+                "pk", *SubmittedArticleValuesSerializer.lookups
+            ).first()
+            if row is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            article_id = row["pk"]
+            data = SubmittedArticleValuesSerializer.to_representation(row)
+        else:
+            article = articles.select_related("corresponding_author", "summary").first()
+            if article is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            article_id = article.pk
+            data = dict(SubmittedArticleSerializer(article).data)
+
+        cached = (data["corresponding_author"], data)
+        cache.set_many(
+            {
+                caching.article_id_key(base_claim_name): article_id,
+                caching.article_status_key(article_id): cached,
+            },
+            timeout=settings.PAPR_RESPONSE_CACHE_TIMEOUT,
+        )
+
+    author, data = cached
+    if author != request.auth["researcher_id"]:
+        return Response(status=status.HTTP_403_FORBIDDEN)
+
+    return Response(data)
+
+
+@api_view(["GET"])
+def article_list(request):
+    """
+    Lists the articles of the authenticated researcher, by base claim name.
+    Optional query parameters: `after` (the `next` value of the previous page) and
+    `limit`.
+    """
     try:
-        article = SubmittedArticle.objects.get(base_claim_name=base_claim_name)
-    except Manuscript.DoesNotExist:
-        return Response(status=status.HTTP_404_NOT_FOUND)
+        limit = int(request.query_params.get("limit", settings.PAPR_QUEUE_PAGE_SIZE))
+    except ValueError:
+        return Response(
+            logger.error("The limit parameter must be an integer"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    limit = max(1, min(limit, settings.PAPR_QUEUE_MAX_PAGE_SIZE))
+
+    articles = SubmittedArticle.objects.filter(
+        corresponding_author__channel_name=request.auth["researcher_id"],
+        base_claim_name__gt=request.query_params.get("after", ""),
+    ).order_by("base_claim_name")
+    # One more row than the page tells whether there is a next page
+    if settings.PAPR_SERIALIZERS == "values":
+        results = SubmittedArticleValuesSerializer(articles[: limit + 1]).data
+    else:
+        articles = articles.select_related("corresponding_author", "summary")
+        results = SubmittedArticleSerializer(articles[: limit + 1], many=True).data
+    has_next = len(results) > limit
+    results = results[:limit]
+
+    return Response(
+        {
+            "results": results,
+            "next": results[-1]["base_claim_name"] if has_next else None,
+        },
+        status=status.HTTP_200_OK,
+    )
+
 
-    if article.corresponding_author.channel_name != request.auth["researcher_id"]:
+@api_view(["GET"])
+def article_manuscripts(request, base_claim_name):
+    """
+    Lists the manuscripts of an article, from the first submitted.
+    Requires the client to be authenticated as the corresponding author.
+    """
+    article = (
+        SubmittedArticle.objects.filter(base_claim_name=base_claim_name)
+        .values("pk", "corresponding_author__channel_name")
+        .first()
+    )
+    if article is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    if article["corresponding_author__channel_name"] != request.auth["researcher_id"]:
         return Response(status=status.HTTP_403_FORBIDDEN)
 
-    serializer = SubmittedArticleSerializer(article)
-    return Response(serializer.data)
+    manuscripts = Manuscript.objects.filter(article=article["pk"]).order_by(
+        "submitted", "pk"
+    )
+    if settings.PAPR_SERIALIZERS == "values":
+        return Response(ManuscriptValuesSerializer(manuscripts).data)
+    manuscripts = manuscripts.select_related("article")
+    return Response(ManuscriptSerializer(manuscripts, many=True).data)
+
+
+@api_view(["GET"])
+def article_diff(request, base_claim_name):
+    """
+    Shows what changed between the consecutive revisions of an article.
+    Available to the corresponding author and to the reviewers of the article.
+    """
+    try:
+        article = SubmittedArticle.objects.select_related("corresponding_author").get(
+            base_claim_name=base_claim_name
+        )
+    except SubmittedArticle.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    channel_name = request.auth["researcher_id"]
+    is_author = (
+        article.corresponding_author is not None
+        and article.corresponding_author.channel_name == channel_name
+    )
+    if not is_author and not request.user.is_superuser:
+        is_reviewer = article.reviewers_contacted.filter(
+            reviewer__channel_name=channel_name, status__in=[3, 4]
+        ).exists()
+        if not is_reviewer:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+    return Response({"diffs": revision_diffs(article)}, status=status.HTTP_200_OK)
+
+
+@api_view(["GET", "POST"])
+def article_keys(request, base_claim_name):
+    """
+    GET: returns the passphrases of an encrypted article and the passwords of its
+    manuscripts, to its corresponding author and to the reviewers who accepted.
+    POST: lets the corresponding author deposit them in the escrow, as
+    {"encryption_passphrase", "review_passphrase", "manuscripts": {claim_name:
+    {"encryption_password", "review_password"}}}.
+    """
+    try:
+        article = SubmittedArticle.objects.select_related("corresponding_author").get(
+            base_claim_name=base_claim_name
+        )
+    except SubmittedArticle.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    channel_name = request.auth["researcher_id"]
+    is_author = (
+        article.corresponding_author is not None
+        and article.corresponding_author.channel_name == channel_name
+    )
+
+    if request.method == "POST":
+        if not is_author:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        manuscripts = request.data.get("manuscripts", {})
+        valid = isinstance(manuscripts, dict) and all(
+            isinstance(passwords, dict) for passwords in manuscripts.values()
+        )
+        secrets = [
+            request.data[field]
+            for field in SubmittedArticle.SECRET_FIELDS
+            if field in request.data
+        ]
+        if valid:
+            for passwords in manuscripts.values():
+                secrets += [
+                    passwords[field]
+                    for field in Manuscript.SECRET_FIELDS
+                    if field in passwords
+                ]
+        if not valid or not all(isinstance(secret, str) for secret in secrets):
+            return Response(
+                logger.error(
+                    "Passphrases and passwords must be strings, and manuscripts an "
+                    "object of claim names to passwords"
+                ),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        escrow.deposit(
+            article,
+            passphrases=request.data,
+            manuscripts=manuscripts,
+        )
+        audit.record("keys_deposited", actor=channel_name, article=base_claim_name)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    if not is_author:
+        is_reviewer = article.reviewers_contacted.filter(
+            reviewer__channel_name=channel_name, status__in=[3, 4]
+        ).exists()
+        if not is_reviewer:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+    return Response(escrow.article_keys(article), status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
+@throttle_classes([DaemonThrottle])
 def submit(request):
     """
     Submit a manuscript for peer-review mediated by this server.
@@ -103,17 +307,22 @@ def submit(request):
         if not man_ser.is_valid():
             return Response(man_ser.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        res = call("resolve", urls=request.data["claim_name"]).json()
-        if (
-            request.data["claim_name"] not in res["result"]
-            or "error" in res["result"][request.data["claim_name"]]
-        ):
-            return Response(
-                logger.error("Publication not found on the blockchain"),
-                status=status.HTTP_404_NOT_FOUND,
-            )
+        # Use the local claim index and only ask the daemon on a miss
+        pub_data = lookup_claim(
+            request.data["claim_name"], request.auth["researcher_id"]
+        )
+        if pub_data is None:
+            res = call("resolve", urls=request.data["claim_name"])
+            if (
+                request.data["claim_name"] not in res["result"]
+                or "error" in res["result"][request.data["claim_name"]]
+            ):
+                return Response(
+                    logger.error("Publication not found on the blockchain"),
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-        pub_data = res["result"][request.data["claim_name"]]
+            pub_data = res["result"][request.data["claim_name"]]
 
         if (
             "is_channel_signature_valid" not in pub_data
@@ -143,7 +352,36 @@ def submit(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        man_ser.save()
+        # Rejects the same content and stream already submitted under another claim
+        # name (e.g. re-published after a failed submit), so that it is not stored
+        # twice. The stream of the claim is only known once it is resolved, so this
+        # saves no daemon call unless the claim was indexed. Claims without a
+        # stream cannot be compared.
+        sd_hash = pub_data["value"].get("source", {}).get("sd_hash", "")
+        if (
+            sd_hash
+            and Manuscript.objects.filter(
+                content_hash=Manuscript.fingerprint(
+                    request.data["title"],
+                    request.data["authors"],
+                    request.data.get("abstract", ""),
+                ),
+                sd_hash=sd_hash,
+            ).exists()
+        ):
+            return Response(
+                logger.error("This manuscript has already been submitted"),
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        man_ser.save(sd_hash=sd_hash)
+        audit.record(
+            "manuscript_submitted",
+            actor=request.auth["researcher_id"],
+            article=base_claim_name,
+            claim_name=request.data["claim_name"],
+            revision=request.data["revision"],
+        )
         return Response(man_ser.data, status=status.HTTP_201_CREATED)
 
 
@@ -153,9 +391,92 @@ def article_accept(request):
     pass
 
 
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def editor_queue(request):
+    """
+    Lists the articles waiting on reviewers, with the state of their review requests.
+    Optional query parameters: `status` (article status), `after` (the `next` value
+    of the previous page) and `limit`.
+    """
+    try:
+        state = request.query_params.get("status")
+        if state is not None:
+            state = int(state)
+        after = int(request.query_params.get("after", 0))
+        limit = int(request.query_params.get("limit", settings.PAPR_QUEUE_PAGE_SIZE))
+    except ValueError:
+        return Response(
+            logger.error("The status, after and limit parameters must be integers"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    limit = max(1, min(limit, settings.PAPR_QUEUE_MAX_PAGE_SIZE))
+
+    # One more row than the page tells whether there is a next page
+    articles = review_queue(status=state, after=after, limit=limit + 1)
+    has_next = len(articles) > limit
+    articles = articles[:limit]
+    return Response(
+        {
+            "results": articles,
+            "next": articles[-1]["pk"] if has_next else None,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsSuperuser])
+def editor_assign(request):
+    """
+    Sends review requests for an article to `count` reviewers (3 by default, at
+    most PAPR_ASSIGN_MAX_REVIEWERS), preferring recommended reviewers and the
+    reviewers with the fewest open requests.
+    """
+    if "base_claim_name" not in request.data:
+        return Response(
+            logger.error("An article base claim name must be specified"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        article = SubmittedArticle.objects.get(
+            base_claim_name=request.data["base_claim_name"]
+        )
+    except SubmittedArticle.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        count = int(request.data.get("count", 3))
+    except (TypeError, ValueError):
+        return Response(
+            logger.error("The number of reviewers must be an integer"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if count < 1:
+        return Response(
+            logger.error("The number of reviewers must be at least 1"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    count = min(count, settings.PAPR_ASSIGN_MAX_REVIEWERS)
+
+    requests = assign_reviewers(article, count)
+    for req in requests:
+        audit.record(
+            "review_requested",
+            actor=request.auth["researcher_id"],
+            article=article.base_claim_name,
+            reviewer=req.reviewer.channel_name,
+        )
+    return Response(
+        {"reviewers": [req.reviewer.channel_name for req in requests]},
+        status=status.HTTP_201_CREATED,
+    )
+
+
 @api_view(["POST"])
 def reviewrequest_decline(request):
-    return _reviewrequest_modify(request, accept=false)
+    return _reviewrequest_modify(request, accept=False)
 
 
 @api_view(["POST"])
@@ -214,8 +535,12 @@ def _reviewrequest_modify(request, accept=True):
         elif relevant_requests.count() == 1:
             req = relevant_requests.first()
             if accept:
-                req.status = 3
-                req.save()
+                transition_or_conflict(req, 3)
+                audit.record(
+                    "review_request_accepted",
+                    actor=request.auth["researcher_id"],
+                    article=article.base_claim_name,
+                )
                 return Response(
                     logger.info(
                         "The review request has been marked as accepted, thank you!"
@@ -223,8 +548,12 @@ def _reviewrequest_modify(request, accept=True):
                     status=status.HTTP_200_OK,
                 )
             else:
-                req.status = 2
-                req.save()
+                transition_or_conflict(req, 2)
+                audit.record(
+                    "review_request_declined",
+                    actor=request.auth["researcher_id"],
+                    article=article.base_claim_name,
+                )
                 return Response(
                     logger.info("The review request has been marked as declined."),
                     status=status.HTTP_200_OK,
@@ -241,6 +570,9 @@ def review(request):
     if "reviewer" in request.data:
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
+    # The review is signed by the authenticated channel
+    request.data["reviewer"] = request.auth["researcher_id"]
+
     serializer = ReviewSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -258,14 +590,21 @@ def review(request):
         )
     elif pending_reviews.count() == 1:
         req = pending_reviews.first()
-        req.status = 4
-        req.save()
     else:
         raise Exception(
-            f"Multiple pending requests for {request.auth['researcher_id']} and article {article.base_claim_name}, this should not happen"
+            f"Multiple pending requests for {request.auth['researcher_id']} and article {man.article.base_claim_name}, this should not happen"
         )
 
-    serializer.save(reviewer=reviewer, request=req)
+    # A review submitted twice concurrently is only stored once
+    with transaction.atomic():
+        transition_or_conflict(req, 4)
+        serializer.save(request=req)
+    audit.record(
+        "review_submitted",
+        actor=request.auth["researcher_id"],
+        article=man.article.base_claim_name,
+        claim_name=man.claim_name,
+    )
 
     return Response(
         logger.info(
@@ -287,6 +626,12 @@ def recommend(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     serializer.save()
+    audit.record(
+        "reviewer_recommended",
+        actor=request.auth["researcher_id"],
+        article=request.data["article"],
+        reviewer=request.data["reviewer"],
+    )
 
     return Response(
         logger.info(
@@ -299,6 +644,7 @@ def recommend(request):
 @api_view(["POST"])
 @authentication_classes([])
 @permission_classes([])
+@throttle_classes([DaemonThrottle])
 def register(request):
     if "channel_name" not in request.data:
         return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -317,15 +663,11 @@ def register(request):
     if not serializer.is_valid():
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    ret = call("macro_get_public_key", channel_name=channel_name)
-    if "error" in ret:
+    public_key = fetch_public_key(channel_name)
+    if public_key is None:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    data = ret.json()
-    if "info" in data["result"]:
-        return Response(status=status.HTTP_404_NOT_FOUND)
-
-    serializer.save(public_key=data["result"]["public_key"])
+    serializer.save(public_key=public_key)
     # return server info
     ## Description
     ## Public key
@@ -336,6 +678,38 @@ def register(request):
     )
 
 
+@api_view(["POST"])
+@permission_classes([IsSuperuser])
+@throttle_classes([DaemonThrottle])
+def register_batch(request):
+    """
+    Registers many channels at once, e.g. to onboard a whole institution.
+    The channels are given either as a list in `channel_names` or as an uploaded
+    text file `file` with one channel name per line.
+    Returns the outcome for each channel.
+    """
+    if "file" in request.FILES:
+        try:
+            lines = request.FILES["file"].read().decode().splitlines()
+        except UnicodeDecodeError:
+            return Response(
+                logger.error("The file must be UTF-8 encoded text"),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        channel_names = parse_channel_names(lines)
+    elif isinstance(request.data.get("channel_names"), list):
+        channel_names = request.data["channel_names"]
+    else:
+        return Response(
+            logger.error("A list of channel names or a file must be provided"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        {"report": import_researchers(channel_names)}, status=status.HTTP_200_OK
+    )
+
+
 @api_view(["GET"])
 @authentication_classes([])
 @permission_classes([])
@@ -346,6 +720,77 @@ def info(request):
     )
 
 
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def audit_export(request):
+    """
+    Streams the audit log as newline-delimited JSON.
+    Optional query parameters: `after` (last event id already exported) and `event`.
+    """
+    events = AuditEvent.objects.all()
+    try:
+        events = events.filter(pk__gt=int(request.query_params.get("after", 0)))
+    except ValueError:
+        return Response(
+            logger.error("The after parameter must be an integer"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if "event" in request.query_params:
+        events = events.filter(event=request.query_params["event"])
+
+    return StreamingHttpResponse(
+        export.stream("events", queryset=events), content_type="application/x-ndjson"
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def data_export(request, name):
+    """
+    Streams all the rows of a table (articles, manuscripts, reviews, ...) for backups
+    and analytics. Optional query parameters: `type` (ndjson or csv) and `gzip`.
+    """
+    if name not in export.EXPORTS:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    kind = request.query_params.get("type", "ndjson")
+    if kind not in export.FORMATS:
+        return Response(
+            logger.error(f"Unknown export type {kind}"),
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    compress = request.query_params.get("gzip") in ("1", "true")
+
+    content_type, extension = export.FORMATS[kind]
+    filename = f"{name}.{extension}"
+    if compress:
+        content_type = "application/gzip"
+        filename += ".gz"
+
+    response = StreamingHttpResponse(
+        export.stream(name, kind=kind, compress=compress), content_type=content_type
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([])
+def health(request):
+    """
+    Reports whether the server is fully operational or running without the daemon.
+    """
+    daemon = breaker.stats()
+    return JsonResponse(
+        {
+            "status": "ok" if daemon["state"] == breaker.CLOSED else "degraded",
+            "daemon": daemon,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
 @api_view(["POST"])
 def update_contact(request):
     """
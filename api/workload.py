@@ -0,0 +1,98 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, Q
+
+from api.models import Researcher, ReviewerWorkload, ReviewRequest
+
+REQUEST_STATUS_FIELDS = {
+    1: "requests_pending",
+    2: "requests_declined",
+    3: "requests_accepted",
+    4: "requests_fulfilled",
+}
+
+
+def increment(reviewer_id, **deltas):
+    """
+    Adds the given deltas to the counters of a reviewer in a single UPDATE.
+    """
+    if reviewer_id is None:
+        return
+
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if ReviewerWorkload.objects.filter(reviewer_id=reviewer_id).update(**changes) == 0:
+        # First request of this reviewer, or reviewer who predates the counters
+        rebuild([reviewer_id])
+
+
+def record_request_status(reviewer_id, old_status, new_status):
+    """
+    Moves a review request of a reviewer between the status counters.
+    `old_status` is None for new requests and `new_status` is None for deleted ones.
+    """
+    deltas = {}
+    if old_status in REQUEST_STATUS_FIELDS:
+        deltas[REQUEST_STATUS_FIELDS[old_status]] = -1
+    if new_status in REQUEST_STATUS_FIELDS:
+        field = REQUEST_STATUS_FIELDS[new_status]
+        deltas[field] = deltas.get(field, 0) + 1
+    increment(reviewer_id, **deltas)
+
+
+def record_review(review, sign=1):
+    """
+    Adds the time between a fulfilled review request and its review to the
+    turnaround of the reviewer (or removes it, with `sign=-1`), as `rebuild` does.
+    """
+    request = review.request
+    if request is None or request.status != 4:
+        return
+    turnaround = (review.submitted - request.submitted).total_seconds()
+    increment(request.reviewer_id, turnaround_total=sign * turnaround)
+
+
+def rebuild(reviewer_ids=None):
+    """
+    Recomputes the workloads from scratch, for all reviewers or only the given ones.
+    """
+    reviewers = Researcher.objects.all()
+    if reviewer_ids is not None:
+        reviewers = reviewers.filter(pk__in=reviewer_ids)
+    ids = list(reviewers.values_list("pk", flat=True))
+
+    requests = ReviewRequest.objects.filter(reviewer__in=ids)
+    counts = {
+        row["reviewer"]: row
+        for row in requests.values("reviewer").annotate(
+            **{
+                field: Count("pk", filter=Q(status=status))
+                for status, field in REQUEST_STATUS_FIELDS.items()
+            }
+        )
+    }
+
+    turnaround = defaultdict(float)
+    for reviewer, submitted, reviewed in requests.filter(
+        status=4, final_review__isnull=False
+    ).values_list("reviewer", "submitted", "final_review__submitted"):
+        turnaround[reviewer] += (reviewed - submitted).total_seconds()
+
+    workloads = []
+    for pk in ids:
+        workload = ReviewerWorkload(reviewer_id=pk, turnaround_total=turnaround[pk])
+        for field in REQUEST_STATUS_FIELDS.values():
+            setattr(workload, field, counts.get(pk, {}).get(field, 0))
+        workloads.append(workload)
+
+    ReviewerWorkload.objects.bulk_create(
+        workloads,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["reviewer"],
+        update_fields=["turnaround_total", *REQUEST_STATUS_FIELDS.values()],
+    )
+    return len(workloads)
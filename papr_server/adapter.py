@@ -0,0 +1,59 @@
+"""
+Thin adapter over the papr client and the LBRY SDK.
+
+Importing either loads the whole LBRY SDK, which most processes (management
+commands, workers which never reach the daemon) do not need. They are only
+imported the first time one of the functions below is called.
+"""
+
+import importlib
+import logging
+
+
+def _papr(module):
+    # The LBRY SDK must be loaded before papr to avoid a circular import
+    importlib.import_module("lbry.wallet.manager")
+    return importlib.import_module(f"papr.{module}")
+
+
+def call(method, **kwargs):
+    """
+    Calls a method of the LBRY daemon through the papr client.
+    """
+    return _papr("cli").call(method, **kwargs)
+
+
+def generate_keys(password=None):
+    """
+    Generates a SECP256k1 keypair, returned as (private key, public key).
+    """
+    return _papr("utilities").generate_SECP256k1_keys(password)
+
+
+def encrypt_text(private_key, public_key, text):
+    return _papr("utilities").SECP_encrypt_text(private_key, public_key, text)
+
+
+def decrypt_text(private_key, public_key, text):
+    return _papr("utilities").SECP_decrypt_text(private_key, public_key, text)
+
+
+class LazyLogger:
+    """
+    papr's DualLogger (which logs a message and returns it as a response body),
+    created on first use.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._logger = None
+
+    def __getattr__(self, attr):
+        if self._logger is None:
+            DualLogger = _papr("utilities").DualLogger
+            self._logger = DualLogger(logging.getLogger(self.name))
+        return getattr(self._logger, attr)
+
+
+def get_logger(name):
+    return LazyLogger(name)
@@ -0,0 +1,115 @@
+import collections
+import queue
+import threading
+import time
+
+
+class KeypairPool:
+    """
+    Bounded pool of pre-generated ephemeral keypairs, refilled by a background thread.
+
+    Every keypair is handed out at most once. When the pool runs dry, a keypair is
+    generated synchronously, so callers never wait on the refill thread.
+    """
+
+    def __init__(self, generate, size=64, idle_interval=1.0):
+        self.generate = generate
+        self.size = size
+        self.idle_interval = idle_interval
+
+        self._keys = queue.Queue(maxsize=size)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self._timestamps = collections.deque(maxlen=max(size, 2))
+
+    def get(self):
+        self.start()
+        try:
+            keypair = self._keys.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                self.misses += 1
+            keypair = self.generate(None)
+        else:
+            with self._lock:
+                self.hits += 1
+        self._wake.set()
+        return keypair
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._refill, name="keypair-pool", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join()
+
+    def stats(self):
+        with self._lock:
+            timestamps = list(self._timestamps)
+            hits, misses = self.hits, self.misses
+
+        if len(timestamps) > 1 and timestamps[-1] > timestamps[0]:
+            refill_rate = (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+        else:
+            refill_rate = 0.0
+
+        requests = hits + misses
+        return {
+            "size": self.size,
+            "depth": self._keys.qsize(),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / requests if requests else 0.0,
+            "generated": self.generated,
+            "refill_rate": refill_rate,  # keypairs/s over the recent refills
+        }
+
+    def _refill(self):
+        while not self._stop.is_set():
+            if self._keys.full():
+                self._wake.wait(self.idle_interval)
+                self._wake.clear()
+                continue
+
+            keypair = self.generate(None)
+            try:
+                self._keys.put_nowait(keypair)
+            except queue.Full:
+                continue
+
+            with self._lock:
+                self.generated += 1
+                self._timestamps.append(time.monotonic())
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_keypool():
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            from django.conf import settings
+            from papr_server.adapter import generate_keys
+
+            _pool = KeypairPool(generate_keys, size=settings.PAPR_KEYPOOL_SIZE)
+        return _pool
@@ -0,0 +1,152 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+import uuid
+
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+logger = logging.getLogger(__name__)
+
+
+class CProfiler:
+    extension = "prof"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def save(self, path):
+        self._profile.dump_stats(path)
+
+
+class PyinstrumentProfiler:
+    extension = "html"
+
+    def __init__(self):
+        from pyinstrument import Profiler
+
+        self._profiler = Profiler()
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write(self._profiler.output_html())
+
+
+PROFILERS = {"cprofile": CProfiler, "pyinstrument": PyinstrumentProfiler}
+
+
+def get_profiler():
+    try:
+        return PROFILERS[settings.PAPR_PROFILER]()
+    except ImportError:
+        logger.warning("pyinstrument is not installed, profiling with cProfile")
+        return CProfiler()
+
+
+def is_superuser(request):
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except (AuthenticationFailed, InvalidToken):
+        return False
+    return authenticated is not None and authenticated[0].is_superuser
+
+
+def list_profiles(directory=None):
+    """
+    Returns the metadata of the captured profiles, most recent first.
+    """
+    directory = directory or settings.PAPR_PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for name in os.listdir(directory):
+        if name.endswith(".json"):
+            with open(os.path.join(directory, name)) as f:
+                profiles.append(json.load(f))
+    return sorted(profiles, key=lambda p: p["created"], reverse=True)
+
+
+def save_profile(profiler, request, duration, status_code):
+    directory = settings.PAPR_PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+
+    match = request.resolver_match
+    profile = {
+        "id": uuid.uuid4().hex,
+        "created": time.time(),
+        "method": request.method,
+        "path": request.path,
+        "endpoint": match.route if match else request.path,
+        "status": status_code,
+        "duration": duration,
+        "file": None,
+    }
+    profile["file"] = f"{profile['id']}.{profiler.extension}"
+    profiler.save(os.path.join(directory, profile["file"]))
+    with open(os.path.join(directory, f"{profile['id']}.json"), "w") as f:
+        json.dump(profile, f)
+
+    # Drop the oldest profiles beyond the retention limit
+    for old in list_profiles(directory)[settings.PAPR_PROFILE_RETENTION :]:
+        for name in [old["file"], f"{old['id']}.json"]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return profile
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a sample of the requests (PAPR_PROFILE_SAMPLE_RATE), and the requests
+    of superusers which set the PAPR_PROFILE_HEADER header, and saves the profiles
+    to PAPR_PROFILE_DIR. The id of the profile is returned in the same header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = f"HTTP_{settings.PAPR_PROFILE_HEADER.upper().replace('-', '_')}"
+
+    def should_profile(self, request):
+        if self.header in request.META:
+            return is_superuser(request)
+        return random.random() < settings.PAPR_PROFILE_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = get_profiler()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        duration = time.perf_counter() - start
+
+        try:
+            profile = save_profile(profiler, request, duration, response.status_code)
+        except OSError:
+            logger.exception("Could not save the profile")
+        else:
+            response[settings.PAPR_PROFILE_HEADER] = profile["id"]
+        return response
@@ -23,6 +23,145 @@ PAPR_SERVER_CHANNEL_NAME = os.getenv("PAPR_SERVER_CHANNEL_NAME", "@TestReviewSer
 
 IS_TEST = "unittest" in sys.modules or "PAPR_IS_TEST" in os.environ
 
+# Review signatures are verified in a pool of worker processes, in batches
+# gathered across concurrent requests. Set to 0 workers to verify inline.
+PAPR_SIGNATURE_WORKERS = int(os.getenv("PAPR_SIGNATURE_WORKERS", 0 if IS_TEST else 2))
+PAPR_SIGNATURE_BATCH_SIZE = int(os.getenv("PAPR_SIGNATURE_BATCH_SIZE", 64))
+PAPR_SIGNATURE_BATCH_WAIT = float(os.getenv("PAPR_SIGNATURE_BATCH_WAIT", 0.005))  # s
+PAPR_SIGNATURE_TIMEOUT = float(os.getenv("PAPR_SIGNATURE_TIMEOUT", 10))  # s
+
+# Number of pre-generated single-use keypairs used to encrypt issued tokens
+PAPR_KEYPOOL_SIZE = int(os.getenv("PAPR_KEYPOOL_SIZE", 64))
+
+# Concurrent daemon calls made when registering channels in bulk
+PAPR_IMPORT_WORKERS = int(os.getenv("PAPR_IMPORT_WORKERS", 8))
+
+# Seconds between two synchronizations of the local claim index
+PAPR_INDEXER_INTERVAL = float(os.getenv("PAPR_INDEXER_INTERVAL", 30))
+
+# Token-bucket rate limiting, as (bucket capacity, refilled requests per second).
+# Client budgets apply per channel, or per IP address for anonymous requests.
+# Server budgets are shared by all clients and shed load before the workers saturate.
+PAPR_THROTTLE_ENABLED = not IS_TEST
+PAPR_THROTTLE_CACHE = os.getenv("PAPR_THROTTLE_CACHE")  # Cache alias, or per process
+PAPR_THROTTLE_RATES = {
+    "default": (60, 2.0),
+    "daemon": (10, 0.2),  # submit, register
+    "crypto": (10, 0.5),  # get_token
+}
+PAPR_THROTTLE_SERVER_RATES = {
+    "daemon": (50, 10.0),
+    "crypto": (100, 50.0),
+}
+
+# Circuit breaker around the LBRY daemon: calls fail fast with a 503 while the share
+# of failed or slow calls among the recent ones is too high.
+PAPR_DAEMON_TIMEOUT = float(os.getenv("PAPR_DAEMON_TIMEOUT", 10))  # s
+PAPR_DAEMON_SLOW_CALL = float(os.getenv("PAPR_DAEMON_SLOW_CALL", 5))  # s
+PAPR_DAEMON_FAILURE_RATE = float(os.getenv("PAPR_DAEMON_FAILURE_RATE", 0.5))
+PAPR_DAEMON_RESET_TIMEOUT = float(os.getenv("PAPR_DAEMON_RESET_TIMEOUT", 30))  # s
+PAPR_DAEMON_MAX_CONCURRENT = int(os.getenv("PAPR_DAEMON_MAX_CONCURRENT", 16))
+
+# Backend used to reach the LBRY network: "daemon", "cached" (daemon responses to
+# resolve and public key lookups kept for PAPR_LBRY_CACHE_TIMEOUT seconds) or
+# "fake" (in memory, serving the claims and keys recorded in PAPR_LBRY_FIXTURES)
+PAPR_LBRY_BACKEND = os.getenv("PAPR_LBRY_BACKEND", "daemon")
+PAPR_LBRY_FIXTURES = os.getenv("PAPR_LBRY_FIXTURES")
+PAPR_LBRY_CACHE_TIMEOUT = int(os.getenv("PAPR_LBRY_CACHE_TIMEOUT", 300))  # s
+
+# Review requests without an answer or a review after this many days are overdue
+PAPR_REVIEW_OVERDUE_DAYS = int(os.getenv("PAPR_REVIEW_OVERDUE_DAYS", 14))
+PAPR_QUEUE_PAGE_SIZE = 50
+PAPR_QUEUE_MAX_PAGE_SIZE = 500
+
+# Reviewers with this many pending or accepted requests are not asked for more
+PAPR_REVIEWER_MAX_OPEN_REQUESTS = int(os.getenv("PAPR_REVIEWER_MAX_OPEN_REQUESTS", 5))
+# Most reviewers asked at once by an editor
+PAPR_ASSIGN_MAX_REVIEWERS = int(os.getenv("PAPR_ASSIGN_MAX_REVIEWERS", 20))
+
+# Trust scores of the reviewer recommendation graph (PageRank with this damping).
+# Recommendations within rings of up to PAPR_COLLUSION_MAX_RING_SIZE researchers
+# who all recommend each other are ignored when picking reviewers. The graph is
+# updated with new recommendations as they come, and rebuilt from scratch every
+# PAPR_GRAPH_REBUILD_INTERVAL seconds.
+PAPR_GRAPH_DAMPING = float(os.getenv("PAPR_GRAPH_DAMPING", 0.85))
+PAPR_COLLUSION_MAX_RING_SIZE = int(os.getenv("PAPR_COLLUSION_MAX_RING_SIZE", 5))
+PAPR_GRAPH_REBUILD_INTERVAL = (
+    0 if IS_TEST else float(os.getenv("PAPR_GRAPH_REBUILD_INTERVAL", 3600))
+)  # s
+
+# Days given to reviewers to reply to a request (status 1) and to submit their
+# review once accepted (status 3). Past a deadline, reviewers are reminded up to
+# PAPR_REQUEST_REMINDERS times, every PAPR_REMINDER_INTERVAL days, then the
+# request expires and another reviewer is asked.
+PAPR_REQUEST_DEADLINES = {1: 7, 3: 30}
+PAPR_REQUEST_REMINDERS = int(os.getenv("PAPR_REQUEST_REMINDERS", 2))
+PAPR_REMINDER_INTERVAL = float(os.getenv("PAPR_REMINDER_INTERVAL", 3))  # days
+PAPR_SCHEDULER_INTERVAL = float(os.getenv("PAPR_SCHEDULER_INTERVAL", 60))  # s
+PAPR_SCHEDULER_BATCH_SIZE = int(os.getenv("PAPR_SCHEDULER_BATCH_SIZE", 500))
+
+# Diffs are cached under the content hashes of both sides, so they never go stale
+PAPR_DIFF_CACHE_TIMEOUT = None
+
+# Secrets of encrypted manuscripts are stored encrypted with these Fernet keys
+# (comma-separated, the first one encrypts). Required outside tests.
+# Decrypted secrets are kept in the memory of each worker for PAPR_ESCROW_CACHE_TTL
+# seconds, or until they are deposited again.
+PAPR_ESCROW_KEYS = [k for k in os.getenv("PAPR_ESCROW_KEYS", "").split(",") if k]
+PAPR_ESCROW_CACHE_TTL = float(os.getenv("PAPR_ESCROW_CACHE_TTL", 60))  # s
+PAPR_ESCROW_CACHE_SIZE = int(os.getenv("PAPR_ESCROW_CACHE_SIZE", 1024))
+
+# Audit events are buffered and written in batches of this size, or every interval
+PAPR_AUDIT_BATCH_SIZE = 1 if IS_TEST else int(os.getenv("PAPR_AUDIT_BATCH_SIZE", 100))
+PAPR_AUDIT_FLUSH_INTERVAL = float(os.getenv("PAPR_AUDIT_FLUSH_INTERVAL", 1.0))  # s
+
+# Requests are profiled when a superuser sets the PAPR_PROFILE_HEADER header, or at
+# random with the given sampling rate. The most recent PAPR_PROFILE_RETENTION
+# profiles are kept in PAPR_PROFILE_DIR. PAPR_PROFILER is "cprofile" or "pyinstrument".
+PAPR_PROFILE_HEADER = "X-Papr-Profile"
+PAPR_PROFILE_SAMPLE_RATE = float(os.getenv("PAPR_PROFILE_SAMPLE_RATE", 0))
+PAPR_PROFILE_DIR = os.getenv("PAPR_PROFILE_DIR", BASE_DIR / "profiles")
+PAPR_PROFILE_RETENTION = int(os.getenv("PAPR_PROFILE_RETENTION", 100))
+PAPR_PROFILER = os.getenv("PAPR_PROFILER", "cprofile")
+
+# Cache shared by the worker processes, so that they do not each warm their own:
+# "locmem" (per process), "file" (a directory on the local disk), "memcached" or
+# "redis" (a server, which can listen on a local socket, e.g.
+# "unix:/run/memcached.sock" or "unix:///run/redis.sock").
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "papr"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", BASE_DIR / "cache"),
+    "memcached": (
+        "django.core.cache.backends.memcached.PyMemcacheCache",
+        "127.0.0.1:11211",
+    ),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379"),
+}
+PAPR_CACHE_BACKEND = os.getenv("PAPR_CACHE_BACKEND", "locmem" if IS_TEST else "file")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[PAPR_CACHE_BACKEND][0],
+        "LOCATION": os.getenv(
+            "PAPR_CACHE_LOCATION", CACHE_BACKENDS[PAPR_CACHE_BACKEND][1]
+        ),
+    }
+}
+
+# Responses cached in the shared cache are invalidated when the rows they are
+# built from are saved, and expire after this many seconds otherwise
+PAPR_RESPONSE_CACHE_TIMEOUT = int(os.getenv("PAPR_RESPONSE_CACHE_TIMEOUT", 300))
+
+# Responses are rendered by "orjson" (the standard library is used when orjson is
+# not installed) or "json". With PAPR_SERIALIZERS = "values", the status and
+# listing endpoints serialize `.values()` rows instead of going through the DRF
+# serializers ("drf").
+JSON_RENDERERS = {
+    "orjson": "api.renderers.ORJSONRenderer",
+    "json": "rest_framework.renderers.JSONRenderer",
+}
+PAPR_JSON_RENDERER = os.getenv("PAPR_JSON_RENDERER", "orjson")
+PAPR_SERIALIZERS = os.getenv("PAPR_SERIALIZERS", "values")
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -45,6 +184,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "papr_server.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "papr_server.urls"
@@ -74,6 +214,13 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttling.TokenBucketThrottle",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        JSON_RENDERERS[PAPR_JSON_RENDERER],
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 AUTH_USER_MODEL = "api.Researcher"
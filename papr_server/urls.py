@@ -7,8 +7,6 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from lbry.wallet.manager import WalletManager  # Prevent circular import
-
 from papr_server import views
 
 # Routers provide an easy way of automatically determining the URL conf.
@@ -18,6 +16,9 @@ urlpatterns = [
     path("", include(router.urls)),
     path("api/", include("api.urls")),
     # path("api/token/", TokenObtainPairView.as_view()),
+    path("api/profiles", views.profiles),
+    path("api/profiles/<str:profile_id>", views.profile_download),
+    path("api/token/pool", views.keypool_stats),
     path("api/token/<str:channel_name>", views.get_token),
     path("api/token/refresh", TokenRefreshView.as_view()),  # TODO: use
     path("api-auth/", include("rest_framework.urls")),  # TODO: use
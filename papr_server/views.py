@@ -1,15 +1,18 @@
 import asyncio
+import os
 import unittest
 import base64
 
+from django.conf import settings
 from django.shortcuts import render
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 
 from rest_framework import status
 from rest_framework.decorators import (
     api_view,
     authentication_classes,
     permission_classes,
+    throttle_classes,
 )
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -17,13 +20,18 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from api.models import Manuscript, Review, Manuscript, ReviewerRecommendation
 from api.serializers import ManuscriptSerializer
 from api.models import Researcher
+from api.permissions import IsSuperuser
+from api.throttling import CryptoThrottle
 
-from papr.utilities import generate_SECP256k1_keys, SECP_encrypt_text, SECP_decrypt_text
+from papr_server.adapter import encrypt_text
+from papr_server.keypool import get_keypool
+from papr_server.profiling import list_profiles
 
 
 @api_view(["GET"])
 @authentication_classes([])
 @permission_classes([])
+@throttle_classes([CryptoThrottle])
 def get_token(request, channel_name):
     """
     Generates a token for the requested channel and encrypts it using a ECDH shared secret derived from the (alledged) recipient's public key (retrieved from the LBRY network).
@@ -41,10 +49,10 @@ def get_token(request, channel_name):
 
     token = RefreshToken.for_user(target)
 
-    priv_key, pub_key = generate_SECP256k1_keys(None)  # Random key
+    priv_key, pub_key = get_keypool().get()  # Random single-use key
 
-    refresh = SECP_encrypt_text(priv_key, target.public_key, str(token))
-    access = SECP_encrypt_text(priv_key, target.public_key, str(token.access_token))
+    refresh = encrypt_text(priv_key, target.public_key, str(token))
+    access = encrypt_text(priv_key, target.public_key, str(token.access_token))
 
     return JsonResponse(
         {
@@ -53,3 +61,38 @@ def get_token(request, channel_name):
             "pub_key": pub_key,
         }
     )
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def keypool_stats(request):
+    """
+    Reports the depth, refill rate and hit/miss counts of the ephemeral keypair pool.
+    """
+    return JsonResponse(get_keypool().stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def profiles(request):
+    """
+    Lists the captured request profiles, slowest first.
+    Can be filtered by endpoint (URL route) with `?endpoint=`.
+    """
+    captured = list_profiles()
+    if "endpoint" in request.query_params:
+        captured = [
+            p for p in captured if p["endpoint"] == request.query_params["endpoint"]
+        ]
+    captured.sort(key=lambda p: p["duration"], reverse=True)
+    return JsonResponse({"profiles": captured})
+
+
+@api_view(["GET"])
+@permission_classes([IsSuperuser])
+def profile_download(request, profile_id):
+    for profile in list_profiles():
+        if profile["id"] == profile_id:
+            path = os.path.join(settings.PAPR_PROFILE_DIR, profile["file"])
+            return FileResponse(open(path, "rb"), as_attachment=True)
+    return Response(status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,101 @@
+"""
+Compares the DRF serializers and renderer with the `.values()` serializers and
+the orjson renderer on 10k-row payloads. Not part of the test suite, run with:
+
+    python manage.py test tests.bench_serializers
+"""
+
+import time
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from api.models import ArticleSummary, Manuscript, Researcher, SubmittedArticle
+from api.renderers import ORJSONRenderer
+from api.serializers import (
+    ManuscriptSerializer,
+    ManuscriptValuesSerializer,
+    SubmittedArticleSerializer,
+    SubmittedArticleValuesSerializer,
+)
+
+ROWS = 10000
+REPEAT = 3
+
+
+def best_of(function):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+class SerializerBenchmark(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        authors = Researcher.objects.bulk_create(
+            Researcher(channel_name=f"@Author{i}") for i in range(ROWS // 10)
+        )
+        articles = SubmittedArticle.objects.bulk_create(
+            SubmittedArticle(
+                base_claim_name=f"paper-{i}", corresponding_author=authors[i % 1000]
+            )
+            for i in range(ROWS)
+        )
+        ArticleSummary.objects.bulk_create(
+            ArticleSummary(article=article, manuscripts=1, reviews=2, rating_total=7)
+            for article in articles
+        )
+        Manuscript.objects.bulk_create(
+            Manuscript(
+                claim_name=f"paper-{i}_preprint",
+                title=f"Paper {i}",
+                authors="Robert Tremblay, Jérôme Gagnon",
+                abstract="Abstract " * 50,
+                article=article,
+            )
+            for i, article in enumerate(articles)
+        )
+
+    def compare(self, name, drf, values):
+        drf_time, drf_data = best_of(drf)
+        values_time, values_data = best_of(values)
+        self.assertEqual(values_data, drf_data)
+
+        json_time, json_bytes = best_of(lambda: JSONRenderer().render(drf_data))
+        orjson_time, orjson_bytes = best_of(
+            lambda: ORJSONRenderer().render(values_data)
+        )
+        self.assertEqual(orjson_bytes, json_bytes)
+
+        print(
+            f"\n{name} ({ROWS} rows, best of {REPEAT})\n"
+            f"  serializer  drf {drf_time * 1000:8.1f} ms"
+            f"  values {values_time * 1000:8.1f} ms"
+            f"  x{drf_time / values_time:.1f}\n"
+            f"  renderer   json {json_time * 1000:8.1f} ms"
+            f"  orjson {orjson_time * 1000:8.1f} ms"
+            f"  x{json_time / orjson_time:.1f}"
+        )
+
+    def test_articles(self):
+        articles = SubmittedArticle.objects.order_by("pk")
+        self.compare(
+            "SubmittedArticle",
+            lambda: SubmittedArticleSerializer(
+                articles.select_related("corresponding_author", "summary"), many=True
+            ).data,
+            lambda: SubmittedArticleValuesSerializer(articles).data,
+        )
+
+    def test_manuscripts(self):
+        manuscripts = Manuscript.objects.order_by("pk")
+        self.compare(
+            "Manuscript",
+            lambda: ManuscriptSerializer(
+                manuscripts.select_related("article"), many=True
+            ).data,
+            lambda: ManuscriptValuesSerializer(manuscripts).data,
+        )
@@ -0,0 +1,104 @@
+import json
+import os
+import re
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+BUDGETS = os.path.join(os.path.dirname(__file__), "query_budgets.json")
+
+# Set to rewrite the budgets with the queries measured by the test run
+RECORD = "PAPR_RECORD_QUERY_BUDGETS" in os.environ
+
+_LITERALS = [
+    (re.compile(r'"s\d+_x\d+"'), '"s?"'),  # Savepoint names
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\((?:\?, )+\?\)"), "(?...)"),
+]
+
+
+def query_shape(sql):
+    """
+    Returns an SQL statement with its literal values replaced by placeholders, so
+    that the same query made with different values has the same shape.
+    """
+    for pattern, placeholder in _LITERALS:
+        sql = pattern.sub(placeholder, sql)
+    return sql
+
+
+def load_budgets():
+    with open(BUDGETS) as f:
+        return json.load(f)
+
+
+def save_budgets(budgets):
+    with open(BUDGETS, "w") as f:
+        json.dump(dict(sorted(budgets.items())), f, indent=4)
+        f.write("\n")
+
+
+class QueryCountMixin:
+    """
+    Checks that the number of SQL statements made by a request does not grow with
+    the amount of data, and that their shapes match the budget recorded in
+    query_budgets.json, so that a query swapped for another is caught too.
+    """
+
+    sizes = [1, 10, 50]
+    recorded = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if RECORD and cls.recorded:
+            save_budgets({**load_budgets(), **cls.recorded})
+        super().tearDownClass()
+
+    def seed(self, size):
+        """
+        Adds `size` rows of unrelated data to the tables read by the endpoints.
+        """
+        raise NotImplementedError
+
+    def capture(self, size, request):
+        """
+        Seeds `size` rows and returns the statements made by `request`, then
+        rolls everything back. The cache is cleared first, so every size is measured
+        with a cold cache.
+        """
+        cache.clear()
+        with transaction.atomic():
+            self.seed(size)
+            with CaptureQueriesContext(connection) as context:
+                response = request()
+            self.assertLess(response.status_code, 300, getattr(response, "data", ""))
+            transaction.set_rollback(True)
+        return [query_shape(query["sql"]) for query in context.captured_queries]
+
+    def assertQueriesBounded(self, name, request):
+        shapes = {size: self.capture(size, request) for size in self.sizes}
+
+        smallest, *others = self.sizes
+        for size in others:
+            self.assertEqual(
+                len(shapes[size]),
+                len(shapes[smallest]),
+                f"{name} makes {len(shapes[size])} queries with {size} rows but "
+                f"{len(shapes[smallest])} with {smallest}:\n" + "\n".join(shapes[size]),
+            )
+
+        recorded = sorted(shapes[smallest])
+        if RECORD:
+            self.recorded[name] = recorded
+            return
+
+        budget = load_budgets().get(name)
+        self.assertIsNotNone(budget, f"No query budget recorded for {name}")
+        self.assertEqual(
+            recorded,
+            budget,
+            f"{name} makes {len(recorded)} queries, which differ from the "
+            f"{len(budget)} recorded in its budget:\n" + "\n".join(recorded),
+        )
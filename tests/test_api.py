@@ -1,5 +1,19 @@
+import gzip
+import json
 import os
 import requests
+import tempfile
+from array import array
+from collections import Counter
+from concurrent.futures import Future
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
 
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -8,8 +22,15 @@ from lbry.wallet.manager import WalletManager  # Prevent circular import
 
 from papr.utilities import generate_SECP256k1_keys, SECP_decrypt_text
 
-from api import views
+from api import escrow, views
 from api.models import *
+from api.signatures import SignatureVerifier
+
+
+class AuthMixin:
+    def as_researcher(self, researcher):
+        token = RefreshToken.for_user(researcher)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
 
 
 class AuthenticationTests(APITestCase):
@@ -180,4 +201,1483 @@ class AuthenticationTests(APITestCase):
     # refresh token
 
 
+def fake_get_public_key(method, channel_name):
+    if channel_name == "@Ghost":
+        return {"result": {"info": "Channel not found"}}
+    return {"result": {"public_key": f"key-{channel_name}"}}
+
+
+@mock.patch("api.registration.call", fake_get_public_key)
+class BulkRegistrationTests(APITestCase):
+    def setUp(self):
+        Researcher.objects.create(channel_name="@RTremblay")
+        self.admin = Researcher.objects.create(channel_name="@Admin", is_superuser=True)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+            f.write("# Committee\n@STremblay\n\n@RTremblay\n@Ghost\nnot-a-channel\n")
+            f.flush()
+
+            out = StringIO()
+            call_command("import_researchers", f.name, stdout=out)
+
+        self.assertIn("@STremblay\tcreated", out.getvalue())
+        self.assertIn("@RTremblay\texists", out.getvalue())
+        self.assertIn("@Ghost\tnot_found", out.getvalue())
+        self.assertIn("not-a-channel\tinvalid", out.getvalue())
+        self.assertEqual(
+            Researcher.objects.get(channel_name="@STremblay").public_key,
+            "key-@STremblay",
+        )
+        self.assertFalse(
+            Researcher.objects.get(channel_name="@STremblay").has_usable_password()
+        )
+
+    def test_batch_endpoint(self):
+        token = RefreshToken.for_user(self.admin)
+        response = self.client.post(
+            "/api/channel/register_batch",
+            data={"channel_names": ["@STremblay", "@RTremblay", "@STremblay"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["report"],
+            [
+                {"channel_name": "@STremblay", "status": "created"},
+                {"channel_name": "@RTremblay", "status": "exists"},
+            ],
+        )
+        self.assertEqual(Researcher.objects.count(), 3)
+
+    def test_batch_endpoint_invalid_entries(self):
+        token = RefreshToken.for_user(self.admin)
+        response = self.client.post(
+            "/api/channel/register_batch",
+            data={"channel_names": [1, {"a": 1}, "@STremblay"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [entry["status"] for entry in response.json()["report"]],
+            ["invalid", "invalid", "created"],
+        )
+
+    def test_batch_endpoint_binary_file(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        token = RefreshToken.for_user(self.admin)
+        response = self.client.post(
+            "/api/channel/register_batch",
+            data={"file": SimpleUploadedFile("channels.txt", b"@STr\xe9mblay\n")},
+            format="multipart",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("UTF-8", response.json()["error"])
+        self.assertFalse(Researcher.objects.filter(channel_name__startswith="@STr"))
+
+    def test_concurrent_registration(self):
+        from api.registration import import_researchers
+
+        def registered_meanwhile(channel_names, **kwargs):
+            # Another registration inserts one of the channels first
+            Researcher.objects.create(channel_name="@STremblay")
+            return {name: f"key-{name}" for name in channel_names}
+
+        with mock.patch(
+            "api.registration.fetch_public_keys", side_effect=registered_meanwhile
+        ):
+            report = import_researchers(["@STremblay", "@JGagnon"])
+        self.assertEqual(
+            report,
+            [
+                {"channel_name": "@STremblay", "status": "exists"},
+                {"channel_name": "@JGagnon", "status": "created"},
+            ],
+        )
+        self.assertEqual(
+            Researcher.objects.get(channel_name="@JGagnon").public_key,
+            "key-@JGagnon",
+        )
+
+    def test_batch_endpoint_requires_superuser(self):
+        token = RefreshToken.for_user(Researcher.objects.get(channel_name="@RTremblay"))
+        response = self.client.post(
+            "/api/channel/register_batch",
+            data={"channel_names": ["@STremblay"]},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Researcher.objects.count(), 2)
+
+
+def fake_claim_search(method, channel, height, page, **kwargs):
+    items = []
+    if channel == "@RTremblay" and height == ">=0":
+        items = [
+            {
+                "name": "my-paper_preprint",
+                "claim_id": "a" * 40,
+                "txid": "b" * 64,
+                "height": 120,
+                "is_channel_signature_valid": True,
+                "signing_channel": {"name": "@RTremblay"},
+                "value": {"title": "My paper", "author": "Robert Tremblay"},
+            }
+        ]
+    return {"result": {"items": items, "page": page, "total_pages": 1}}
+
+
+@mock.patch("api.indexer.call", fake_claim_search)
+class ClaimIndexerTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.researcher = Researcher.objects.create(
+            channel_name="@RTremblay", public_key="key"
+        )
+        self.as_researcher(self.researcher)
+
+    def test_sync(self):
+        from api.indexer import ClaimIndexer
+
+        self.assertEqual(ClaimIndexer().sync(), 1)
+        claim = IndexedClaim.objects.get(claim_name="my-paper_preprint")
+        self.assertEqual(claim.signing_channel, "@RTremblay")
+        self.assertEqual(claim.title, "My paper")
+        self.assertEqual(
+            IndexerCheckpoint.objects.get(channel_name="@RTremblay").height, 120
+        )
+
+        # Nothing new since the checkpoint
+        self.assertEqual(ClaimIndexer().sync(), 0)
+        self.assertEqual(IndexedClaim.objects.count(), 1)
+
+    def test_submit_from_index(self):
+        from api.indexer import ClaimIndexer
+
+        ClaimIndexer().sync()
+        data = {
+            "title": "My paper",
+            "article": "my-paper",
+            "authors": "Robert Tremblay",
+            "claim_name": "my-paper_preprint",
+            "revision": 0,
+            "corresponding_author": "@RTremblay",
+        }
+        with mock.patch("api.views.call") as daemon_call:
+            response = self.client.post("/api/article/submit", data=data, format="json")
+            daemon_call.assert_not_called()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Manuscript.objects.count(), 1)
+
+
+@override_settings(
+    PAPR_THROTTLE_ENABLED=True,
+    PAPR_THROTTLE_RATES={
+        "default": (3, 0.001),
+        "daemon": (2, 0.001),
+        "crypto": (2, 0.001),
+    },
+    PAPR_THROTTLE_SERVER_RATES={"crypto": (3, 0.001)},
+)
+class ThrottlingTests(AuthMixin, APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key, cls.public_key = generate_SECP256k1_keys("test")
+        super().setUpClass()
+
+    def setUp(self):
+        from api.throttling import get_store
+
+        get_store().clear()
+        for name in ["@RTremblay", "@SGoder"]:
+            Researcher.objects.create(channel_name=name, public_key=self.public_key)
+
+    def test_token_budget(self):
+        for i in range(2):
+            response = self.client.get("/api/token/@RTremblay")
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/api/token/@RTremblay")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_server_budget(self):
+        for i in range(3):
+            response = self.client.get(
+                "/api/token/@RTremblay", REMOTE_ADDR=f"10.0.0.{i}"
+            )
+            self.assertEqual(response.status_code, 200)
+
+        # Another client is refused once the server-wide budget is spent
+        response = self.client.get("/api/token/@RTremblay", REMOTE_ADDR="10.0.0.9")
+        self.assertEqual(response.status_code, 429)
+
+    def test_budget_per_channel(self):
+        for name in ["@RTremblay", "@SGoder"]:
+            self.as_researcher(Researcher.objects.get(channel_name=name))
+            for i in range(3):
+                response = self.client.get("/api/article/status/nothing")
+                self.assertNotEqual(response.status_code, 429)
+
+            response = self.client.get("/api/article/status/nothing")
+            self.assertEqual(response.status_code, 429)
+
+
+class ArticleSummaryTests(APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewers = [
+            Researcher.objects.create(channel_name=f"@Reviewer{i}") for i in range(3)
+        ]
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        self.manuscript = Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=self.article
+        )
+
+    def summary(self):
+        return ArticleSummary.objects.get(article=self.article)
+
+    def test_counters(self):
+        requests = [
+            ReviewRequest.objects.create(reviewer=r, article=self.article, status=1)
+            for r in self.reviewers
+        ]
+        ReviewerRecommendation.objects.create(
+            reviewer=self.reviewers[0], voucher=self.author, article=self.article
+        )
+
+        requests[0].status = 2
+        requests[0].save()
+        req = ReviewRequest.objects.get(pk=requests[1].pk)
+        req.status = 3
+        req.save()
+        req.status = 4
+        req.save()
+        Review.objects.create(
+            manuscript=self.manuscript,
+            reviewer=self.reviewers[1],
+            rating=4,
+            request=req,
+        )
+
+        summary = self.summary()
+        self.assertEqual(summary.manuscripts, 1)
+        self.assertEqual(summary.recommendations, 1)
+        self.assertEqual(summary.requests_pending, 1)
+        self.assertEqual(summary.requests_declined, 1)
+        self.assertEqual(summary.requests_accepted, 0)
+        self.assertEqual(summary.requests_fulfilled, 1)
+        self.assertEqual(summary.mean_rating, 4)
+
+    def test_rebuild(self):
+        from api.summaries import rebuild
+
+        ReviewRequest.objects.create(
+            reviewer=self.reviewers[0], article=self.article, status=1
+        )
+        ArticleSummary.objects.all().delete()
+
+        self.assertEqual(rebuild(), 1)
+        self.assertEqual(self.summary().manuscripts, 1)
+        self.assertEqual(self.summary().requests_pending, 1)
+
+    def test_status_endpoint(self):
+        token = RefreshToken.for_user(self.author)
+        response = self.client.get(
+            "/api/article/status/my-paper",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["summary"]["manuscripts"], 1)
+        self.assertIsNone(response.json()["summary"]["mean_rating"])
+
+
+class EditorQueueTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.editor = Researcher.objects.create(
+            channel_name="@Editor", is_superuser=True
+        )
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewers = [
+            Researcher.objects.create(channel_name=f"@Reviewer{i}") for i in range(3)
+        ]
+        self.articles = []
+        for i in range(5):
+            article = SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}",
+                corresponding_author=self.author,
+                status=1,
+            )
+            manuscript = Manuscript.objects.create(
+                claim_name=f"paper-{i}_preprint", article=article
+            )
+            for j, reviewer in enumerate(self.reviewers):
+                req = ReviewRequest.objects.create(
+                    reviewer=reviewer, article=article, status=j + 1
+                )
+                if req.status == 3:
+                    Review.objects.create(
+                        manuscript=manuscript, reviewer=reviewer, rating=i, request=req
+                    )
+            self.articles.append(article)
+        SubmittedArticle.objects.filter(base_claim_name="paper-4").update(status=100)
+
+        # The first request of the first article is old
+        ReviewRequest.objects.filter(article=self.articles[0], status=1).update(
+            submitted=timezone.now() - timedelta(days=30)
+        )
+
+    def test_single_query(self):
+        from api.editor import review_queue
+
+        with self.assertNumQueries(1):
+            articles = review_queue()
+
+        self.assertEqual(len(articles), 4)
+        first = articles[0]
+        self.assertEqual(first["base_claim_name"], "paper-0")
+        self.assertEqual(first["requests_pending"], 1)
+        self.assertEqual(first["requests_declined"], 1)
+        self.assertEqual(first["requests_accepted"], 1)
+        self.assertEqual(first["requests_overdue"], 1)
+        self.assertEqual(articles[1]["requests_overdue"], 0)
+        self.assertEqual(articles[2]["mean_rating"], 2)
+
+    def test_endpoint_pagination(self):
+        self.as_researcher(self.editor)
+        response = self.client.get("/api/editor/queue", {"status": 1, "limit": 3})
+        self.assertEqual(response.status_code, 200)
+        names = [a["base_claim_name"] for a in response.json()["results"]]
+        self.assertEqual(names, ["paper-0", "paper-1", "paper-2"])
+
+        response = self.client.get(
+            "/api/editor/queue",
+            {"status": 1, "limit": 3, "after": response.json()["next"]},
+        )
+        names = [a["base_claim_name"] for a in response.json()["results"]]
+        self.assertEqual(names, ["paper-3"])
+        self.assertIsNone(response.json()["next"])
+
+        # An exactly full last page has no next page either
+        response = self.client.get("/api/editor/queue", {"status": 1, "limit": 4})
+        self.assertEqual(len(response.json()["results"]), 4)
+        self.assertIsNone(response.json()["next"])
+
+    def test_endpoint_requires_superuser(self):
+        self.as_researcher(self.author)
+        response = self.client.get("/api/editor/queue")
+        self.assertEqual(response.status_code, 403)
+
+
+class RevisionDiffTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@STremblay")
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        for i, abstract in enumerate(["We did stuff", "We did great stuff"]):
+            Manuscript.objects.create(
+                claim_name=f"my-paper_v{i}",
+                title="My paper",
+                authors="Robert Tremblay",
+                abstract=abstract,
+                article=self.article,
+            )
+
+    def get_diff(self, researcher):
+        token = RefreshToken.for_user(researcher)
+        return self.client.get(
+            "/api/article/diff/my-paper",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+
+    def test_diff(self):
+        response = self.get_diff(self.author)
+        self.assertEqual(response.status_code, 200)
+
+        diffs = response.json()["diffs"]
+        self.assertEqual(len(diffs), 1)
+        self.assertEqual(diffs[0]["from"], "my-paper_v0")
+        self.assertEqual(list(diffs[0]["changes"]), ["abstract"])
+        self.assertIn("+We did great stuff", diffs[0]["changes"]["abstract"])
+
+    def test_diff_cached(self):
+        from api.diffs import revision_diffs
+
+        with mock.patch("api.diffs.diff_manuscripts", return_value={}) as diff:
+            revision_diffs(self.article)
+            revision_diffs(self.article)
+        diff.assert_called_once()
+
+        Manuscript.objects.create(
+            claim_name="my-paper_v2", title="My new paper", article=self.article
+        )
+        with mock.patch("api.diffs.diff_manuscripts", return_value={}) as diff:
+            self.assertEqual(len(revision_diffs(self.article)), 2)
+        diff.assert_called_once()
+
+    def test_diff_access(self):
+        self.assertEqual(self.get_diff(self.reviewer).status_code, 403)
+
+        ReviewRequest.objects.create(
+            reviewer=self.reviewer, article=self.article, status=3
+        )
+        self.assertEqual(self.get_diff(self.reviewer).status_code, 200)
+
+
+class ReviewerWorkloadTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewers = [
+            Researcher.objects.create(channel_name=f"@Reviewer{i}", public_key="key")
+            for i in range(4)
+        ]
+        self.articles = [
+            SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}", corresponding_author=self.author
+            )
+            for i in range(3)
+        ]
+
+    def workload(self, reviewer):
+        return ReviewerWorkload.objects.get(reviewer=reviewer)
+
+    def test_counters(self):
+        req = ReviewRequest.objects.create(
+            reviewer=self.reviewers[0], article=self.articles[0], status=1
+        )
+        ReviewRequest.objects.create(
+            reviewer=self.reviewers[0], article=self.articles[1], status=1
+        )
+        self.assertEqual(self.workload(self.reviewers[0]).open_requests, 2)
+
+        req.status = 3
+        req.save()
+        self.assertEqual(self.workload(self.reviewers[0]).requests_accepted, 1)
+
+        req.status = 4
+        req.save()
+        manuscript = Manuscript.objects.create(
+            claim_name="paper-0_preprint", title="Paper", article=self.articles[0]
+        )
+        Review.objects.create(
+            manuscript=manuscript, reviewer=self.reviewers[0], rating=4, request=req
+        )
+        workload = self.workload(self.reviewers[0])
+        self.assertEqual(workload.open_requests, 1)
+        self.assertEqual(workload.requests_fulfilled, 1)
+        self.assertGreater(workload.mean_turnaround, 0)
+
+        # The counters and a rebuild measure the turnaround the same way
+        from api.workload import rebuild
+
+        rebuild()
+        self.assertAlmostEqual(
+            self.workload(self.reviewers[0]).turnaround_total,
+            workload.turnaround_total,
+        )
+
+    def test_select_least_busy(self):
+        from api.assignment import select_reviewers
+
+        for article in self.articles[1:]:
+            ReviewRequest.objects.create(
+                reviewer=self.reviewers[0], article=article, status=1
+            )
+        ReviewRequest.objects.create(
+            reviewer=self.reviewers[1], article=self.articles[1], status=3
+        )
+        ReviewerRecommendation.objects.create(
+            reviewer=self.reviewers[3], voucher=self.author, article=self.articles[0]
+        )
+
+        selected = select_reviewers(self.articles[0], 3)
+        self.assertEqual(
+            selected, [self.reviewers[3], self.reviewers[2], self.reviewers[1]]
+        )
+
+    @override_settings(PAPR_REVIEWER_MAX_OPEN_REQUESTS=1)
+    def test_assign_endpoint(self):
+        ReviewRequest.objects.create(
+            reviewer=self.reviewers[0], article=self.articles[1], status=1
+        )
+        editor = Researcher.objects.create(channel_name="@Editor", is_superuser=True)
+        self.as_researcher(editor)
+
+        response = self.client.post(
+            "/api/editor/assign",
+            data={"base_claim_name": "paper-0", "count": 5},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["reviewers"], ["@Reviewer1", "@Reviewer2", "@Reviewer3"]
+        )
+        self.assertEqual(
+            ReviewRequest.objects.filter(article=self.articles[0], status=1).count(), 3
+        )
+
+    @override_settings(PAPR_ASSIGN_MAX_REVIEWERS=2)
+    def test_assign_endpoint_count(self):
+        editor = Researcher.objects.create(channel_name="@Editor", is_superuser=True)
+        self.as_researcher(editor)
+
+        for count in [-1, 0]:
+            response = self.client.post(
+                "/api/editor/assign",
+                data={"base_claim_name": "paper-0", "count": count},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            "/api/editor/assign",
+            data={"base_claim_name": "paper-0", "count": 100},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()["reviewers"]), 2)
+
+
+class AuditLogTests(APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@STremblay")
+        SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+
+    def test_buffered_writer(self):
+        from api.audit import EventWriter
+
+        writer = EventWriter(batch_size=10, interval=3600)
+        writer.record("manuscript_submitted", actor="@RTremblay", article="my-paper")
+        writer.record("reviewer_recommended", actor="@RTremblay", reviewer="@Steve")
+        self.assertEqual(AuditEvent.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            writer.flush()
+        self.assertEqual(AuditEvent.objects.count(), 2)
+        self.assertEqual(
+            AuditEvent.objects.get(event="reviewer_recommended").data,
+            {"reviewer": "@Steve"},
+        )
+
+    def test_recommend_and_export(self):
+        token = RefreshToken.for_user(self.author)
+        response = self.client.post(
+            "/api/review/recommend",
+            data={"article": "my-paper", "reviewer": "@STremblay"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        admin = Researcher.objects.create(channel_name="@Admin", is_superuser=True)
+        token = RefreshToken.for_user(admin)
+        response = self.client.get(
+            "/api/audit/export", HTTP_AUTHORIZATION=f"Bearer {token.access_token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        event = json.loads(lines[0])
+        self.assertEqual(event["event"], "reviewer_recommended")
+        self.assertEqual(event["actor"], "@RTremblay")
+        self.assertEqual(event["data"], {"reviewer": "@STremblay"})
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.admin = Researcher.objects.create(channel_name="@Admin", is_superuser=True)
+        for i in range(5):
+            article = SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}", corresponding_author=self.author
+            )
+            Manuscript.objects.create(
+                claim_name=f"paper-{i}_preprint",
+                title=f"Paper {i}",
+                authors="Robert Tremblay",
+                article=article,
+            )
+
+    def get(self, url, **params):
+        token = RefreshToken.for_user(self.admin)
+        response = self.client.get(
+            url, params, HTTP_AUTHORIZATION=f"Bearer {token.access_token}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_ndjson(self):
+        from api.export import iter_rows
+
+        with self.assertNumQueries(1):
+            rows = list(iter_rows("manuscripts", chunk_size=2))
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["article"], "paper-0")
+
+        lines = self.get("/api/export/manuscripts").decode().splitlines()
+        self.assertEqual(json.loads(lines[4])["claim_name"], "paper-4_preprint")
+
+    def test_csv_gzip(self):
+        data = self.get("/api/export/articles", type="csv", gzip="1")
+        lines = gzip.decompress(data).decode().splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith("base_claim_name,corresponding_author"))
+        self.assertTrue(lines[1].startswith("paper-0,@RTremblay"))
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as output:
+            call_command("export_data", output, "--gzip", stdout=StringIO())
+            self.assertIn("reviews.ndjson.gz", os.listdir(output))
+
+            with gzip.open(os.path.join(output, "articles.ndjson.gz"), "rt") as f:
+                self.assertEqual(len(f.readlines()), 5)
+
+
+class RestoreTests(APITestCase):
+    def setUp(self):
+        from api.transitions import transition
+
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@JGagnon")
+        for i in range(5):
+            article = SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}", corresponding_author=self.author
+            )
+            Manuscript.objects.create(
+                claim_name=f"paper-{i}_preprint", title=f"Paper {i}", article=article
+            )
+            ReviewRequest.objects.create(
+                article=article, reviewer=self.reviewer, status=3
+            )
+        ReviewerRecommendation.objects.create(
+            article=article, reviewer=self.reviewer, voucher=self.author
+        )
+        req = ReviewRequest.objects.get(article=article)
+        req.submitted -= timedelta(days=2)
+        req.save()
+        transition(req, 4)
+        self.review = Review.objects.create(
+            manuscript=article.version.get(),
+            reviewer=self.reviewer,
+            rating=4,
+            request=req,
+        )
+        self.turnaround = self.reviewer.workload.turnaround_total
+        escrow.deposit(
+            article,
+            {"encryption_passphrase": "correct horse"},
+            {"paper-4_preprint": {"review_password": "battery staple"}},
+        )
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        call_command("export_data", self.directory.name, "--gzip", stdout=StringIO())
+        self.joined = self.author.joined
+
+        Researcher.objects.all().delete()
+        SubmittedArticle.objects.all().delete()
+        Manuscript.objects.all().delete()
+        ReviewRequest.objects.all().delete()
+        Review.objects.all().delete()
+        ReviewerRecommendation.objects.all().delete()
+
+    def restore(self, *args):
+        call_command("import_data", self.directory.name, *args, stdout=StringIO())
+
+    def test_round_trip(self):
+        self.restore()
+
+        author = Researcher.objects.get(channel_name="@RTremblay")
+        # Exported timestamps are truncated to the millisecond
+        self.assertAlmostEqual(
+            author.joined, self.joined, delta=timedelta(milliseconds=1)
+        )
+        self.assertFalse(author.has_usable_password())
+
+        manuscript = Manuscript.objects.get(claim_name="paper-3_preprint")
+        self.assertEqual(manuscript.article.base_claim_name, "paper-3")
+        self.assertEqual(manuscript.article.corresponding_author, author)
+        self.assertEqual(
+            ReviewRequest.objects.filter(reviewer__channel_name="@JGagnon").count(), 5
+        )
+
+        review = Review.objects.get()
+        self.assertEqual(review.request.article.base_claim_name, "paper-4")
+        self.assertAlmostEqual(
+            review.request.submitted,
+            self.review.request.submitted,
+            delta=timedelta(milliseconds=1),
+        )
+
+        # The escrowed secrets are restored encrypted
+        article = SubmittedArticle.objects.get(base_claim_name="paper-4")
+        stored = SubmittedArticle.objects.values("encryption_passphrase").get(
+            pk=article.pk
+        )
+        self.assertNotIn("correct horse", stored["encryption_passphrase"])
+        with mock.patch("api.escrow.cache", escrow.KeyCache()):
+            keys = escrow.article_keys(article)
+        self.assertEqual(keys["encryption_passphrase"], "correct horse")
+        self.assertEqual(
+            keys["manuscripts"]["paper-4_preprint"]["review_password"],
+            "battery staple",
+        )
+
+        # The counters are rebuilt after the restore
+        article = SubmittedArticle.objects.get(base_claim_name="paper-0")
+        self.assertEqual(article.summary.requests_accepted, 1)
+        workload = Researcher.objects.get(channel_name="@JGagnon").workload
+        self.assertEqual(workload.requests_accepted, 4)
+        self.assertEqual(workload.requests_fulfilled, 1)
+        self.assertAlmostEqual(workload.turnaround_total, self.turnaround, delta=0.01)
+
+    def test_resume(self):
+        from api import restore
+
+        build = restore.build
+        calls = []
+
+        def fail_third_batch(model, row):
+            if model is ReviewRequest:
+                calls.append(row)
+                if len(calls) == 5:
+                    raise RuntimeError("Interrupted")
+            return build(model, row)
+
+        with mock.patch("api.restore.build", fail_third_batch):
+            with self.assertRaises(RuntimeError):
+                self.restore("--batch-size", "2")
+        self.assertEqual(ReviewRequest.objects.count(), 4)
+
+        self.restore("--batch-size", "2")
+        self.assertEqual(ReviewRequest.objects.count(), 5)
+        self.assertEqual(Manuscript.objects.count(), 5)
+
+        # Restoring again from the start does not duplicate any row
+        self.restore("--reset")
+        self.assertEqual(SubmittedArticle.objects.count(), 5)
+        self.assertEqual(ReviewRequest.objects.count(), 5)
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(ReviewerRecommendation.objects.count(), 1)
+
+
+class TransitionTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@JGagnon")
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        self.request = ReviewRequest.objects.create(
+            article=self.article, reviewer=self.reviewer, status=1
+        )
+
+    def test_concurrent_transitions(self):
+        from api.transitions import transition
+
+        first = ReviewRequest.objects.get(pk=self.request.pk)
+        second = ReviewRequest.objects.get(pk=self.request.pk)
+
+        with self.assertNumQueries(3):  # The transition and both counters
+            self.assertTrue(transition(first, 3))
+        self.assertFalse(transition(second, 2))
+
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.status, 3)
+        self.assertEqual(self.request.status_version, 1)
+
+        summary = ArticleSummary.objects.get(article=self.article)
+        self.assertEqual(summary.requests_pending, 0)
+        self.assertEqual(summary.requests_accepted, 1)
+        self.assertEqual(summary.requests_declined, 0)
+        self.assertEqual(self.reviewer.workload.requests_accepted, 1)
+
+    def test_endpoint_conflict(self):
+        from api import transitions
+
+        transition = transitions.transition
+
+        def declined_meanwhile(instance, new_status, **kwargs):
+            # Another request declines the review request first
+            transition(ReviewRequest.objects.get(pk=instance.pk), 2)
+            return transition(instance, new_status, **kwargs)
+
+        self.as_researcher(self.reviewer)
+        with mock.patch("api.transitions.transition", declined_meanwhile):
+            response = self.client.post(
+                "/api/review/accept", {"base_claim_name": "my-paper"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 409)
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.status, 2)
+
+
+class SchedulerTests(APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewers = [
+            Researcher.objects.create(channel_name=f"@Reviewer{i}", public_key="key")
+            for i in range(3)
+        ]
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        self.request = ReviewRequest.objects.create(
+            article=self.article, reviewer=self.reviewers[0], status=1
+        )
+
+    def scheduler(self):
+        from api.scheduler import DeadlineScheduler
+
+        return DeadlineScheduler(batch_size=10)
+
+    def test_deadlines(self):
+        from api.transitions import transition
+
+        self.assertAlmostEqual(
+            self.request.deadline,
+            timezone.now() + timedelta(days=7),
+            delta=timedelta(minutes=1),
+        )
+        transition(self.request, 3)
+        self.request.refresh_from_db()
+        self.assertAlmostEqual(
+            self.request.deadline,
+            timezone.now() + timedelta(days=30),
+            delta=timedelta(minutes=1),
+        )
+        transition(self.request, 4)
+        self.request.refresh_from_db()
+        self.assertIsNone(self.request.deadline)
+
+    @override_settings(PAPR_REQUEST_REMINDERS=1, PAPR_REMINDER_INTERVAL=2)
+    def test_remind_then_expire(self):
+        scheduler = self.scheduler()
+        now = self.request.deadline + timedelta(seconds=1)
+
+        self.assertEqual(scheduler.tick(now - timedelta(seconds=2)), 0)
+        self.assertEqual(scheduler.tick(now), 1)
+        self.assertEqual(scheduler.tick(now), 0)
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.reminders, 1)
+        self.assertEqual(self.request.deadline, now + timedelta(days=2))
+        self.assertTrue(AuditEvent.objects.filter(event="review_reminder").exists())
+
+        self.assertEqual(scheduler.tick(now + timedelta(days=2)), 1)
+        self.request.refresh_from_db()
+        self.assertEqual(self.request.status, 5)
+        self.assertIsNone(self.request.deadline)
+
+        # Another reviewer is asked instead
+        replacement = ReviewRequest.objects.get(status=1)
+        self.assertEqual(replacement.reviewer, self.reviewers[1])
+        summary = ArticleSummary.objects.get(article=self.article)
+        self.assertEqual(summary.requests_pending, 1)
+        self.assertEqual(self.reviewers[0].workload.requests_pending, 0)
+
+    def test_tick_loads_due_requests(self):
+        for reviewer in self.reviewers[1:]:
+            ReviewRequest.objects.create(
+                article=self.article, reviewer=reviewer, status=3
+            )
+        scheduler = self.scheduler()
+        now = self.request.deadline + timedelta(seconds=1)
+
+        # Only the request due within the horizon is loaded, the accepted ones are not
+        with self.assertNumQueries(4):
+            self.assertEqual(scheduler.tick(now), 1)
+
+        out = StringIO()
+        call_command("run_scheduler", "--once", stdout=out)
+        self.assertIn("Handled 0 deadlines", out.getvalue())
+
+
+class EscrowTests(AuthMixin, APITestCase):
+    def setUp(self):
+        from api.escrow import KeyCache
+
+        patcher = mock.patch("api.escrow.cache", KeyCache(ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@JGagnon")
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=self.article
+        )
+
+    def deposit(self):
+        self.as_researcher(self.author)
+        response = self.client.post(
+            "/api/article/keys/my-paper",
+            {
+                "encryption_passphrase": "correct horse",
+                "manuscripts": {
+                    "my-paper_preprint": {"encryption_password": "battery staple"}
+                },
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 204)
+
+    def test_encrypted_and_deferred(self):
+        self.deposit()
+
+        stored = SubmittedArticle.objects.values("encryption_passphrase").get()
+        self.assertNotIn("correct horse", stored["encryption_passphrase"])
+
+        article = SubmittedArticle.objects.get(base_claim_name="my-paper")
+        self.assertIn("encryption_passphrase", article.get_deferred_fields())
+        manuscript = Manuscript.objects.get(claim_name="my-paper_preprint")
+        self.assertIn("encryption_password", manuscript.get_deferred_fields())
+        self.assertIn("review_password", manuscript.get_deferred_fields())
+
+    def test_reviewer_access(self):
+        self.deposit()
+
+        self.as_researcher(self.reviewer)
+        response = self.client.get("/api/article/keys/my-paper")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            "/api/article/keys/my-paper",
+            {"encryption_passphrase": "stolen"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+        ReviewRequest.objects.create(
+            article=self.article, reviewer=self.reviewer, status=3
+        )
+        response = self.client.get("/api/article/keys/my-paper")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["encryption_passphrase"], "correct horse")
+        self.assertEqual(
+            response.json()["manuscripts"]["my-paper_preprint"]["encryption_password"],
+            "battery staple",
+        )
+
+    def test_cache(self):
+        from api import escrow
+
+        self.deposit()
+        with mock.patch("api.escrow.decrypt", wraps=escrow.decrypt) as decrypt:
+            escrow.article_keys(self.article)
+            escrow.article_keys(self.article)
+            self.assertEqual(decrypt.call_count, 4)
+
+            # Depositing new secrets invalidates the cached ones
+            escrow.deposit(self.article, {"review_passphrase": "new"})
+            self.assertEqual(
+                escrow.article_keys(self.article)["review_passphrase"], "new"
+            )
+            self.assertEqual(decrypt.call_count, 8)
+
+    def test_invalid_deposit(self):
+        self.as_researcher(self.author)
+        for data in [
+            {"encryption_passphrase": None},
+            {"review_passphrase": 42},
+            {"manuscripts": ["my-paper_preprint"]},
+            {"manuscripts": {"my-paper_preprint": "battery staple"}},
+            {"manuscripts": {"my-paper_preprint": {"review_password": None}}},
+        ]:
+            response = self.client.post(
+                "/api/article/keys/my-paper", data, format="json"
+            )
+            self.assertEqual(response.status_code, 400, data)
+        self.assertFalse(AuditEvent.objects.filter(event="keys_deposited").exists())
+
+    def test_unknown_key(self):
+        from cryptography.fernet import Fernet
+
+        self.deposit()
+        self.as_researcher(self.author)
+        with override_settings(PAPR_ESCROW_KEYS=[Fernet.generate_key().decode()]):
+            with mock.patch("api.escrow._fernet", None):
+                response = self.client.get("/api/article/keys/my-paper")
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("cannot be decrypted", response.json()["detail"])
+
+    def test_keys_required(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api import escrow
+
+        with override_settings(PAPR_ESCROW_KEYS=[], IS_TEST=False):
+            with mock.patch("api.escrow._fernet", None):
+                with self.assertRaises(ImproperlyConfigured):
+                    escrow.encrypt("correct horse")
+
+    def test_migration_reversible(self):
+        from importlib import import_module
+
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        from api import escrow
+
+        migration = import_module("api.migrations.0012_escrowed_secrets")
+        apps = (
+            MigrationExecutor(connection)
+            .loader.project_state(("api", "0012_escrowed_secrets"))
+            .apps
+        )
+        SubmittedArticle.objects.update(encryption_passphrase="correct horse")
+
+        migration.encrypt_secrets(apps, None)
+        stored = SubmittedArticle.objects.values_list(
+            "encryption_passphrase", flat=True
+        ).get()
+        self.assertEqual(escrow.decrypt(stored), "correct horse")
+
+        migration.decrypt_secrets(apps, None)
+        stored = SubmittedArticle.objects.values_list(
+            "encryption_passphrase", flat=True
+        ).get()
+        self.assertEqual(stored, "correct horse")
+
+
+class SharedCacheTests(AuthMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@JGagnon")
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        self.as_researcher(self.author)
+
+    def status(self):
+        response = self.client.get("/api/article/status/my-paper")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cached(self):
+        self.status()
+        with self.assertNumQueries(1):  # Authentication only
+            self.assertEqual(self.status()["summary"]["manuscripts"], 0)
+
+    def test_invalidated_by_related_rows(self):
+        self.status()
+        Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=self.article
+        )
+        self.assertEqual(self.status()["summary"]["manuscripts"], 1)
+
+        ReviewerRecommendation.objects.create(
+            reviewer=self.reviewer, voucher=self.author, article=self.article
+        )
+        self.assertEqual(self.status()["summary"]["recommendations"], 1)
+
+        request = ReviewRequest.objects.create(
+            reviewer=self.reviewer, article=self.article, status=1
+        )
+        self.assertEqual(self.status()["summary"]["requests_pending"], 1)
+
+        request.delete()
+        self.assertEqual(self.status()["summary"]["requests_pending"], 0)
+
+    def test_invalidated_by_transition(self):
+        from api.caching import article_status_key
+        from api.transitions import transition
+
+        request = ReviewRequest.objects.create(
+            reviewer=self.reviewer, article=self.article, status=1
+        )
+        self.status()
+        self.assertTrue(transition(ReviewRequest.objects.get(pk=request.pk), 3))
+        self.assertEqual(self.status()["summary"]["requests_accepted"], 1)
+
+        self.assertTrue(transition(self.article, 2))
+        self.assertIsNone(cache.get(article_status_key(self.article.pk)))
+
+    def test_deleted_article(self):
+        self.status()
+        self.article.delete()
+        response = self.client.get("/api/article/status/my-paper")
+        self.assertEqual(response.status_code, 404)
+
+    def test_other_researcher_forbidden(self):
+        self.status()
+        self.as_researcher(self.reviewer)
+        response = self.client.get("/api/article/status/my-paper")
+        self.assertEqual(response.status_code, 403)
+
+    def test_escrow_invalidated_by_other_workers(self):
+        from api import caching, escrow
+
+        manuscript = Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=self.article
+        )
+        escrow.deposit(self.article, {"review_passphrase": "old"})
+        self.assertEqual(escrow.article_keys(self.article)["review_passphrase"], "old")
+
+        # Deposited by another worker, whose in-memory cache is not this one
+        SubmittedArticle.objects.filter(pk=self.article.pk).update(
+            review_passphrase=escrow.encrypt("new")
+        )
+        caching.invalidate([caching.escrow_key(self.article.pk)])
+        self.assertEqual(escrow.article_keys(self.article)["review_passphrase"], "new")
+
+        # New manuscripts are listed with the passwords
+        Manuscript.objects.create(
+            claim_name="my-paper_v1", title="My paper", article=self.article
+        )
+        self.assertEqual(
+            set(escrow.article_keys(self.article)["manuscripts"]),
+            {manuscript.claim_name, "my-paper_v1"},
+        )
+
+    def test_daemon_responses_invalidated(self):
+        from api.backends import CachedBackend, FakeBackend
+
+        fake = FakeBackend()
+        backend = CachedBackend(fake)
+        fake.add_claim("my-paper_preprint", {"name": "my-paper_preprint"})
+        fake.add_public_key("@JGagnon", "old")
+        backend.call("resolve", urls="my-paper_preprint")
+        backend.call("macro_get_public_key", channel_name="@JGagnon")
+
+        # Re-published and rotated, then saved by the server
+        fake.add_claim("my-paper_preprint", {"name": "my-paper_preprint", "v": 2})
+        fake.add_public_key("@JGagnon", "new")
+        Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=self.article
+        )
+        self.reviewer.public_key = "new"
+        self.reviewer.save()
+
+        data = backend.call("resolve", urls="my-paper_preprint")
+        self.assertEqual(data["result"]["my-paper_preprint"]["v"], 2)
+        data = backend.call("macro_get_public_key", channel_name="@JGagnon")
+        self.assertEqual(data["result"]["public_key"], "new")
+
+
+class RecommendationGraphTests(APITestCase):
+    def graph(self, edges, **kwargs):
+        from api.graph import RecommendationGraph
+
+        graph = RecommendationGraph(**kwargs)
+        graph.add((pk, u, v) for pk, (u, v) in enumerate(edges, start=1))
+        return graph
+
+    def test_scores(self):
+        graph = self.graph([(1, 3), (2, 3), (4, 3), (3, 1)])
+        self.assertAlmostEqual(sum(graph.score(pk) for pk in [1, 2, 3, 4]), 4)
+        self.assertGreater(graph.score(3), graph.score(1))
+        self.assertGreater(graph.score(1), graph.score(2))
+        self.assertEqual(graph.score(5), 0)
+
+    def test_incremental(self):
+        # Ten fields of ten researchers, who recommend each other within a field
+        edges = [
+            (field + i % 10 + 1, field + (i * step) % 10 + 1)
+            for field in range(0, 100, 10)
+            for i in range(10)
+            for step in [3, 7]
+        ]
+        graph = self.graph(edges)
+        graph.compact()
+        self.assertFalse(graph.pending)
+
+        # Only the scores of the field of the new edge are updated
+        pushes = graph.pushes
+        graph.add([(len(edges) + 1, 33, 38)])
+        self.assertTrue(graph.has_edge(graph.nodes[33], graph.nodes[38]))
+        incremental = graph.pushes - pushes
+
+        fresh = self.graph(edges + [(33, 38)])
+        self.assertLess(incremental * 5, fresh.rank())
+        for pk in range(1, 101):
+            self.assertAlmostEqual(graph.score(pk), fresh.score(pk), places=5)
+
+    def test_matches_power_iteration(self):
+        edges = [(1, 2), (2, 3), (3, 1), (4, 1), (1, 4), (5, 3)]
+        graph = self.graph(edges, damping=0.85)
+
+        n, scores = 5, [1.0] * 5
+        out = Counter(u for u, _ in edges)
+        for _ in range(200):
+            scores = [
+                0.15 + 0.85 * sum(scores[u - 1] / out[u] for u, w in edges if w == v)
+                for v in range(1, n + 1)
+            ]
+        mean = sum(scores) / n
+        for pk in range(1, n + 1):
+            self.assertAlmostEqual(graph.score(pk), scores[pk - 1] / mean, places=5)
+
+    def test_collusion(self):
+        graph = self.graph(
+            [(1, 2), (2, 3), (3, 1), (4, 5), (5, 4), (6, 1)], max_ring_size=3
+        )
+        self.assertEqual(graph.rings()[1], frozenset([1, 2, 3]))
+        self.assertNotIn(6, graph.rings())
+        self.assertTrue(graph.colluding(3, 1))
+        self.assertTrue(graph.colluding(4, 5))
+        self.assertTrue(graph.mutual(5, 4))
+        self.assertFalse(graph.colluding(6, 1))
+
+        graph.max_ring_size = 2
+        graph._rings = None
+        self.assertFalse(graph.colluding(3, 1))
+
+    def test_select_reviewers(self):
+        from api.assignment import select_reviewers
+
+        author = Researcher.objects.create(channel_name="@RTremblay")
+        reviewers = [
+            Researcher.objects.create(channel_name=f"@Reviewer{i}", public_key="key")
+            for i in range(3)
+        ]
+        articles = [
+            SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}", corresponding_author=author
+            )
+            for i in range(2)
+        ]
+        # Reviewer 0 and reviewer 1 recommend each other
+        ReviewerRecommendation.objects.create(
+            reviewer=reviewers[0], voucher=reviewers[1], article=articles[0]
+        )
+        ReviewerRecommendation.objects.create(
+            reviewer=reviewers[1], voucher=reviewers[0], article=articles[1]
+        )
+        ReviewerRecommendation.objects.create(
+            reviewer=reviewers[2], voucher=author, article=articles[0]
+        )
+
+        selected = select_reviewers(articles[0], 3)
+        self.assertEqual(selected, [reviewers[2], reviewers[0], reviewers[1]])
+        self.assertTrue(selected[0].recommended)
+        self.assertFalse(selected[1].recommended)
+
+
+class ConflictTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(
+            channel_name="@RTremblay", full_name="Robert Tremblay"
+        )
+        self.coauthor = Researcher.objects.create(
+            channel_name="@JGagnon", full_name="Jérôme Gagnon", public_key="key"
+        )
+        self.reviewer = Researcher.objects.create(
+            channel_name="@ALee", full_name="Ann Lee", public_key="key"
+        )
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        Manuscript.objects.create(
+            claim_name="my-paper_preprint",
+            title="My paper",
+            authors="Robert Tremblay",
+            article=self.article,
+        )
+        # Earlier paper of the author with a co-author
+        Manuscript.objects.create(
+            claim_name="other-paper_preprint",
+            title="Other paper",
+            authors="R. Tremblay; Jerome  GAGNON and Marie Roy",
+        )
+
+    def test_author_keys(self):
+        from api.conflicts import author_keys
+
+        self.assertEqual(
+            author_keys("Jérôme Gagnon, R. Tremblay and Ann Lee & "),
+            {"jerome gagnon", "r tremblay", "ann lee"},
+        )
+        self.assertEqual(self.coauthor.author_key, "jerome gagnon")
+
+    def test_conflicts(self):
+        from api.conflicts import Conflicts
+
+        # The author only signed the earlier paper as "R. Tremblay"
+        self.assertEqual(Conflicts.for_article(self.article).keys, {"robert tremblay"})
+
+        Manuscript.objects.create(
+            claim_name="my-paper_v1",
+            title="My paper",
+            authors="Robert Tremblay, R. Tremblay",
+            article=self.article,
+        )
+        with self.assertNumQueries(2):
+            conflicts = Conflicts.for_article(self.article)
+        with self.assertNumQueries(0):
+            self.assertIn(self.coauthor, conflicts)
+            self.assertNotIn(self.reviewer, conflicts)
+            self.assertEqual(
+                conflicts.filter([self.coauthor, self.reviewer]), [self.reviewer]
+            )
+
+    def test_select_reviewers(self):
+        from api.assignment import select_reviewers
+
+        Manuscript.objects.create(
+            claim_name="third-paper_preprint",
+            title="Third paper",
+            authors="Robert Tremblay, Jérôme Gagnon",
+        )
+        self.assertEqual(select_reviewers(self.article, 3), [self.reviewer])
+
+    def test_rebuild(self):
+        from api.conflicts import rebuild
+
+        pairs = set(CoAuthorship.objects.values_list("author", "coauthor"))
+        self.assertEqual(len(pairs), 6)
+        CoAuthorship.objects.all().delete()
+        self.assertEqual(rebuild(), 6)
+        self.assertEqual(
+            set(CoAuthorship.objects.values_list("author", "coauthor")), pairs
+        )
+
+        # A rebuild which fails partway leaves the index as it was
+        with mock.patch("api.conflicts.record", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                rebuild()
+        self.assertEqual(
+            set(CoAuthorship.objects.values_list("author", "coauthor")), pairs
+        )
+
+
+class ValuesSerializerTests(AuthMixin, APITestCase):
+    def setUp(self):
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        self.reviewer = Researcher.objects.create(channel_name="@JGagnon")
+        self.articles = [
+            SubmittedArticle.objects.create(
+                base_claim_name=f"paper-{i}", corresponding_author=self.author
+            )
+            for i in range(3)
+        ]
+        manuscript = Manuscript.objects.create(
+            claim_name="paper-0_preprint",
+            title="My paper",
+            authors="Robert Tremblay",
+            abstract="Abstract",
+            article=self.articles[0],
+        )
+        Manuscript.objects.create(
+            claim_name="paper-0_v1", title="My paper", article=self.articles[0]
+        )
+        Review.objects.create(manuscript=manuscript, reviewer=self.reviewer, rating=3)
+        ArticleSummary.objects.filter(article=self.articles[2]).delete()
+
+    def test_same_data(self):
+        from api.serializers import (
+            ManuscriptSerializer,
+            ManuscriptValuesSerializer,
+            SubmittedArticleSerializer,
+            SubmittedArticleValuesSerializer,
+        )
+
+        articles = SubmittedArticle.objects.order_by("pk")
+        with self.assertNumQueries(1):
+            data = SubmittedArticleValuesSerializer(articles).data
+        self.assertEqual(data, SubmittedArticleSerializer(articles, many=True).data)
+        self.assertEqual(data[0]["summary"]["mean_rating"], 3)
+        self.assertIsNone(data[2]["summary"])
+
+        manuscripts = Manuscript.objects.order_by("pk")
+        self.assertEqual(
+            ManuscriptValuesSerializer(manuscripts).data,
+            ManuscriptSerializer(manuscripts, many=True).data,
+        )
+
+    def test_renderer(self):
+        from decimal import Decimal
+        from rest_framework.renderers import JSONRenderer
+
+        from api.renderers import ORJSONRenderer
+
+        data = {
+            "created": timezone.now(),
+            "rating": Decimal("3.5"),
+            "text": "Évaluation\u2028",
+            "counts": {1: [1, 2.5, None, True]},
+        }
+        expected = JSONRenderer().render(data)
+        self.assertEqual(ORJSONRenderer().render(data), expected)
+        with mock.patch("api.renderers.orjson", None):
+            self.assertEqual(ORJSONRenderer().render(data), expected)
+
+    def test_list_endpoints(self):
+        self.as_researcher(self.author)
+        for serializers in ["values", "drf"]:
+            with self.settings(PAPR_SERIALIZERS=serializers):
+                response = self.client.get("/api/article/list?limit=2")
+                self.assertEqual(response.status_code, 200)
+                page = response.json()
+                self.assertEqual(
+                    [a["base_claim_name"] for a in page["results"]],
+                    ["paper-0", "paper-1"],
+                )
+                response = self.client.get(f"/api/article/list?after={page['next']}")
+                self.assertEqual(response.json()["results"][0]["summary"], None)
+                self.assertIsNone(response.json()["next"])
+
+                # A full last page has no next page either
+                response = self.client.get("/api/article/list?limit=3")
+                self.assertEqual(len(response.json()["results"]), 3)
+                self.assertIsNone(response.json()["next"])
+
+                response = self.client.get("/api/article/manuscripts/paper-0")
+                self.assertEqual(
+                    [m["claim_name"] for m in response.json()],
+                    ["paper-0_preprint", "paper-0_v1"],
+                )
+
+        self.as_researcher(self.reviewer)
+        self.assertEqual(self.client.get("/api/article/list").json()["results"], [])
+        response = self.client.get("/api/article/manuscripts/paper-0")
+        self.assertEqual(response.status_code, 403)
+
+
+class SignatureTimeoutTests(AuthMixin, APITestCase):
+    @override_settings(PAPR_SIGNATURE_TIMEOUT=0.01)
+    def test_review_verifier_busy(self):
+        reviewer = Researcher.objects.create(channel_name="@JGagnon", public_key="key")
+        article = SubmittedArticle.objects.create(base_claim_name="my-paper")
+        Manuscript.objects.create(
+            claim_name="my-paper_preprint", title="My paper", article=article
+        )
+        ReviewRequest.objects.create(article=article, reviewer=reviewer, status=3)
+
+        verifier = SignatureVerifier(workers=1)
+        self.as_researcher(reviewer)
+        with mock.patch.object(verifier, "submit", return_value=Future()):
+            with mock.patch("api.serializers.get_verifier", return_value=verifier):
+                response = self.client.post(
+                    "/api/review/submit",
+                    {
+                        "manuscript": "my-paper_preprint",
+                        "text": "Great paper",
+                        "rating": 4,
+                        "signing_ts": "1660000000",
+                        "signature": "00",
+                    },
+                    format="json",
+                )
 
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(ReviewRequest.objects.get().status, 3)
@@ -0,0 +1,157 @@
+import os
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.backends import CachedBackend, FakeBackend
+from api.models import IndexedClaim, Manuscript, Researcher
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "lbry.json")
+
+
+class FakeBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = FakeBackend(FIXTURES)
+
+    def test_resolve(self):
+        res = self.backend.call("resolve", urls="my-paper_preprint")
+        self.assertEqual(res["result"]["my-paper_preprint"]["height"], 120)
+
+        res = self.backend.call("resolve", urls=["my-paper_preprint", "missing"])
+        self.assertIn("error", res["result"]["missing"])
+
+    def test_public_key(self):
+        res = self.backend.call("macro_get_public_key", channel_name="@RTremblay")
+        self.assertTrue(res["result"]["public_key"].startswith("MFYw"))
+
+        res = self.backend.call("macro_get_public_key", channel_name="@Ghost")
+        self.assertIn("info", res["result"])
+
+    def test_claim_search(self):
+        res = self.backend.call("claim_search", channel="@RTremblay", page_size=1)
+        self.assertEqual(res["result"]["total_pages"], 2)
+        self.assertEqual(res["result"]["items"][0]["name"], "my-paper_preprint")
+
+        res = self.backend.call("claim_search", channel="@RTremblay", height=">=130")
+        self.assertEqual([c["name"] for c in res["result"]["items"]], ["my-paper_v1"])
+
+    def test_unknown_method(self):
+        self.assertIn("error", self.backend.call("wallet_send"))
+
+
+class CachedBackendTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.fake = FakeBackend(FIXTURES)
+        self.backend = CachedBackend(self.fake)
+
+    def test_cached(self):
+        with mock.patch.object(self.fake, "call", wraps=self.fake.call) as call:
+            for _ in range(3):
+                self.backend.call("resolve", urls="my-paper_preprint")
+            self.assertEqual(call.call_count, 1)
+
+            for _ in range(2):
+                self.backend.call("claim_search", channel="@RTremblay")
+            self.assertEqual(call.call_count, 3)
+
+    def test_errors_not_cached(self):
+        self.backend.call("wallet_send")
+        with mock.patch.object(self.fake, "call", wraps=self.fake.call) as call:
+            self.backend.call("wallet_send")
+            self.assertEqual(call.call_count, 1)
+
+    def test_not_found_not_cached(self):
+        data = self.backend.call("resolve", urls="my-paper_v2")
+        self.assertIn("error", data["result"]["my-paper_v2"])
+        self.backend.call("macro_get_public_key", channel_name="@New")
+
+        # Published right after the failed lookups
+        self.fake.add_claim("my-paper_v2", {"name": "my-paper_v2"})
+        self.fake.add_public_key("@New", "key")
+        data = self.backend.call("resolve", urls="my-paper_v2")
+        self.assertEqual(data["result"]["my-paper_v2"], {"name": "my-paper_v2"})
+        data = self.backend.call("macro_get_public_key", channel_name="@New")
+        self.assertEqual(data["result"]["public_key"], "key")
+
+
+class OfflineSubmissionTests(APITestCase):
+    def setUp(self):
+        self.backend = FakeBackend(FIXTURES)
+        patcher = mock.patch("api.daemon.get_backend", return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, claim_name, revision=0):
+        data = {
+            "title": "My paper",
+            "article": "my-paper",
+            "authors": "Robert Tremblay",
+            "claim_name": claim_name,
+            "revision": revision,
+            "corresponding_author": "@RTremblay",
+        }
+        return self.client.post("/api/article/submit", data=data, format="json")
+
+    def test_register_and_submit(self):
+        response = self.client.post(
+            "/api/channel/register", data={"channel_name": "@RTremblay"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        researcher = Researcher.objects.get(channel_name="@RTremblay")
+        token = RefreshToken.for_user(researcher)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+        response = self.submit("my-paper_preprint")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Manuscript.objects.count(), 1)
+
+    def test_duplicate_rejected(self):
+        researcher = Researcher.objects.create(channel_name="@RTremblay")
+        token = RefreshToken.for_user(researcher)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        self.assertEqual(self.submit("my-paper_preprint").status_code, 201)
+
+        # Same content and stream, re-published under another claim name
+        claim = self.backend.call("resolve", urls="my-paper_preprint")["result"]
+        self.backend.add_claim("my-paper_again", claim["my-paper_preprint"])
+        response = self.submit("my-paper_again")
+        self.assertEqual(response.status_code, 409)
+        self.assertNotIn("my-paper_preprint", response.json()["error"])
+
+        # Copies signed by another channel fail verification before the check
+        copy = dict(claim["my-paper_preprint"], signing_channel={"name": "@Other"})
+        self.backend.add_claim("my-paper_copy", copy)
+        self.assertEqual(self.submit("my-paper_copy").status_code, 400)
+
+        # Claims without a stream are never duplicates
+        streamless = dict(claim["my-paper_preprint"])
+        streamless["value"] = dict(streamless["value"], source={})
+        self.backend.add_claim("my-paper_nostream", streamless)
+        self.assertEqual(self.submit("my-paper_nostream").status_code, 201)
+
+        # Indexed claims are rejected without asking the daemon
+        IndexedClaim.objects.create(
+            claim_id="b" * 40,
+            claim_name="my-paper_indexed",
+            txid="c" * 64,
+            height=140,
+            signing_channel="@RTremblay",
+            is_channel_signature_valid=True,
+            title="My paper",
+            author="Robert Tremblay",
+            sd_hash=claim["my-paper_preprint"]["value"]["source"]["sd_hash"],
+        )
+        with mock.patch.object(self.backend, "call") as call:
+            self.assertEqual(self.submit("my-paper_indexed").status_code, 409)
+        call.assert_not_called()
+
+        # A revision with the same metadata but a new stream is not a duplicate
+        self.assertEqual(self.submit("my-paper_v1", revision=1).status_code, 201)
+        self.assertEqual(
+            Manuscript.objects.get(claim_name="my-paper_v1").sd_hash, "2" * 96
+        )
@@ -0,0 +1,78 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from api import daemon
+from api.backends import FakeBackend
+from api.daemon import CircuitBreaker, DaemonUnavailable
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_on_errors(self):
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, reset_timeout=60)
+        for success in [True, False, True, False]:
+            breaker.before_call()
+            breaker.record(success, 0.1)
+
+        self.assertEqual(breaker.state, breaker.OPEN)
+        with self.assertRaises(DaemonUnavailable):
+            breaker.before_call()
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker(min_calls=2, slow_call=1.0)
+        breaker.record(True, 2.0)
+        breaker.record(True, 3.0)
+        self.assertEqual(breaker.state, breaker.OPEN)
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=0.01)
+        breaker.record(False, 0.1)
+        self.assertEqual(breaker.state, breaker.OPEN)
+        time.sleep(0.02)
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, breaker.HALF_OPEN)
+        # Only a single trial call is let through
+        with self.assertRaises(DaemonUnavailable):
+            breaker.before_call()
+
+        breaker.record(True, 0.1)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+
+class DegradedModeTests(APITestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(min_calls=1, reset_timeout=60)
+        patches = {
+            "api.daemon.breaker": self.breaker,
+            "api.views.breaker": self.breaker,
+            "api.daemon.get_backend": lambda: FakeBackend(),
+        }
+        for target, value in patches.items():
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch.object(FakeBackend, "call", side_effect=ConnectionError)
+    def test_fail_fast(self, backend_call):
+        with self.assertRaises(ConnectionError):
+            daemon.call("status")
+
+        response = self.client.post(
+            "/api/channel/register", data={"channel_name": "@RTremblay"}, format="json"
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(backend_call.call_count, 1)
+
+    def test_health(self):
+        response = self.client.get("/api/health")
+        self.assertEqual(response.json()["status"], "ok")
+
+        self.breaker.record(False, 0.1)
+        response = self.client.get("/api/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "degraded")
+        self.assertEqual(response.json()["daemon"]["state"], "open")
@@ -0,0 +1,62 @@
+import itertools
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from papr_server.keypool import KeypairPool
+
+
+class KeypairPoolTests(SimpleTestCase):
+    def setUp(self):
+        counter = itertools.count()
+        self.generate = lambda password: (f"priv{next(counter)}", "pub")
+
+    def wait_full(self, pool):
+        for i in range(100):
+            if pool.stats()["depth"] == pool.size:
+                return
+            time.sleep(0.01)
+        self.fail("The pool was not refilled")
+
+    def test_refill_and_hits(self):
+        pool = KeypairPool(self.generate, size=4)
+        pool.start()
+        try:
+            self.wait_full(pool)
+            pool.get()
+            self.wait_full(pool)
+        finally:
+            pool.stop()
+
+        stats = pool.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 0)
+        self.assertEqual(stats["generated"], 5)
+
+    def test_miss_generates_synchronously(self):
+        pool = KeypairPool(self.generate, size=1)
+        pool.start = lambda: None  # Keep the refill thread stopped
+
+        self.assertEqual(pool.get(), ("priv0", "pub"))
+        self.assertEqual(pool.get(), ("priv1", "pub"))
+        self.assertEqual(pool.stats()["misses"], 2)
+        self.assertEqual(pool.stats()["hits"], 0)
+
+    def test_keys_used_once(self):
+        pool = KeypairPool(self.generate, size=8)
+        keys = []
+
+        def worker():
+            for i in range(50):
+                keys.append(pool.get()[0])
+
+        threads = [threading.Thread(target=worker) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        pool.stop()
+
+        self.assertEqual(len(keys), 200)
+        self.assertEqual(len(set(keys)), 200)
@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Researcher, SubmittedArticle
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(PAPR_PROFILE_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.admin = Researcher.objects.create(channel_name="@Admin", is_superuser=True)
+        self.author = Researcher.objects.create(channel_name="@RTremblay")
+        SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+
+    def as_researcher(self, researcher):
+        token = RefreshToken.for_user(researcher)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def profiles(self, **params):
+        self.as_researcher(self.admin)
+        return self.client.get("/api/profiles", params).json()["profiles"]
+
+    def test_header(self):
+        self.as_researcher(self.admin)
+        response = self.client.get(
+            "/api/article/status/my-paper", HTTP_X_PAPR_PROFILE="1"
+        )
+        self.assertIn("X-Papr-Profile", response.headers)
+
+        profiles = self.profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(
+            profiles[0]["endpoint"], "api/article/status/<str:base_claim_name>"
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory, profiles[0]["file"]))
+        )
+
+        response = self.client.get(f"/api/profiles/{profiles[0]['id']}")
+        self.assertEqual(response.status_code, 200)
+
+    def test_header_requires_superuser(self):
+        self.as_researcher(self.author)
+        response = self.client.get(
+            "/api/article/status/my-paper", HTTP_X_PAPR_PROFILE="1"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Papr-Profile", response.headers)
+        self.assertEqual(os.listdir(self.directory), [])
+
+        self.assertEqual(self.client.get("/api/profiles").status_code, 403)
+
+    @override_settings(PAPR_PROFILE_SAMPLE_RATE=1.0, PAPR_PROFILE_RETENTION=2)
+    def test_sampling_and_retention(self):
+        self.as_researcher(self.author)
+        for _ in range(3):
+            self.client.get("/api/article/status/my-paper")
+        self.client.get("/api/info/")
+
+        # The listing request itself is sampled as well
+        self.assertEqual(len(self.profiles()), 2)
+        self.assertEqual(len(self.profiles(endpoint="api/info/")), 1)
@@ -0,0 +1,190 @@
+import base64
+import os
+from unittest import mock
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.backends import FakeBackend
+from api.models import (
+    Manuscript,
+    Researcher,
+    Review,
+    ReviewerRecommendation,
+    ReviewRequest,
+    SubmittedArticle,
+)
+from papr_server.adapter import generate_keys
+from tests.querycount import QueryCountMixin
+from tests.test_signatures import sign
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "lbry.json")
+
+
+class EndpointQueryTests(QueryCountMixin, APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.signing_key = ec.generate_private_key(ec.SECP256K1())
+        cls.signing_public_key = base64.b64encode(
+            cls.signing_key.public_key().public_bytes(
+                serialization.Encoding.DER,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        ).decode()
+        cls.author_public_key = generate_keys("test")[1]
+
+    def setUp(self):
+        backend = FakeBackend(FIXTURES)
+        backend.add_public_key("@New", self.author_public_key)
+        patcher = mock.patch("api.daemon.get_backend", return_value=backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.author = Researcher.objects.create(
+            channel_name="@RTremblay", public_key=self.author_public_key
+        )
+        self.reviewer = Researcher.objects.create(
+            channel_name="@JGagnon", public_key=self.signing_public_key
+        )
+        self.voucher = Researcher.objects.create(channel_name="@MCote")
+        self.article = SubmittedArticle.objects.create(
+            base_claim_name="my-paper", corresponding_author=self.author
+        )
+        self.manuscript = Manuscript.objects.create(
+            claim_name="my-paper_preprint",
+            title="My paper",
+            authors="Robert Tremblay",
+            article=self.article,
+        )
+
+    def seed(self, size):
+        others = Researcher.objects.bulk_create(
+            Researcher(channel_name=f"@Seed{i}") for i in range(size)
+        )
+        articles = SubmittedArticle.objects.bulk_create(
+            SubmittedArticle(base_claim_name=f"seed-{i}", corresponding_author=other)
+            for i, other in enumerate(others)
+        )
+        Manuscript.objects.bulk_create(
+            Manuscript(claim_name=f"seed-{i}_preprint", title="Seed", article=article)
+            for i, article in enumerate(articles)
+        )
+        requests = ReviewRequest.objects.bulk_create(
+            ReviewRequest(article=self.article, reviewer=other, status=4)
+            for other in others
+        )
+        Review.objects.bulk_create(
+            Review(manuscript=self.manuscript, reviewer=other, request=req, rating=3)
+            for other, req in zip(others, requests)
+        )
+        ReviewerRecommendation.objects.bulk_create(
+            ReviewerRecommendation(
+                article=self.article, reviewer=other, voucher=self.author
+            )
+            for other in others
+        )
+
+    def as_researcher(self, researcher):
+        token = RefreshToken.for_user(researcher)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def request_review(self, status):
+        ReviewRequest.objects.create(
+            article=self.article, reviewer=self.reviewer, status=status
+        )
+
+    def test_article_status(self):
+        self.as_researcher(self.author)
+        self.assertQueriesBounded(
+            "article_status",
+            lambda: self.client.get("/api/article/status/my-paper"),
+        )
+
+    def test_article_list(self):
+        self.as_researcher(self.author)
+        self.assertQueriesBounded(
+            "article_list", lambda: self.client.get("/api/article/list")
+        )
+
+    def test_article_manuscripts(self):
+        self.as_researcher(self.author)
+        self.assertQueriesBounded(
+            "article_manuscripts",
+            lambda: self.client.get("/api/article/manuscripts/my-paper"),
+        )
+
+    def test_submit(self):
+        self.as_researcher(self.author)
+        data = {
+            "title": "My paper",
+            "article": "my-paper",
+            "authors": "Robert Tremblay",
+            "claim_name": "my-paper_v1",
+            "revision": 1,
+            "corresponding_author": "@RTremblay",
+        }
+        self.assertQueriesBounded(
+            "submit",
+            lambda: self.client.post("/api/article/submit", dict(data), format="json"),
+        )
+
+    def test_accept(self):
+        self.request_review(1)
+        self.as_researcher(self.reviewer)
+        self.assertQueriesBounded(
+            "reviewrequest_accept",
+            lambda: self.client.post(
+                "/api/review/accept", {"base_claim_name": "my-paper"}, format="json"
+            ),
+        )
+
+    def test_decline(self):
+        self.request_review(1)
+        self.as_researcher(self.reviewer)
+        self.assertQueriesBounded(
+            "reviewrequest_decline",
+            lambda: self.client.post(
+                "/api/review/decline", {"base_claim_name": "my-paper"}, format="json"
+            ),
+        )
+
+    def test_review(self):
+        self.request_review(3)
+        self.as_researcher(self.reviewer)
+        data = {
+            "manuscript": "my-paper_preprint",
+            "text": "Great paper",
+            "rating": 4,
+            "signing_ts": "1660000000",
+            "signature": sign(self.signing_key, "1660000000", "Great paper"),
+        }
+        self.assertQueriesBounded(
+            "review",
+            lambda: self.client.post("/api/review/submit", dict(data), format="json"),
+        )
+
+    def test_recommend(self):
+        self.as_researcher(self.voucher)
+        data = {"article": "my-paper", "reviewer": "@JGagnon"}
+        self.assertQueriesBounded(
+            "recommend",
+            lambda: self.client.post(
+                "/api/review/recommend", dict(data), format="json"
+            ),
+        )
+
+    def test_register(self):
+        self.assertQueriesBounded(
+            "register",
+            lambda: self.client.post(
+                "/api/channel/register", {"channel_name": "@New"}, format="json"
+            ),
+        )
+
+    def test_get_token(self):
+        self.assertQueriesBounded(
+            "get_token", lambda: self.client.get("/api/token/@RTremblay")
+        )
@@ -0,0 +1,109 @@
+import base64
+from concurrent.futures import Future
+from unittest import mock
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    Prehashed,
+    decode_dss_signature,
+)
+from django.test import SimpleTestCase
+
+from api.signatures import (
+    SignatureVerifier,
+    VerifierBusy,
+    signing_digest,
+    verify_signature,
+)
+
+
+def sign(private_key, signing_ts, data):
+    r, s = decode_dss_signature(
+        private_key.sign(
+            signing_digest(signing_ts, data), ec.ECDSA(Prehashed(hashes.SHA256()))
+        )
+    )
+    return (r.to_bytes(32, "big") + s.to_bytes(32, "big")).hex()
+
+
+class SignatureTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = ec.generate_private_key(ec.SECP256K1())
+        cls.public_key = base64.b64encode(
+            cls.private_key.public_key().public_bytes(
+                serialization.Encoding.DER,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        ).decode()
+
+    def test_verify_valid(self):
+        signature = sign(self.private_key, "1660000000", "Great paper")
+        self.assertTrue(
+            verify_signature(self.public_key, signature, "1660000000", "Great paper")
+        )
+
+    def test_verify_tampered(self):
+        signature = sign(self.private_key, "1660000000", "Great paper")
+        self.assertFalse(
+            verify_signature(self.public_key, signature, "1660000000", "Bad paper")
+        )
+        self.assertFalse(
+            verify_signature(self.public_key, signature, "1660000001", "Great paper")
+        )
+
+    def test_verify_malformed(self):
+        self.assertFalse(verify_signature(self.public_key, "zz", "0", "text"))
+        self.assertFalse(verify_signature("not a key", "00" * 64, "0", "text"))
+
+    def test_verifier_batches(self):
+        verifier = SignatureVerifier(workers=1, batch_size=8, max_wait=0.05)
+        try:
+            futures = []
+            for i in range(20):
+                text = f"Review {i}"
+                signature = sign(self.private_key, str(i), text)
+                if i % 2:
+                    text += " (edited)"
+                futures.append(
+                    verifier.submit(self.public_key, signature, str(i), text)
+                )
+
+            results = [future.result(timeout=30) for future in futures]
+        finally:
+            verifier.shutdown()
+
+        self.assertEqual(results, [i % 2 == 0 for i in range(20)])
+
+    def test_verifier_cancelled(self):
+        verifier = SignatureVerifier(workers=1, batch_size=8, max_wait=0.5)
+        try:
+            signature = sign(self.private_key, "1", "text")
+            cancelled = verifier.submit(self.public_key, signature, "1", "text")
+            self.assertTrue(cancelled.cancel())  # The caller timed out
+            futures = [
+                verifier.submit(self.public_key, signature, "1", "text")
+                for _ in range(3)
+            ]
+
+            # The rest of the batch is still verified
+            results = [future.result(timeout=30) for future in futures]
+        finally:
+            verifier.shutdown()
+
+        self.assertEqual(results, [True] * 3)
+
+    def test_verifier_inline(self):
+        verifier = SignatureVerifier(workers=0)
+        signature = sign(self.private_key, "1", "text")
+        self.assertTrue(verifier.verify(self.public_key, signature, "1", "text"))
+
+    def test_verifier_busy(self):
+        verifier = SignatureVerifier(workers=1)
+        with mock.patch.object(verifier, "submit", return_value=Future()):
+            with self.assertRaises(VerifierBusy) as raised:
+                verifier.verify(self.public_key, "00", "1", "text", timeout=0.01)
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(raised.exception.wait, 1)
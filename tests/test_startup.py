@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+# Loaded on first use through papr_server.adapter, never at startup
+LAZY_MODULES = ["lbry", "papr", "cryptography"]
+
+
+def importtime(code):
+    """
+    Runs `code` in a new interpreter with `-X importtime` and returns the
+    cumulative import time of each top-level package, in microseconds.
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="papr_server.settings")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            package = name.strip().split(".")[0]
+            times[package] = max(times.get(package, 0), int(cumulative))
+    return times
+
+
+class StartupTests(SimpleTestCase):
+    def assertNotImported(self, times):
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times, f"{module} is imported at startup")
+
+    def test_asgi(self):
+        times = importtime("import papr_server.asgi, papr_server.urls")
+        self.assertIn("api", times)
+        self.assertNotImported(times)
+
+    def test_management_command(self):
+        times = importtime(
+            "import django; django.setup();"
+            "from django.core.management import load_command_class;"
+            "load_command_class('api', 'export_data')"
+        )
+        self.assertNotImported(times)